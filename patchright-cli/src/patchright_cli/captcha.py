@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import AsyncIterator
 from io import BytesIO
 from typing import TYPE_CHECKING
 
@@ -16,8 +18,18 @@ async def find_audio_url(page: Page) -> str | None:
 
     Returns the ``src`` attribute value, or *None* if no audio element is found.
     """
-    for frame in page.frames:
-        src = await frame.evaluate("document.querySelector('audio')?.src || ''")
+    # Query every frame at once; the first frame in page order still wins.  A
+    # frame that failed only matters if no earlier frame had audio.
+    results = await asyncio.gather(
+        *(
+            frame.evaluate("document.querySelector('audio')?.src || ''")
+            for frame in page.frames
+        ),
+        return_exceptions=True,
+    )
+    for src in results:
+        if isinstance(src, BaseException):
+            raise src
         if src:
             return src
     return None
@@ -31,3 +43,22 @@ async def transcribe_audio(audio_data: bytes, api_key: str) -> str:
         file=("audio.wav", BytesIO(audio_data)),
     )
     return transcript.text
+
+
+# whisper-1 ignores ``stream=True``; the gpt-4o transcribe models stream.
+_STREAMING_MODEL = "gpt-4o-mini-transcribe"
+
+
+async def transcribe_audio_stream(
+    audio_data: bytes, api_key: str
+) -> AsyncIterator[str]:
+    """Transcribe *audio_data*, yielding text deltas as the API produces them."""
+    client = AsyncOpenAI(api_key=api_key)
+    stream = await client.audio.transcriptions.create(
+        model=_STREAMING_MODEL,
+        file=("audio.wav", BytesIO(audio_data)),
+        stream=True,
+    )
+    async for event in stream:
+        if event.type == "transcript.text.delta":
+            yield event.delta
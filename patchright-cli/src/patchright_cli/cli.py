@@ -7,8 +7,13 @@ session-management commands directly.
 from __future__ import annotations
 
 import argparse
+import json
+import os
+import shutil
 import sys
 from pathlib import Path
+from subprocess import run as _run
+from typing import BinaryIO
 
 from patchright_cli.client import (
     close_all_sessions,
@@ -17,7 +22,6 @@ from patchright_cli.client import (
     open_session,
     send_command,
 )
-from patchright_cli.config import load_config
 from patchright_cli.session import (
     get_log_path,
     get_session_dir,
@@ -39,6 +43,59 @@ def _args_to_dict(
     return {k: v for k, v in vars(args).items() if k not in exclude and v is not None}
 
 
+def _session_record(session: dict) -> dict:
+    """Summarise a ``list_sessions()`` entry for the ``list`` command.
+
+    Browser fields are only included when the session has a saved config.
+    """
+    record = {
+        "name": session["name"],
+        "status": "open" if session["alive"] else "closed",
+    }
+    cfg = session.get("config")
+    if cfg:
+        browser_cfg = cfg.get("browser", {})
+        if browser_cfg.get("isolated"):
+            user_data_dir = "<in-memory>"
+        else:
+            user_data_dir = browser_cfg.get("user_data_dir") or str(
+                get_session_dir(session["name"]) / "browser-data"
+            )
+        record["browser_type"] = browser_cfg.get("browser_name", "chromium")
+        record["user_data_dir"] = user_data_dir
+        record["headed"] = not browser_cfg.get("launch_options", {}).get(
+            "headless", False
+        )
+    return record
+
+
+def _tail(f: BinaryIO, lines: int, block_size: int = 1 << 16) -> bytes:
+    """Return the last *lines* lines of binary file *f*, like ``tail -n``.
+
+    Reads backwards from the end in *block_size* chunks, so only the tail of
+    a large log is read.
+    """
+    pos = f.seek(0, os.SEEK_END)
+    chunks: list[bytes] = []
+    newlines = 0
+    # The file's final newline ends its last line, so finding where the
+    # wanted lines start can take one newline more than *lines*.
+    while pos > 0 and newlines <= lines:
+        step = min(block_size, pos)
+        pos -= step
+        f.seek(pos)
+        chunk = f.read(step)
+        chunks.append(chunk)
+        newlines += chunk.count(b"\n")
+    data = b"".join(reversed(chunks))
+    end = len(data) - 1 if data.endswith(b"\n") else len(data)
+    for _ in range(lines):
+        end = data.rfind(b"\n", 0, end)
+        if end == -1:
+            return data
+    return data[end + 1 :] if lines > 0 else b""
+
+
 # ---------------------------------------------------------------------------
 # Subparser registration
 # ---------------------------------------------------------------------------
@@ -383,6 +440,12 @@ def _register_subcommands(subparsers: argparse._SubParsersAction) -> None:
     p.add_argument(
         "--all", action="store_true", default=False, help="List all browser sessions"
     )
+    p.add_argument(
+        "--json",
+        action="store_true",
+        default=False,
+        help="Print the sessions as JSON",
+    )
 
     subparsers.add_parser("close-all", help="Gracefully close all sessions")
     subparsers.add_parser("kill-all", help="Force-kill all sessions")
@@ -442,36 +505,23 @@ def main(argv: list[str] | None = None) -> None:
     # 1. Resolve session name
     session_name = resolve_session_name(args.session)
 
-    # 2. Load config
-    config = load_config(args.config)
-
-    # 3. Handle client-side commands directly
+    # 2. Handle client-side commands directly
     if args.command == "list":
-        sessions = list_sessions()
-        if not sessions:
+        records = [_session_record(s) for s in list_sessions()]
+        if args.json:
+            print(json.dumps({"sessions": records}))
+            return
+        if not records:
             print("No sessions found.")
             return
         print("### Browsers")
-        for s in sessions:
-            status = "open" if s["alive"] else "closed"
-            print(f"- {s['name']}:")
-            print(f"  - status: {status}")
-            cfg = s.get("config")
-            if cfg:
-                browser_cfg = cfg.get("browser", {})
-                browser_type = browser_cfg.get("browser_name", "chromium")
-                if browser_cfg.get("isolated"):
-                    user_data_dir = "<in-memory>"
-                else:
-                    user_data_dir = browser_cfg.get("user_data_dir") or str(
-                        get_session_dir(s["name"]) / "browser-data"
-                    )
-                headed = not browser_cfg.get("launch_options", {}).get(
-                    "headless", False
-                )
-                print(f"  - browser-type: {browser_type}")
-                print(f"  - user-data-dir: {user_data_dir}")
-                print(f"  - headed: {str(headed).lower()}")
+        for r in records:
+            print(f"- {r['name']}:")
+            print(f"  - status: {r['status']}")
+            if "browser_type" in r:
+                print(f"  - browser-type: {r['browser_type']}")
+                print(f"  - user-data-dir: {r['user_data_dir']}")
+                print(f"  - headed: {str(r['headed']).lower()}")
         return
 
     if args.command == "close-all":
@@ -515,8 +565,6 @@ def main(argv: list[str] | None = None) -> None:
         return
 
     if args.command == "logs":
-        import subprocess
-
         log_path = get_log_path(session_name)
         if not log_path.exists():
             print(f"No log file found for session '{session_name}'.", file=sys.stderr)
@@ -524,19 +572,22 @@ def main(argv: list[str] | None = None) -> None:
             sys.exit(1)
         if args.follow:
             try:
-                subprocess.run(["tail", "-f", str(log_path)], check=False)
+                _run(["tail", "-f", str(log_path)], check=False)
             except KeyboardInterrupt:
                 pass
-        elif args.lines == 0:
-            print(log_path.read_text(encoding="utf-8"), end="")
         else:
-            subprocess.run(["tail", "-n", str(args.lines), str(log_path)], check=False)
+            # Copy the raw bytes: no decoding, and no tail subprocess.
+            sys.stdout.flush()
+            with log_path.open("rb") as f:
+                if args.lines == 0:
+                    shutil.copyfileobj(f, sys.stdout.buffer)
+                else:
+                    sys.stdout.buffer.write(_tail(f, args.lines))
+            sys.stdout.buffer.flush()
         return
 
     if args.command == "install":
         if hasattr(args, "skills") and args.skills:
-            import shutil
-
             skills_src = Path(__file__).parent / "skills"
             skills_dst = Path.home() / ".claude" / "skills"
             if not skills_src.is_dir():
@@ -556,13 +607,11 @@ def main(argv: list[str] | None = None) -> None:
         return
 
     if args.command == "install-browser":
-        import subprocess
-
         cmd = ["patchright", "install"]
         if hasattr(args, "browser") and args.browser:
             cmd.append(args.browser)
         try:
-            subprocess.run(cmd, check=True)
+            _run(cmd, check=True)
         except FileNotFoundError:
             print(
                 "patchright command not found. Install patchright first.",
@@ -571,8 +620,12 @@ def main(argv: list[str] | None = None) -> None:
             sys.exit(1)
         return
 
-    # 4. Handle `open` specially — merge CLI flags into config
+    # 3. Handle `open` specially — load the config and merge CLI flags into it.
+    # Only `open` uses the config, so other commands skip importing pydantic.
     if args.command == "open":
+        from patchright_cli.config import load_config
+
+        config = load_config(args.config)
         if args.browser is not None:
             config.browser.launch_options["channel"] = args.browser
         if args.isolated:
@@ -596,13 +649,13 @@ def main(argv: list[str] | None = None) -> None:
             sys.exit(1)
         return
 
-    # 5. All other commands — send to the daemon
+    # 4. All other commands — send to the daemon
     cmd_name = args.command
     args_dict = _args_to_dict(args)
 
     result = send_command(session_name, cmd_name, args_dict)
 
-    # 6. Print result
+    # 5. Print result
     if result["ok"]:
         output = result.get("output", "")
         if output:
@@ -9,12 +9,15 @@ from __future__ import annotations
 
 import json
 import os
+import select
 import shutil
 import signal
 import socket
 import subprocess
 import sys
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
 
 from patchright_cli.session import (
     cleanup_session,
@@ -24,22 +27,120 @@ from patchright_cli.session import (
     list_sessions,
 )
 
+# orjson is optional; without it the stdlib json module is used.  Both take
+# and produce the bytes that go over the socket.
+try:
+    from orjson import dumps as _dumps
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
+
+    def _dumps(obj: object) -> bytes:
+        return json.dumps(obj).encode()
+
 
 def _receive_all(sock: socket.socket, buffer_size: int = 65536) -> bytes:
-    """Read all data from socket until the connection closes or a newline is found.
+    """Read from socket until a newline arrives or the connection closes.
 
     The daemon protocol uses newline-delimited JSON, so we stop reading
-    as soon as a complete line has arrived.
+    as soon as a complete line has arrived and return just that line.
     """
-    data = b""
+    # Receive straight into one buffer, doubling it when full, instead of
+    # allocating a bytes object per recv and copying them all again to join.
+    # Only the newly received bytes are searched for the newline.
+    buf = bytearray(buffer_size)
+    used = 0
     while True:
-        chunk = sock.recv(buffer_size)
-        if not chunk:
+        if used == len(buf):
+            grown = bytearray(2 * len(buf))
+            grown[:used] = buf
+            buf = grown
+        n = sock.recv_into(memoryview(buf)[used:])
+        if not n:
             break
-        data += chunk
-        if b"\n" in data:
+        end = buf.find(b"\n", used, used + n)
+        if end != -1:
+            used = end
             break
-    return data.strip()
+        used += n
+    return bytes(memoryview(buf)[:used]).strip()
+
+
+class _ConnectionCache(threading.local):
+    """Each thread's open daemon connections, keyed by session name."""
+
+    def __init__(self) -> None:
+        self.socks: dict[str, socket.socket] = {}
+
+
+_conn_cache = _ConnectionCache()
+
+
+def _get_or_connect(
+    session_name: str, sock_path: str, timeout: float
+) -> tuple[socket.socket, bool]:
+    """Return this thread's connection to *session_name*, opening one if needed.
+
+    A new connection is made to *sock_path*.  *timeout* is applied to the
+    connection whether it is new or reused.
+
+    The second item is ``True`` when the connection was reused from the
+    cache, and so may have been closed by the daemon since it was last used.
+    """
+    if (sock := _conn_cache.socks.get(session_name)) is not None:
+        sock.settimeout(timeout)
+        return sock, True
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(timeout)
+        sock.connect(sock_path)
+    except BaseException:
+        sock.close()
+        raise
+    _conn_cache.socks[session_name] = sock
+    return sock, False
+
+
+def _drop_connection(session_name: str) -> None:
+    """Close and forget this thread's cached connection to *session_name*."""
+    if (sock := _conn_cache.socks.pop(session_name, None)) is not None:
+        sock.close()
+
+
+def _send_line(sock: socket.socket, payload: bytes) -> None:
+    """Send *payload* and its newline delimiter without joining them first.
+
+    ``sendmsg`` hands both buffers to the kernel in one call, but may send
+    only part of them, so it is repeated until everything is out.  Where
+    ``sendmsg`` is unavailable (Windows) the line is joined and sent with
+    ``sendall``.
+    """
+    try:
+        sendmsg = sock.sendmsg
+    except AttributeError:
+        sock.sendall(payload + b"\n")
+        return
+    buffers = [memoryview(payload), memoryview(b"\n")]
+    while buffers:
+        sent = sendmsg(buffers)
+        while sent:
+            if sent < len(buffers[0]):
+                buffers[0] = buffers[0][sent:]
+                break
+            sent -= len(buffers.pop(0))
+
+
+def _send_once(sock: socket.socket, payload: bytes) -> bytes:
+    """Send one request over *sock* and return the reply line.
+
+    Raises ``ConnectionResetError`` if the daemon hangs up without replying.
+    """
+    _send_line(sock, payload)
+    # Read response (may be large for snapshots)
+    data = _receive_all(sock)
+    if not data:
+        raise ConnectionResetError("daemon closed the connection")
+    return data
 
 
 def send_command(
@@ -50,8 +151,10 @@ def send_command(
 ) -> dict:
     """Send a JSON command to a running daemon and return its response.
 
-    Connects to the Unix domain socket for *session_name*, transmits
-    a newline-delimited JSON payload, and waits for the reply.
+    Transmits a newline-delimited JSON payload over the Unix domain socket
+    for *session_name* and waits for the reply.  The connection is kept
+    open (per thread) for later commands to the same session; a cached
+    connection the daemon has since dropped is replaced once, transparently.
 
     Returns a dict that always contains an ``ok`` key (bool).  On
     failure the dict also contains an ``error`` key with a human-readable
@@ -59,6 +162,7 @@ def send_command(
     """
     sock_path = get_socket_path(session_name)
     if not sock_path.exists():
+        _drop_connection(session_name)
         return {
             "ok": False,
             "error": (
@@ -67,17 +171,21 @@ def send_command(
             ),
         }
 
-    s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    payload = _dumps({"cmd": cmd, "args": args or {}})
     try:
-        s.settimeout(timeout)
-        s.connect(str(sock_path))
-        payload = json.dumps({"cmd": cmd, "args": args or {}}).encode() + b"\n"
-        s.sendall(payload)
-
-        # Read response (may be large for snapshots)
-        data = _receive_all(s)
-        return json.loads(data)
+        s, reused = _get_or_connect(session_name, str(sock_path), timeout)
+        try:
+            data = _send_once(s, payload)
+        except BrokenPipeError, ConnectionResetError:
+            if not reused:
+                raise
+            # The daemon dropped the idle connection; retry on a fresh one.
+            _drop_connection(session_name)
+            s, _ = _get_or_connect(session_name, str(sock_path), timeout)
+            data = _send_once(s, payload)
+        result = _loads(data)
     except ConnectionRefusedError:
+        _drop_connection(session_name)
         cleanup_session(session_name)
         return {
             "ok": False,
@@ -88,11 +196,16 @@ def send_command(
             ),
         }
     except socket.timeout:
+        # A late reply would be read as the next command's; start afresh.
+        _drop_connection(session_name)
         return {"ok": False, "error": f"Command timed out after {timeout}s"}
     except Exception as e:
+        _drop_connection(session_name)
         return {"ok": False, "error": f"Connection error: {e}"}
-    finally:
-        s.close()
+    if cmd == "close":
+        # The daemon hangs up after answering a close.
+        _drop_connection(session_name)
+    return result
 
 
 def start_daemon(
@@ -106,9 +219,9 @@ def start_daemon(
 
         python -c "from patchright_cli.server import start_daemon; ..."
 
-    The function waits up to *timeout* seconds for the Unix socket to
-    appear on disk, which signals that the daemon is ready to accept
-    commands.
+    The daemon writes a byte to a pipe once its Unix socket is accepting
+    commands.  The function waits up to *timeout* seconds for that byte;
+    a daemon that exits first closes the pipe, which ends the wait at once.
 
     Returns ``True`` if the daemon started (or was already running),
     ``False`` otherwise.
@@ -125,34 +238,34 @@ def start_daemon(
 
     config_json = json.dumps(config_dict)
 
-    # Launch daemon detached from this process group.
-    # stdout/stderr are set to DEVNULL for the subprocess itself because
-    # the daemon configures Python logging to a file internally (daemon.log
-    # inside the session directory).
-    proc = subprocess.Popen(
-        [
-            sys.executable,
-            "-c",
-            (
-                "from patchright_cli.server import start_daemon; "
-                f"start_daemon({session_name!r}, {config_json!r})"
-            ),
-        ],
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL,
-        start_new_session=True,
-    )
-
-    # Poll until the socket appears or the process dies.
-    start_time = time.monotonic()
-    while time.monotonic() - start_time < timeout:
-        if sock_path.exists():
-            return True
-        if proc.poll() is not None:
-            return False
-        time.sleep(0.1)
+    ready_r, ready_w = os.pipe()
+    with open(ready_r, "rb", buffering=0) as ready:
+        # Launch daemon detached from this process group.
+        # stdout/stderr are set to DEVNULL for the subprocess itself because
+        # the daemon configures Python logging to a file internally (daemon.log
+        # inside the session directory).
+        try:
+            subprocess.Popen(
+                [
+                    sys.executable,
+                    "-c",
+                    (
+                        "from patchright_cli.server import start_daemon; "
+                        f"start_daemon({session_name!r}, {config_json!r}, "
+                        f"ready_fd={ready_w})"
+                    ),
+                ],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True,
+                pass_fds=(ready_w,),
+            )
+        finally:
+            # Only the daemon may hold the write end, so its exit means EOF.
+            os.close(ready_w)
 
-    return False
+        readable, _, _ = select.select([ready], [], [], timeout)
+        return bool(readable) and ready.read(1) == b"1"
 
 
 def open_session(
@@ -179,14 +292,21 @@ def open_session(
 def close_all_sessions() -> list[dict]:
     """Gracefully close every active session.
 
-    Sends the ``close`` command to each running daemon.  Stale sessions
+    Sends the ``close`` command to all running daemons at once, so the wait
+    is bounded by the slowest one rather than their sum.  Stale sessions
     (process no longer alive) are cleaned up automatically.
     """
+    sessions = list_sessions()
+    alive = [session["name"] for session in sessions if session["alive"]]
+    closed: dict[str, dict] = {}
+    if alive:
+        with ThreadPoolExecutor(max_workers=min(32, len(alive))) as ex:
+            closed = dict(zip(alive, ex.map(send_command, alive, repeat("close"))))
+
     results: list[dict] = []
-    for session in list_sessions():
+    for session in sessions:
         if session["alive"]:
-            result = send_command(session["name"], "close")
-            results.append({"name": session["name"], **result})
+            results.append({"name": session["name"], **closed[session["name"]]})
         else:
             cleanup_session(session["name"])
             results.append(
@@ -205,8 +325,9 @@ def kill_all_sessions() -> list[dict]:
     Every session directory is cleaned up regardless of whether the
     kill succeeds.
     """
+    sessions = list_sessions()
     results: list[dict] = []
-    for session in list_sessions():
+    for session in sessions:
         pid = session.get("pid")
         name = session["name"]
         if pid and session["alive"]:
@@ -225,7 +346,11 @@ def kill_all_sessions() -> list[dict]:
                         "error": f"Permission denied killing PID {pid}",
                     }
                 )
-        cleanup_session(name)
+    # The signals are single syscalls; only the file cleanup is worth
+    # overlapping across sessions.
+    if sessions:
+        with ThreadPoolExecutor(max_workers=min(32, len(sessions))) as ex:
+            list(ex.map(cleanup_session, (s["name"] for s in sessions)))
     return results
 
 
@@ -12,15 +12,24 @@ The server is started as a background daemon process by ``start_daemon`` (called
 from __future__ import annotations
 
 import asyncio
+import atexit
+import functools
+import io
 import json
 import logging
 import os
+import queue
+import signal
 import sys
 import time
 import traceback
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from typing import Any
 
+from patchright.async_api import Error as PlaywrightError
 from patchright.async_api import async_playwright
 
 from patchright_cli.config import CLIConfig
@@ -37,6 +46,183 @@ from patchright_cli.snapshot import take_snapshot
 
 logger = logging.getLogger("patchright_cli.server")
 
+# The socket protocol goes through orjson when it is installed, as the client
+# does, falling back to the stdlib.  Replies are encoded compactly either way.
+try:
+    from orjson import dumps as _encode_reply
+    from orjson import loads as _decode_request
+except ImportError:
+    from json import loads as _decode_request
+
+    def _encode_reply(obj: object) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+
+# The daemon's event loop is uvloop's when it is installed.
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+# Invokes a cached ``() => (expression)`` handle.  If the expression itself was
+# a function literal, call it too, matching ``page.evaluate`` semantics.
+_CALL_EXPR_HANDLE_JS = (
+    "async (fn) => { const r = await fn(); return typeof r === 'function' ? r() : r; }"
+)
+
+# Compiled eval expressions kept per page; the least recently used is disposed
+# beyond this.
+_EXPR_HANDLE_CACHE_SIZE = 64
+
+
+# Console severity ranking used by ``cmd_console`` level filtering.
+_LEVEL_ORDER: dict[str, int] = {
+    "debug": 0,
+    "log": 1,
+    "info": 2,
+    "warning": 3,
+    "error": 4,
+}
+
+# Resource types treated as static assets by ``cmd_network``.
+_STATIC_TYPES: frozenset[str] = frozenset(
+    {"image", "font", "stylesheet", "script", "media"}
+)
+
+# Buffers longer than this are joined via StringIO (see _join_lines).
+_STREAM_JOIN_THRESHOLD = 1024
+
+# Shared constant results.  Callers only serialize these, never mutate them.
+_ERR_NO_PAGE: dict[str, Any] = {"ok": False, "error": "No active page."}
+_ERR_NO_DIALOG_ACCEPT: dict[str, Any] = {"ok": False, "error": "No dialog to accept."}
+_ERR_NO_DIALOG_DISMISS: dict[str, Any] = {"ok": False, "error": "No dialog to dismiss."}
+_DEVTOOLS_UNAVAILABLE: dict[str, Any] = {
+    "ok": True,
+    "output": "DevTools are not available in daemon mode.",
+}
+
+# Numeric parameter annotations coerced once at dispatch (see _numeric_params).
+_NUMERIC_ANNOTATIONS: dict[str, type] = {
+    "int": int,
+    "float": float,
+    "int | None": int,
+    "float | None": float,
+}
+
+_numeric_params_cache: dict[str, dict[str, type]] = {}
+
+
+def _numeric_params(handler: Any) -> dict[str, type]:
+    """Return ``{param: int|float}`` for the numeric parameters of *handler*.
+
+    Built from the (string) annotations on first use and cached per handler
+    name, so handlers can rely on their declared types without re-coercing.
+    """
+    name = handler.__name__
+    params = _numeric_params_cache.get(name)
+    if params is None:
+        params = {
+            param: _NUMERIC_ANNOTATIONS[annotation]
+            for param, annotation in handler.__annotations__.items()
+            if param != "return" and annotation in _NUMERIC_ANNOTATIONS
+        }
+        _numeric_params_cache[name] = params
+    return params
+
+
+def _coerce_numeric(value: Any, typ: type) -> int | float:
+    """Convert *value* for a parameter annotated *typ* (``int`` or ``float``).
+
+    An int is already a valid float and passes through, and whole-number
+    strings become ints, so generated code keeps ``100`` rather than ``100.0``.
+    """
+    if typ is int:
+        return int(value)
+    if type(value) is int:
+        return value
+    number = float(value)
+    return int(number) if number.is_integer() else number
+
+
+@functools.lru_cache(maxsize=256)
+def _locator_code(role: str | None, name: str | None, selector: str) -> str:
+    """Return the JS locator expression for an element ref's metadata.
+
+    Memoized on the metadata itself rather than the ref, so a ref that a new
+    snapshot reassigns never picks up another element's code.
+    """
+    if role:
+        if name:
+            escaped = name.replace("'", "\\'")
+            return f"page.getByRole('{role}', {{ name: '{escaped}' }})"
+        return f"page.getByRole('{role}')"
+    return f"page.locator('{selector}')"
+
+
+def _js_string(value: str) -> str:
+    """Return *value* as a single-quoted JS string literal for generated code.
+
+    ``json.dumps`` does the escaping (backslashes, control characters, quotes)
+    in C; only the outer quotes are swapped to keep the playwright-cli style.
+    """
+    return "'" + json.dumps(value, ensure_ascii=False)[1:-1].replace("'", "\\'") + "'"
+
+
+def _join_lines(lines: Iterable[str], size_hint: int) -> str:
+    """Join *lines* with newlines.
+
+    Small inputs go through a list + ``str.join``.  Above
+    ``_STREAM_JOIN_THRESHOLD`` (judged by *size_hint*, the source buffer
+    length) lines are written into a ``StringIO`` instead of first being
+    collected into a large intermediate list.
+    """
+    if size_hint <= _STREAM_JOIN_THRESHOLD:
+        return "\n".join(list(lines))
+    buf = io.StringIO()
+    write = buf.write
+    sep = ""
+    for line in lines:
+        write(sep)
+        write(line)
+        sep = "\n"
+    return buf.getvalue()
+
+
+def _format_console_message(m: dict[str, Any], msg_type: str | None = None) -> str:
+    """Format a captured console message as a single log line.
+
+    *msg_type* lets a caller that has already read the message type pass it
+    in instead of looking it up again.
+    """
+    if msg_type is None:
+        msg_type = m.get("type", "log")
+    return (
+        f"[{m.get('elapsed_ms', 0):>8}ms] [{msg_type.upper()}] "
+        f"{m.get('text', '')}{m.get('loc_str', '')}"
+    )
+
+
+def _requires_page(
+    handler: Callable[..., Awaitable[dict[str, Any]]],
+) -> Callable[..., Awaitable[dict[str, Any]]]:
+    """Pass the active page to *handler*, or fail fast if there is none.
+
+    The wrapped handler takes the page as its first argument after ``self``;
+    callers (and ``handle_command``) invoke it without one.
+    """
+
+    @functools.wraps(handler)
+    async def wrapper(
+        self: BrowserSession, *args: Any, **kwargs: Any
+    ) -> dict[str, Any]:
+        page = self.active_page
+        if page is None:
+            return _ERR_NO_PAGE
+        return await handler(self, page, *args, **kwargs)
+
+    return wrapper
+
 
 # ---------------------------------------------------------------------------
 # Response builder
@@ -46,6 +232,17 @@ logger = logging.getLogger("patchright_cli.server")
 class Response:
     """Builds section-based markdown output matching playwright-cli format."""
 
+    # One is built per command; slots keep that allocation small and cheap.
+    __slots__ = (
+        "_code",
+        "_errors",
+        "_full_snapshot_filename",
+        "_include_full_snapshot",
+        "_include_snapshot",
+        "_is_snapshot_command",
+        "_results",
+    )
+
     def __init__(self) -> None:
         self._errors: list[str] = []
         self._results: list[str] = []
@@ -89,6 +286,10 @@ class Response:
             path.write_bytes(data)
         else:
             path.write_text(data, encoding="utf-8")
+        self.add_file_link(title, path)
+
+    def add_file_link(self, title: str, path: Path) -> None:
+        """Link to an output file that has already been written to *path*."""
         rel_path = f".patchright-cli/{path.name}"
         self._results.append(f"- [{title}]({rel_path})")
 
@@ -153,11 +354,7 @@ class Response:
         start_line = session._last_console_index + 1
         session._last_console_index = len(session.console_messages)
         if new_console:
-            lines = [
-                f"[{m.get('elapsed_ms', 0):>8}ms] [{m.get('type', 'log').upper()}] {m.get('text', '')}{m.get('loc_str', '')}"
-                for m in new_console
-            ]
-            text = "\n".join(lines)
+            text = "\n".join([_format_console_message(m) for m in new_console])
             path = generate_output_filename("console", "log")
             path.parent.mkdir(parents=True, exist_ok=True)
             path.write_text(text, encoding="utf-8")
@@ -169,6 +366,15 @@ class Response:
         return "\n".join(sections)
 
 
+async def _dispose_handles(handles: Iterable[Any]) -> None:
+    """Dispose of JS *handles*, ignoring ones whose page or context is gone."""
+    for handle in handles:
+        try:
+            await handle.dispose()
+        except Exception:
+            pass  # Already released along with its execution context
+
+
 # ---------------------------------------------------------------------------
 # BrowserSession
 # ---------------------------------------------------------------------------
@@ -192,6 +398,9 @@ class BrowserSession:
         self.element_refs: dict[str, str | dict[str, str | None]] = {}
         self.ref_counter: int = 0
 
+        # Compiled eval expressions: page -> {expression: JSHandle}, in LRU order
+        self._expr_handles: dict[Any, OrderedDict[str, Any]] = {}
+
         # Captured events
         self.dialog_queue: list[dict[str, Any]] = []
         self.console_messages: list[dict[str, Any]] = []
@@ -227,12 +436,15 @@ class BrowserSession:
         cfg = self.config
         bcfg = cfg.browser
 
-        self.playwright = await async_playwright().start()
+        # A driver may already be running (a repeated open, or one handed in
+        # by the caller); a second would just be another Node.js process.
+        if self.playwright is None:
+            self.playwright = await async_playwright().start()
 
         browser_type = getattr(self.playwright, bcfg.browser_name)
 
         launch_opts = dict(bcfg.launch_options)
-        context_opts = dict(bcfg.context_options)
+        context_opts = self._context_options()
 
         # Strip Chromium flags that leak automation detection signals.
         # Patchright's driver adds these by default; ignore_default_args
@@ -273,14 +485,6 @@ class BrowserSession:
             env.setdefault("GOOGLE_DEFAULT_CLIENT_ID", "no")
             launch_opts["env"] = env
 
-        # Video recording
-        if cfg.save_video is not None:
-            context_opts["record_video_dir"] = str(get_output_dir())
-            context_opts["record_video_size"] = {
-                "width": cfg.save_video.width,
-                "height": cfg.save_video.height,
-            }
-
         # ---- Connection strategies -----------------------------------------
         if bcfg.cdp_endpoint:
             # 1. Connect over CDP
@@ -319,21 +523,7 @@ class BrowserSession:
             self.context = await self.browser.new_context(**context_opts)
 
         # ---- Post-launch setup ---------------------------------------------
-        self.context.on("page", self._on_new_page_sync)
-
-        # Timeouts
-        self.context.set_default_timeout(cfg.timeouts.action)
-        self.context.set_default_navigation_timeout(cfg.timeouts.navigation)
-
-        # Init scripts
-        for script in bcfg.init_script:
-            await self.context.add_init_script(script)
-
-        # WebGL renderer spoofing (via route-based HTML injection)
-        await self._setup_webgl_override()
-
-        # Network filtering
-        await self._setup_network_filtering()
+        await self._setup_context()
 
         # Open initial page
         if self.context.pages:
@@ -358,6 +548,46 @@ class BrowserSession:
 
         self._start_time = time.time()
 
+    def _context_options(self) -> dict[str, Any]:
+        """Return the keyword arguments for a new browser context."""
+        cfg = self.config
+        context_opts = dict(cfg.browser.context_options)
+
+        # Video recording
+        if cfg.save_video is not None:
+            context_opts["record_video_dir"] = str(get_output_dir())
+            context_opts["record_video_size"] = {
+                "width": cfg.save_video.width,
+                "height": cfg.save_video.height,
+            }
+        return context_opts
+
+    async def _setup_context(self) -> None:
+        """Apply the per-context setup to a freshly created ``self.context``.
+
+        Routes and tracing belong to the previous context, so their state is
+        reset as well.
+        """
+        cfg = self.config
+        self.active_routes = {}
+        self.tracing_active = False
+
+        self.context.on("page", self._on_new_page_sync)
+
+        # Timeouts
+        self.context.set_default_timeout(cfg.timeouts.action)
+        self.context.set_default_navigation_timeout(cfg.timeouts.navigation)
+
+        # Init scripts
+        for script in cfg.browser.init_script:
+            await self.context.add_init_script(script)
+
+        # WebGL renderer spoofing (via route-based HTML injection)
+        await self._setup_webgl_override()
+
+        # Network filtering
+        await self._setup_network_filtering()
+
     # -- Page event handlers -------------------------------------------------
 
     def _on_new_page_sync(self, page: Any) -> None:
@@ -433,10 +663,20 @@ class BrowserSession:
                     entry["status"] = resp.status
                     break
 
+        def _on_frame_navigated(frame: Any) -> None:
+            # Handles die with the page's execution context
+            if frame == page.main_frame:
+                self._drop_expr_handles(page)
+
+        def _on_close(_page: Any) -> None:
+            self._drop_expr_handles(page)
+
         page.on("dialog", _on_dialog)
         page.on("console", _on_console)
         page.on("request", _on_request)
         page.on("response", _on_response)
+        page.on("framenavigated", _on_frame_navigated)
+        page.on("close", _on_close)
 
     # -- WebGL renderer spoofing ---------------------------------------------
 
@@ -577,14 +817,44 @@ class BrowserSession:
         if entry is None:
             return f"page.locator('aria-ref={ref}')"
         if isinstance(entry, dict):
-            role = entry.get("role")
-            name = entry.get("name")
-            if role and name:
-                escaped = name.replace("'", "\\'")
-                return f"page.getByRole('{role}', {{ name: '{escaped}' }})"
-            elif role:
-                return f"page.getByRole('{role}')"
-        return f"page.locator('{self._resolve_ref(ref)}')"
+            return _locator_code(
+                entry.get("role"), entry.get("name"), entry["selector"]
+            )
+        return _locator_code(None, None, entry)
+
+    async def _evaluate_cached(self, page: Any, expression: str) -> Any:
+        """Evaluate *expression* on *page*, reusing a compiled function handle.
+
+        The expression is compiled once per page into a ``() => (expression)``
+        handle, so repeated evals (e.g. polling loops) skip re-parsing in V8.
+        Up to ``_EXPR_HANDLE_CACHE_SIZE`` handles are kept per page; the least
+        recently used one is disposed to make room.  Input that cannot be
+        wrapped (statements) is evaluated directly without caching.
+        """
+        handles = self._expr_handles.setdefault(page, OrderedDict())
+        handle = handles.get(expression)
+        if handle is not None:
+            handles.move_to_end(expression)
+        else:
+            try:
+                handle = await page.evaluate_handle(f"() => ({expression})")
+            except PlaywrightError as exc:
+                # Compiling the wrapper never runs the expression, so only a
+                # wrapper that does not parse is worth retrying unwrapped.
+                if "SyntaxError" not in exc.message:
+                    raise
+                return await page.evaluate(expression)
+            handles[expression] = handle
+            if len(handles) > _EXPR_HANDLE_CACHE_SIZE:
+                _, evicted = handles.popitem(last=False)
+                await _dispose_handles([evicted])
+        return await page.evaluate(_CALL_EXPR_HANDLE_JS, handle)
+
+    def _drop_expr_handles(self, page: Any) -> None:
+        """Forget *page*'s compiled eval handles and dispose of them."""
+        handles = self._expr_handles.pop(page, None)
+        if handles:
+            asyncio.ensure_future(_dispose_handles(list(handles.values())))
 
     # -- Command dispatch ----------------------------------------------------
 
@@ -595,7 +865,13 @@ class BrowserSession:
         if handler is None:
             return {"ok": False, "error": f"Unknown command: {cmd}"}
         try:
-            result = await handler(**args)
+            # Coerced into a copy; the caller's args are left as sent.
+            coerced = {
+                param: _coerce_numeric(value, typ)
+                for param, typ in _numeric_params(handler).items()
+                if (value := args.get(param)) is not None and type(value) is not typ
+            }
+            result = await handler(**(args | coerced))
             return result
         except Exception as exc:
             return {"ok": False, "error": f"{exc}\n{traceback.format_exc()}"}
@@ -665,11 +941,9 @@ class BrowserSession:
         output = await response.serialize(self)
         return {"ok": True, "output": f"{info}\n\n{output}"}
 
-    async def cmd_goto(self, url: str) -> dict[str, Any]:
+    @_requires_page
+    async def cmd_goto(self, page: Any, url: str) -> dict[str, Any]:
         """Navigate the active page to *url*."""
-        page = self.active_page
-        if page is None:
-            return {"ok": False, "error": "No active page."}
         await page.goto(url, wait_until="domcontentloaded")
         try:
             await page.wait_for_load_state("load", timeout=5000)
@@ -693,11 +967,11 @@ class BrowserSession:
             pass
         return {"ok": True, "output": f"Browser '{self.session_name}' closed\n"}
 
-    async def cmd_type(self, text: str, submit: bool = False) -> dict[str, Any]:
+    @_requires_page
+    async def cmd_type(
+        self, page: Any, text: str, submit: bool = False
+    ) -> dict[str, Any]:
         """Type *text* using the keyboard on the active page."""
-        page = self.active_page
-        if page is None:
-            return {"ok": False, "error": "No active page."}
         await page.keyboard.type(text)
         if submit:
             await page.keyboard.press("Enter")
@@ -709,13 +983,15 @@ class BrowserSession:
         response.set_include_snapshot()
         return {"ok": True, "output": await response.serialize(self)}
 
+    @_requires_page
     async def cmd_click(
-        self, ref: str, button: str = "left", modifiers: list[str] | None = None
+        self,
+        page: Any,
+        ref: str,
+        button: str = "left",
+        modifiers: list[str] | None = None,
     ) -> dict[str, Any]:
         """Click on the element identified by *ref*."""
-        page = self.active_page
-        if page is None:
-            return {"ok": False, "error": "No active page."}
         selector = self._resolve_ref(ref)
         click_kwargs: dict[str, Any] = {"button": button}
         if modifiers:
@@ -726,13 +1002,15 @@ class BrowserSession:
         response.set_include_snapshot()
         return {"ok": True, "output": await response.serialize(self)}
 
+    @_requires_page
     async def cmd_dblclick(
-        self, ref: str, button: str = "left", modifiers: list[str] | None = None
+        self,
+        page: Any,
+        ref: str,
+        button: str = "left",
+        modifiers: list[str] | None = None,
     ) -> dict[str, Any]:
         """Double-click on the element identified by *ref*."""
-        page = self.active_page
-        if page is None:
-            return {"ok": False, "error": "No active page."}
         selector = self._resolve_ref(ref)
         dblclick_kwargs: dict[str, Any] = {"button": button}
         if modifiers:
@@ -743,13 +1021,11 @@ class BrowserSession:
         response.set_include_snapshot()
         return {"ok": True, "output": await response.serialize(self)}
 
+    @_requires_page
     async def cmd_fill(
-        self, ref: str, text: str, submit: bool = False
+        self, page: Any, ref: str, text: str, submit: bool = False
     ) -> dict[str, Any]:
         """Fill the element identified by *ref* with *text*."""
-        page = self.active_page
-        if page is None:
-            return {"ok": False, "error": "No active page."}
         selector = self._resolve_ref(ref)
         await page.locator(selector).fill(text)
         if submit:
@@ -762,11 +1038,9 @@ class BrowserSession:
         response.set_include_snapshot()
         return {"ok": True, "output": await response.serialize(self)}
 
-    async def cmd_drag(self, start_ref: str, end_ref: str) -> dict[str, Any]:
+    @_requires_page
+    async def cmd_drag(self, page: Any, start_ref: str, end_ref: str) -> dict[str, Any]:
         """Drag from *start_ref* to *end_ref*."""
-        page = self.active_page
-        if page is None:
-            return {"ok": False, "error": "No active page."}
         start_sel = self._resolve_ref(start_ref)
         end_sel = self._resolve_ref(end_ref)
         await page.drag_and_drop(start_sel, end_sel)
@@ -777,11 +1051,9 @@ class BrowserSession:
         response.set_include_snapshot()
         return {"ok": True, "output": await response.serialize(self)}
 
-    async def cmd_hover(self, ref: str) -> dict[str, Any]:
+    @_requires_page
+    async def cmd_hover(self, page: Any, ref: str) -> dict[str, Any]:
         """Hover over the element identified by *ref*."""
-        page = self.active_page
-        if page is None:
-            return {"ok": False, "error": "No active page."}
         selector = self._resolve_ref(ref)
         await page.locator(selector).hover()
         response = Response()
@@ -789,23 +1061,21 @@ class BrowserSession:
         response.set_include_snapshot()
         return {"ok": True, "output": await response.serialize(self)}
 
-    async def cmd_select(self, ref: str, value: str) -> dict[str, Any]:
+    @_requires_page
+    async def cmd_select(self, page: Any, ref: str, value: str) -> dict[str, Any]:
         """Select an option by *value* in the element identified by *ref*."""
-        page = self.active_page
-        if page is None:
-            return {"ok": False, "error": "No active page."}
         selector = self._resolve_ref(ref)
         await page.locator(selector).select_option(value)
         response = Response()
-        response.add_code(f"await {self._ref_to_code(ref)}.selectOption('{value}');")
+        response.add_code(
+            f"await {self._ref_to_code(ref)}.selectOption({_js_string(value)});"
+        )
         response.set_include_snapshot()
         return {"ok": True, "output": await response.serialize(self)}
 
-    async def cmd_upload(self, file: str) -> dict[str, Any]:
+    @_requires_page
+    async def cmd_upload(self, page: Any, file: str) -> dict[str, Any]:
         """Upload a file via a file input on the page."""
-        page = self.active_page
-        if page is None:
-            return {"ok": False, "error": "No active page."}
         file_input = page.locator('input[type="file"]')
         await file_input.set_input_files(file)
         response = Response()
@@ -815,11 +1085,9 @@ class BrowserSession:
         response.set_include_snapshot()
         return {"ok": True, "output": await response.serialize(self)}
 
-    async def cmd_check(self, ref: str) -> dict[str, Any]:
+    @_requires_page
+    async def cmd_check(self, page: Any, ref: str) -> dict[str, Any]:
         """Check the checkbox identified by *ref*."""
-        page = self.active_page
-        if page is None:
-            return {"ok": False, "error": "No active page."}
         selector = self._resolve_ref(ref)
         await page.locator(selector).check()
         response = Response()
@@ -827,11 +1095,9 @@ class BrowserSession:
         response.set_include_snapshot()
         return {"ok": True, "output": await response.serialize(self)}
 
-    async def cmd_uncheck(self, ref: str) -> dict[str, Any]:
+    @_requires_page
+    async def cmd_uncheck(self, page: Any, ref: str) -> dict[str, Any]:
         """Uncheck the checkbox identified by *ref*."""
-        page = self.active_page
-        if page is None:
-            return {"ok": False, "error": "No active page."}
         selector = self._resolve_ref(ref)
         await page.locator(selector).uncheck()
         response = Response()
@@ -839,25 +1105,25 @@ class BrowserSession:
         response.set_include_snapshot()
         return {"ok": True, "output": await response.serialize(self)}
 
-    async def cmd_snapshot(self, filename: str | None = None) -> dict[str, Any]:
+    @_requires_page
+    async def cmd_snapshot(
+        self, page: Any, filename: str | None = None
+    ) -> dict[str, Any]:
         """Take a DOM snapshot, optionally saving to *filename*."""
-        page = self.active_page
-        if page is None:
-            return {"ok": False, "error": "No active page."}
         response = Response()
         response.set_include_full_snapshot(filename)
         return {"ok": True, "output": await response.serialize(self)}
 
-    async def cmd_eval(self, expression: str, ref: str | None = None) -> dict[str, Any]:
+    @_requires_page
+    async def cmd_eval(
+        self, page: Any, expression: str, ref: str | None = None
+    ) -> dict[str, Any]:
         """Evaluate a JavaScript *expression*, optionally scoped to *ref*."""
-        page = self.active_page
-        if page is None:
-            return {"ok": False, "error": "No active page."}
         if ref:
             selector = self._resolve_ref(ref)
             result = await page.locator(selector).evaluate(expression)
         else:
-            result = await page.evaluate(expression)
+            result = await self._evaluate_cached(page, expression)
         response = Response()
         response.add_result(json.dumps(result, default=str))
         response.add_code(f"await page.evaluate('() => ({expression})');")
@@ -866,7 +1132,7 @@ class BrowserSession:
     async def cmd_dialog_accept(self, prompt_text: str | None = None) -> dict[str, Any]:
         """Accept the oldest pending dialog."""
         if not self.dialog_queue:
-            return {"ok": False, "error": "No dialog to accept."}
+            return _ERR_NO_DIALOG_ACCEPT
         entry = self.dialog_queue.pop(0)
         dialog = entry["dialog"]
         if prompt_text is not None:
@@ -875,7 +1141,7 @@ class BrowserSession:
             await dialog.accept()
         response = Response()
         if prompt_text is not None:
-            response.add_code(f"await page.dialog.accept('{prompt_text}');")
+            response.add_code(f"await page.dialog.accept({_js_string(prompt_text)});")
         else:
             response.add_code("await page.dialog.accept();")
         response.set_include_snapshot()
@@ -884,7 +1150,7 @@ class BrowserSession:
     async def cmd_dialog_dismiss(self) -> dict[str, Any]:
         """Dismiss the oldest pending dialog."""
         if not self.dialog_queue:
-            return {"ok": False, "error": "No dialog to dismiss."}
+            return _ERR_NO_DIALOG_DISMISS
         entry = self.dialog_queue.pop(0)
         dialog = entry["dialog"]
         await dialog.dismiss()
@@ -893,47 +1159,39 @@ class BrowserSession:
         response.set_include_snapshot()
         return {"ok": True, "output": await response.serialize(self)}
 
-    async def cmd_resize(self, width: int, height: int) -> dict[str, Any]:
+    @_requires_page
+    async def cmd_resize(self, page: Any, width: int, height: int) -> dict[str, Any]:
         """Resize the active page viewport."""
-        page = self.active_page
-        if page is None:
-            return {"ok": False, "error": "No active page."}
-        await page.set_viewport_size({"width": int(width), "height": int(height)})
+        await page.set_viewport_size({"width": width, "height": height})
         response = Response()
         response.add_code(
-            f"await page.setViewportSize({{width: {int(width)}, height: {int(height)}}});"
+            f"await page.setViewportSize({{width: {width}, height: {height}}});"
         )
         return {"ok": True, "output": await response.serialize(self)}
 
     # -- Navigation ----------------------------------------------------------
 
-    async def cmd_go_back(self) -> dict[str, Any]:
+    @_requires_page
+    async def cmd_go_back(self, page: Any) -> dict[str, Any]:
         """Navigate back in history."""
-        page = self.active_page
-        if page is None:
-            return {"ok": False, "error": "No active page."}
         await page.go_back()
         response = Response()
         response.add_code("await page.goBack();")
         response.set_include_snapshot()
         return {"ok": True, "output": await response.serialize(self)}
 
-    async def cmd_go_forward(self) -> dict[str, Any]:
+    @_requires_page
+    async def cmd_go_forward(self, page: Any) -> dict[str, Any]:
         """Navigate forward in history."""
-        page = self.active_page
-        if page is None:
-            return {"ok": False, "error": "No active page."}
         await page.go_forward()
         response = Response()
         response.add_code("await page.goForward();")
         response.set_include_snapshot()
         return {"ok": True, "output": await response.serialize(self)}
 
-    async def cmd_reload(self) -> dict[str, Any]:
+    @_requires_page
+    async def cmd_reload(self, page: Any) -> dict[str, Any]:
         """Reload the active page."""
-        page = self.active_page
-        if page is None:
-            return {"ok": False, "error": "No active page."}
         await page.reload()
         response = Response()
         response.add_code("await page.reload();")
@@ -942,80 +1200,66 @@ class BrowserSession:
 
     # -- Keyboard ------------------------------------------------------------
 
-    async def cmd_press(self, key: str) -> dict[str, Any]:
+    @_requires_page
+    async def cmd_press(self, page: Any, key: str) -> dict[str, Any]:
         """Press a key (e.g. ``Enter``, ``Tab``, ``ArrowDown``)."""
-        page = self.active_page
-        if page is None:
-            return {"ok": False, "error": "No active page."}
         await page.keyboard.press(key)
         response = Response()
-        response.add_code(f"await page.keyboard.press('{key}');")
+        response.add_code(f"await page.keyboard.press({_js_string(key)});")
         response.set_include_snapshot()
         return {"ok": True, "output": await response.serialize(self)}
 
-    async def cmd_keydown(self, key: str) -> dict[str, Any]:
+    @_requires_page
+    async def cmd_keydown(self, page: Any, key: str) -> dict[str, Any]:
         """Dispatch a key-down event."""
-        page = self.active_page
-        if page is None:
-            return {"ok": False, "error": "No active page."}
         await page.keyboard.down(key)
         response = Response()
-        response.add_code(f"await page.keyboard.down('{key}');")
+        response.add_code(f"await page.keyboard.down({_js_string(key)});")
         response.set_include_snapshot()
         return {"ok": True, "output": await response.serialize(self)}
 
-    async def cmd_keyup(self, key: str) -> dict[str, Any]:
+    @_requires_page
+    async def cmd_keyup(self, page: Any, key: str) -> dict[str, Any]:
         """Dispatch a key-up event."""
-        page = self.active_page
-        if page is None:
-            return {"ok": False, "error": "No active page."}
         await page.keyboard.up(key)
         response = Response()
-        response.add_code(f"await page.keyboard.up('{key}');")
+        response.add_code(f"await page.keyboard.up({_js_string(key)});")
         response.set_include_snapshot()
         return {"ok": True, "output": await response.serialize(self)}
 
     # -- Mouse ---------------------------------------------------------------
 
-    async def cmd_mousemove(self, x: float, y: float) -> dict[str, Any]:
+    @_requires_page
+    async def cmd_mousemove(self, page: Any, x: float, y: float) -> dict[str, Any]:
         """Move the mouse to (*x*, *y*)."""
-        page = self.active_page
-        if page is None:
-            return {"ok": False, "error": "No active page."}
-        await page.mouse.move(float(x), float(y))
+        await page.mouse.move(x, y)
         response = Response()
         response.add_code(f"await page.mouse.move({x}, {y});")
         response.set_include_snapshot()
         return {"ok": True, "output": await response.serialize(self)}
 
-    async def cmd_mousedown(self, button: str = "left") -> dict[str, Any]:
+    @_requires_page
+    async def cmd_mousedown(self, page: Any, button: str = "left") -> dict[str, Any]:
         """Press a mouse button down."""
-        page = self.active_page
-        if page is None:
-            return {"ok": False, "error": "No active page."}
         await page.mouse.down(button=button)
         response = Response()
-        response.add_code(f"await page.mouse.down({{button: '{button}'}});")
+        response.add_code(f"await page.mouse.down({{button: {_js_string(button)}}});")
         response.set_include_snapshot()
         return {"ok": True, "output": await response.serialize(self)}
 
-    async def cmd_mouseup(self, button: str = "left") -> dict[str, Any]:
+    @_requires_page
+    async def cmd_mouseup(self, page: Any, button: str = "left") -> dict[str, Any]:
         """Release a mouse button."""
-        page = self.active_page
-        if page is None:
-            return {"ok": False, "error": "No active page."}
         await page.mouse.up(button=button)
         response = Response()
-        response.add_code(f"await page.mouse.up({{button: '{button}'}});")
+        response.add_code(f"await page.mouse.up({{button: {_js_string(button)}}});")
         response.set_include_snapshot()
         return {"ok": True, "output": await response.serialize(self)}
 
-    async def cmd_mousewheel(self, dx: float, dy: float) -> dict[str, Any]:
+    @_requires_page
+    async def cmd_mousewheel(self, page: Any, dx: float, dy: float) -> dict[str, Any]:
         """Scroll the mouse wheel by (*dx*, *dy*)."""
-        page = self.active_page
-        if page is None:
-            return {"ok": False, "error": "No active page."}
-        await page.mouse.wheel(float(dx), float(dy))
+        await page.mouse.wheel(dx, dy)
         response = Response()
         response.add_code(f"await page.mouse.wheel({dx}, {dy});")
         response.set_include_snapshot()
@@ -1023,46 +1267,48 @@ class BrowserSession:
 
     # -- Save as -------------------------------------------------------------
 
+    @_requires_page
     async def cmd_screenshot(
         self,
+        page: Any,
         ref: str | None = None,
         filename: str | None = None,
         full_page: bool = False,
     ) -> dict[str, Any]:
         """Take a screenshot of the page or a specific element."""
-        page = self.active_page
-        if page is None:
-            return {"ok": False, "error": "No active page."}
         response = Response()
+        if filename:
+            path = Path(filename)
+        else:
+            path = generate_output_filename("page", "png")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Let Playwright write the file itself (off the event loop) rather
+        # than handing the bytes back for a second, synchronous write.
         if ref:
             selector = self._resolve_ref(ref)
-            data = await page.locator(selector).screenshot()
+            await page.locator(selector).screenshot(path=str(path))
             response.add_code(f"await {self._ref_to_code(ref)}.screenshot();")
         else:
-            data = await page.screenshot(full_page=full_page)
-            # Determine output path for code display
-            if filename:
-                screenshot_path = filename
-            else:
-                screenshot_path = str(generate_output_filename("page", "png"))
-            opts_parts = [f"path: '{screenshot_path}'", "scale: 'css'", "type: 'png'"]
+            await page.screenshot(path=str(path), full_page=full_page)
+            opts_parts = [f"path: '{path}'", "scale: 'css'", "type: 'png'"]
             if full_page:
                 opts_parts.append("fullPage: true")
             opts = ", ".join(opts_parts)
             response.add_code(f"await page.screenshot({{ {opts} }});")
-        await response.add_file_result(
-            "Screenshot of viewport", data, "page", "png", filename
-        )
+        response.add_file_link("Screenshot of viewport", path)
         return {"ok": True, "output": await response.serialize(self)}
 
-    async def cmd_pdf(self, filename: str | None = None) -> dict[str, Any]:
+    @_requires_page
+    async def cmd_pdf(self, page: Any, filename: str | None = None) -> dict[str, Any]:
         """Save the active page as a PDF."""
-        page = self.active_page
-        if page is None:
-            return {"ok": False, "error": "No active page."}
         response = Response()
-        data = await page.pdf()
-        await response.add_file_result("Page as pdf", data, "page", "pdf", filename)
+        if filename:
+            path = Path(filename)
+        else:
+            path = generate_output_filename("page", "pdf")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        await page.pdf(path=str(path))
+        response.add_file_link("Page as pdf", path)
         response.add_code("await page.pdf();")
         return {"ok": True, "output": await response.serialize(self)}
 
@@ -1070,13 +1316,15 @@ class BrowserSession:
 
     async def cmd_tab_list(self) -> dict[str, Any]:
         """List all open tabs/pages."""
+        # Fetch all titles concurrently; a failed lookup falls back to the URL.
+        titles = await asyncio.gather(
+            *(page.title() for page in self.pages), return_exceptions=True
+        )
         lines: list[str] = []
-        for i, page in enumerate(self.pages):
+        for i, (page, title) in enumerate(zip(self.pages, titles)):
             marker = "(current) " if i == self.active_page_index else ""
             url = page.url
-            try:
-                title = await page.title()
-            except Exception:
+            if isinstance(title, BaseException):
                 title = url
             lines.append(f"- {i}: {marker}[{title}]({url})")
         response = Response()
@@ -1105,7 +1353,6 @@ class BrowserSession:
         """Close the tab at *index* (default: active tab)."""
         if index is None:
             index = self.active_page_index
-        index = int(index)
         if index < 0 or index >= len(self.pages):
             return {"ok": False, "error": f"Invalid tab index: {index}"}
         page = self.pages.pop(index)
@@ -1125,7 +1372,6 @@ class BrowserSession:
 
     async def cmd_tab_select(self, index: int) -> dict[str, Any]:
         """Switch to the tab at *index*."""
-        index = int(index)
         if index < 0 or index >= len(self.pages):
             return {"ok": False, "error": f"Invalid tab index: {index}"}
         self.active_page_index = index
@@ -1158,16 +1404,9 @@ class BrowserSession:
 
         # Close current context
         old_context = self.context
-        context_opts = dict(self.config.browser.context_options)
+        context_opts = self._context_options()
         context_opts["storage_state"] = str(path)
 
-        if self.config.save_video is not None:
-            context_opts["record_video_dir"] = str(get_output_dir())
-            context_opts["record_video_size"] = {
-                "width": self.config.save_video.width,
-                "height": self.config.save_video.height,
-            }
-
         self.context = await self.browser.new_context(**context_opts)
         self.context.on("page", self._on_new_page_sync)
         self.context.set_default_timeout(self.config.timeouts.action)
@@ -1210,11 +1449,11 @@ class BrowserSession:
         if path:
             cookies = [c for c in cookies if c.get("path", "") == path]
         response = Response()
-        lines = [
+        text = "\n".join(
             f"{c['name']}={c['value']} (domain: {c.get('domain', '')}, path: {c.get('path', '')})"
             for c in cookies
-        ]
-        response.add_result("\n".join(lines) if lines else "No cookies.")
+        )
+        response.add_result(text or "No cookies.")
         response.add_code("await page.context().cookies();")
         return {"ok": True, "output": await response.serialize(self)}
 
@@ -1235,8 +1474,10 @@ class BrowserSession:
         response.add_result("\n".join(lines))
         return {"ok": True, "output": await response.serialize(self)}
 
+    @_requires_page
     async def cmd_cookie_set(
         self,
+        page: Any,
         name: str,
         value: str,
         domain: str | None = None,
@@ -1247,9 +1488,6 @@ class BrowserSession:
         sameSite: str | None = None,
     ) -> dict[str, Any]:
         """Set a cookie."""
-        page = self.active_page
-        if page is None:
-            return {"ok": False, "error": "No active page."}
         url = page.url
         cookie: dict[str, Any] = {"name": name, "value": value, "url": url}
         if domain is not None:
@@ -1288,33 +1526,29 @@ class BrowserSession:
 
     # -- Storage: localStorage -----------------------------------------------
 
-    async def cmd_localstorage_list(self) -> dict[str, Any]:
+    @_requires_page
+    async def cmd_localstorage_list(self, page: Any) -> dict[str, Any]:
         """List all localStorage entries."""
-        page = self.active_page
-        if page is None:
-            return {"ok": False, "error": "No active page."}
         result = await page.evaluate("JSON.stringify(Object.entries(localStorage))")
-        entries = json.loads(result) if isinstance(result, str) else result
-        formatted = json.dumps(entries, indent=2, default=str)
+        # The page already serialized the entries; only re-encode non-strings.
+        formatted = result if isinstance(result, str) else json.dumps(result)
         response = Response()
         response.add_result(f"### localStorage\n```json\n{formatted}\n```")
         return {"ok": True, "output": await response.serialize(self)}
 
-    async def cmd_localstorage_get(self, key: str) -> dict[str, Any]:
+    @_requires_page
+    async def cmd_localstorage_get(self, page: Any, key: str) -> dict[str, Any]:
         """Get a value from localStorage by *key*."""
-        page = self.active_page
-        if page is None:
-            return {"ok": False, "error": "No active page."}
         result = await page.evaluate(f"localStorage.getItem({json.dumps(key)})")
         response = Response()
         response.add_result(json.dumps(result, default=str))
         return {"ok": True, "output": await response.serialize(self)}
 
-    async def cmd_localstorage_set(self, key: str, value: str) -> dict[str, Any]:
+    @_requires_page
+    async def cmd_localstorage_set(
+        self, page: Any, key: str, value: str
+    ) -> dict[str, Any]:
         """Set a localStorage entry."""
-        page = self.active_page
-        if page is None:
-            return {"ok": False, "error": "No active page."}
         await page.evaluate(
             f"localStorage.setItem({json.dumps(key)}, {json.dumps(value)})"
         )
@@ -1322,21 +1556,17 @@ class BrowserSession:
         response.add_result(f"localStorage[{key!r}] set.")
         return {"ok": True, "output": await response.serialize(self)}
 
-    async def cmd_localstorage_delete(self, key: str) -> dict[str, Any]:
+    @_requires_page
+    async def cmd_localstorage_delete(self, page: Any, key: str) -> dict[str, Any]:
         """Delete a localStorage entry by *key*."""
-        page = self.active_page
-        if page is None:
-            return {"ok": False, "error": "No active page."}
         await page.evaluate(f"localStorage.removeItem({json.dumps(key)})")
         response = Response()
         response.add_result(f"localStorage[{key!r}] deleted.")
         return {"ok": True, "output": await response.serialize(self)}
 
-    async def cmd_localstorage_clear(self) -> dict[str, Any]:
+    @_requires_page
+    async def cmd_localstorage_clear(self, page: Any) -> dict[str, Any]:
         """Clear all localStorage entries."""
-        page = self.active_page
-        if page is None:
-            return {"ok": False, "error": "No active page."}
         await page.evaluate("localStorage.clear()")
         response = Response()
         response.add_result("localStorage cleared.")
@@ -1344,33 +1574,29 @@ class BrowserSession:
 
     # -- Storage: sessionStorage ---------------------------------------------
 
-    async def cmd_sessionstorage_list(self) -> dict[str, Any]:
+    @_requires_page
+    async def cmd_sessionstorage_list(self, page: Any) -> dict[str, Any]:
         """List all sessionStorage entries."""
-        page = self.active_page
-        if page is None:
-            return {"ok": False, "error": "No active page."}
         result = await page.evaluate("JSON.stringify(Object.entries(sessionStorage))")
-        entries = json.loads(result) if isinstance(result, str) else result
-        formatted = json.dumps(entries, indent=2, default=str)
+        # The page already serialized the entries; only re-encode non-strings.
+        formatted = result if isinstance(result, str) else json.dumps(result)
         response = Response()
         response.add_result(f"### sessionStorage\n```json\n{formatted}\n```")
         return {"ok": True, "output": await response.serialize(self)}
 
-    async def cmd_sessionstorage_get(self, key: str) -> dict[str, Any]:
+    @_requires_page
+    async def cmd_sessionstorage_get(self, page: Any, key: str) -> dict[str, Any]:
         """Get a value from sessionStorage by *key*."""
-        page = self.active_page
-        if page is None:
-            return {"ok": False, "error": "No active page."}
         result = await page.evaluate(f"sessionStorage.getItem({json.dumps(key)})")
         response = Response()
         response.add_result(json.dumps(result, default=str))
         return {"ok": True, "output": await response.serialize(self)}
 
-    async def cmd_sessionstorage_set(self, key: str, value: str) -> dict[str, Any]:
+    @_requires_page
+    async def cmd_sessionstorage_set(
+        self, page: Any, key: str, value: str
+    ) -> dict[str, Any]:
         """Set a sessionStorage entry."""
-        page = self.active_page
-        if page is None:
-            return {"ok": False, "error": "No active page."}
         await page.evaluate(
             f"sessionStorage.setItem({json.dumps(key)}, {json.dumps(value)})"
         )
@@ -1378,21 +1604,17 @@ class BrowserSession:
         response.add_result(f"sessionStorage[{key!r}] set.")
         return {"ok": True, "output": await response.serialize(self)}
 
-    async def cmd_sessionstorage_delete(self, key: str) -> dict[str, Any]:
+    @_requires_page
+    async def cmd_sessionstorage_delete(self, page: Any, key: str) -> dict[str, Any]:
         """Delete a sessionStorage entry by *key*."""
-        page = self.active_page
-        if page is None:
-            return {"ok": False, "error": "No active page."}
         await page.evaluate(f"sessionStorage.removeItem({json.dumps(key)})")
         response = Response()
         response.add_result(f"sessionStorage[{key!r}] deleted.")
         return {"ok": True, "output": await response.serialize(self)}
 
-    async def cmd_sessionstorage_clear(self) -> dict[str, Any]:
+    @_requires_page
+    async def cmd_sessionstorage_clear(self, page: Any) -> dict[str, Any]:
         """Clear all sessionStorage entries."""
-        page = self.active_page
-        if page is None:
-            return {"ok": False, "error": "No active page."}
         await page.evaluate("sessionStorage.clear()")
         response = Response()
         response.add_result("sessionStorage cleared.")
@@ -1435,7 +1657,7 @@ class BrowserSession:
                 if body is not None:
                     fulfill_kwargs["body"] = body
                 if status is not None:
-                    fulfill_kwargs["status"] = int(status)
+                    fulfill_kwargs["status"] = status
                 if content_type is not None:
                     fulfill_kwargs["content_type"] = content_type
                 await route.fulfill(**fulfill_kwargs)
@@ -1468,8 +1690,11 @@ class BrowserSession:
             response.add_result(f"Route removed: {pattern}")
             return {"ok": True, "output": await response.serialize(self)}
         else:
-            for p, h in self.active_routes.items():
-                await self.context.unroute(p, h)
+            # Not unroute_all(): that would also drop the internal WebGL and
+            # network-filtering routes registered at launch.
+            await asyncio.gather(
+                *(self.context.unroute(p, h) for p, h in self.active_routes.items())
+            )
             self.active_routes.clear()
             response = Response()
             response.add_result("All routes removed.")
@@ -1485,21 +1710,22 @@ class BrowserSession:
             self.console_messages.clear()
             self._last_console_index = 0
             return {"ok": True, "output": "Console cleared."}
-        LEVEL_ORDER = {"debug": 0, "log": 1, "info": 2, "warning": 3, "error": 4}
         messages = self.console_messages
-        if min_level and min_level in LEVEL_ORDER:
-            threshold = LEVEL_ORDER[min_level]
-            messages = [
-                m
+        if min_level in _LEVEL_ORDER:
+            threshold = _LEVEL_ORDER[min_level]
+            level_of = _LEVEL_ORDER.get
+            lines = (
+                _format_console_message(m, msg_type)
                 for m in messages
-                if LEVEL_ORDER.get(m.get("type", "log"), 1) >= threshold
-            ]
-        if not messages:
+                for msg_type in (m.get("type", "log"),)
+                if level_of(msg_type, 1) >= threshold
+            )
+        else:
+            # No (or an unknown) level: nothing to filter, so skip the checks.
+            lines = map(_format_console_message, messages)
+        text = _join_lines(lines, len(messages))
+        if not text:
             return {"ok": True, "output": "No console messages."}
-        text = "\n".join(
-            f"[{m.get('elapsed_ms', 0):>8}ms] [{m.get('type', 'log').upper()}] {m.get('text', '')}{m.get('loc_str', '')}"
-            for m in messages
-        )
         response = Response()
         await response.add_file_result("Console", text, "console", "log")
         return {"ok": True, "output": await response.serialize(self)}
@@ -1511,22 +1737,21 @@ class BrowserSession:
         if clear:
             self.network_log.clear()
             return {"ok": True, "output": "Network log cleared."}
-        STATIC_TYPES = {"image", "font", "stylesheet", "script", "media"}
-        entries = self.network_log
-        if not static:
-            entries = [
-                e
-                for e in entries
-                if e.get("resource_type", "") not in STATIC_TYPES
-                or e.get("status") not in range(200, 300)
-            ]
-        if not entries:
+        # Successful static resources are hidden unless --static is given.
+        text = _join_lines(
+            (
+                f"{status} {e.get('method', '?')} {e.get('url', '?')} ({resource_type})"
+                for e in self.network_log
+                for resource_type in (e.get("resource_type", ""),)
+                for status in (e.get("status", "?"),)
+                if static
+                or resource_type not in _STATIC_TYPES
+                or not (isinstance(status, int) and 200 <= status < 300)
+            ),
+            len(self.network_log),
+        )
+        if not text:
             return {"ok": True, "output": "No network requests recorded."}
-        lines = [
-            f"{e.get('status', '?')} {e.get('method', '?')} {e.get('url', '?')} ({e.get('resource_type', '')})"
-            for e in entries
-        ]
-        text = "\n".join(lines)
         response = Response()
         await response.add_file_result("Network", text, "network", "log")
         return {"ok": True, "output": await response.serialize(self)}
@@ -1546,7 +1771,7 @@ class BrowserSession:
         if not self.tracing_active:
             return {"ok": False, "error": "Tracing is not active."}
         path = generate_output_filename("trace", "zip")
-        path.parent.mkdir(parents=True, exist_ok=True)
+        await asyncio.to_thread(path.parent.mkdir, parents=True, exist_ok=True)
         await self.context.tracing.stop(path=str(path))
         self.tracing_active = False
         response = Response()
@@ -1570,11 +1795,11 @@ class BrowserSession:
         )
         return {"ok": True, "output": await response.serialize(self)}
 
-    async def cmd_video_stop(self, filename: str | None = None) -> dict[str, Any]:
+    @_requires_page
+    async def cmd_video_stop(
+        self, page: Any, filename: str | None = None
+    ) -> dict[str, Any]:
         """Save the active page's video."""
-        page = self.active_page
-        if page is None:
-            return {"ok": False, "error": "No active page."}
         video = page.video
         if video is None:
             return {
@@ -1585,7 +1810,9 @@ class BrowserSession:
             path = Path(filename)
         else:
             path = generate_output_filename("video", "webm")
-        path.parent.mkdir(parents=True, exist_ok=True)
+        # A user-supplied destination may sit on a slow or network filesystem;
+        # keep the directory creation off the event loop.
+        await asyncio.to_thread(path.parent.mkdir, parents=True, exist_ok=True)
         await video.save_as(str(path))
         response = Response()
         response.add_result(f"Video saved to {path}")
@@ -1593,42 +1820,37 @@ class BrowserSession:
 
     # -- New commands --------------------------------------------------------
 
-    async def cmd_run_code(self, code: str) -> dict[str, Any]:
+    @_requires_page
+    async def cmd_run_code(self, page: Any, code: str) -> dict[str, Any]:
         """Run arbitrary Playwright code."""
-        page = self.active_page
-        if page is None:
-            return {"ok": False, "error": "No active page."}
         result = await page.evaluate(f"async (page) => {{ {code} }}")
         response = Response()
         if result is not None:
-            response.add_result(json.dumps(result, default=str))
+            response.add_result(json.dumps(result, default=str, separators=(",", ":")))
         response.add_code(code)
         return {"ok": True, "output": await response.serialize(self)}
 
     async def cmd_show(self) -> dict[str, Any]:
         """Show DevTools."""
-        return {"ok": True, "output": "DevTools are not available in daemon mode."}
+        return _DEVTOOLS_UNAVAILABLE
 
     async def cmd_devtools_start(self) -> dict[str, Any]:
         """Start DevTools."""
-        return {"ok": True, "output": "DevTools are not available in daemon mode."}
+        return _DEVTOOLS_UNAVAILABLE
 
     async def cmd_config_print(self) -> dict[str, Any]:
         """Print the current configuration."""
         return {"ok": True, "output": self.config.model_dump_json(indent=2)}
 
+    @_requires_page
     async def cmd_transcribe_audio(
-        self, url: str | None = None, filename: str | None = None
+        self, page: Any, url: str | None = None, filename: str | None = None
     ) -> dict[str, Any]:
         """Transcribe audio from the page or a given URL using OpenAI Whisper."""
         import os
 
         from patchright_cli.captcha import find_audio_url, transcribe_audio
 
-        page = self.active_page
-        if page is None:
-            return {"ok": False, "error": "No active page."}
-
         api_key = os.environ.get("OPENAI_API_KEY")
         if not api_key:
             return {
@@ -1665,8 +1887,53 @@ class BrowserSession:
 # ---------------------------------------------------------------------------
 
 
-async def run_server(session_name: str, config_dict: dict[str, Any]) -> None:
-    """Main daemon entry point. Creates BrowserSession, starts Unix socket server."""
+async def _dispatch(
+    session: BrowserSession, request: Any
+) -> tuple[str, dict[str, Any]]:
+    """Run one request (a line, or an entry of a batch) on *session*.
+
+    Returns the command name alongside its reply, so the caller can tell
+    when a close has been answered.
+    """
+    if not isinstance(request, dict):
+        logger.warning(f"Invalid request: {request!r}")
+        return "", {"ok": False, "error": f"Invalid request: {request!r}"}
+    cmd = request.get("cmd", "")
+    args = request.get("args", {})
+    logger.debug(f"Received command: {cmd} args={args}")
+
+    try:
+        result = await session.handle_command(cmd, args)
+    except Exception as e:
+        logger.exception(f"Command {cmd!r} raised an exception")
+        result = {"ok": False, "error": str(e)}
+
+    ok = result.get("ok", False)
+    if not ok:
+        logger.warning(f"Command {cmd!r} failed: {result.get('error')}")
+    else:
+        logger.debug(f"Command {cmd!r} succeeded")
+    return cmd, result
+
+
+async def _write_reply(writer: asyncio.StreamWriter, result: dict[str, Any]) -> None:
+    """Write *result* to the client as one JSON line."""
+    # Hand the payload and its delimiter over together rather than
+    # concatenating them into a second copy of a possibly large reply.
+    writer.writelines((_encode_reply(result), b"\n"))
+    await writer.drain()
+
+
+async def run_server(
+    session_name: str,
+    config_dict: dict[str, Any],
+    ready: asyncio.Event | None = None,
+) -> None:
+    """Main daemon entry point. Creates BrowserSession, starts Unix socket server.
+
+    If *ready* is given it is set once the socket is accepting connections,
+    for in-process callers that would otherwise poll for the socket file.
+    """
     config = CLIConfig(**config_dict)
     session = BrowserSession(session_name, config)
     logger.info(f"BrowserSession created for {session_name!r}")
@@ -1687,39 +1954,39 @@ async def run_server(session_name: str, config_dict: dict[str, Any]) -> None:
     ) -> None:
         nonlocal server
         try:
-            data = await reader.readline()
-            if not data:
-                writer.close()
-                await writer.wait_closed()
-                return
-
-            request = json.loads(data.decode())
-            cmd = request.get("cmd", "")
-            args = request.get("args", {})
-            logger.debug(f"Received command: {cmd} args={args}")
-
-            try:
-                result = await session.handle_command(cmd, args)
-            except Exception as e:
-                logger.exception(f"Command {cmd!r} raised an exception")
-                result = {"ok": False, "error": str(e)}
-
-            ok = result.get("ok", False)
-            if not ok:
-                logger.warning(f"Command {cmd!r} failed: {result.get('error')}")
-            else:
-                logger.debug(f"Command {cmd!r} succeeded")
-
-            writer.write(json.dumps(result).encode() + b"\n")
-            await writer.drain()
+            closing = False
+            # A connection may carry any number of request lines; it ends
+            # when the client hangs up or a close command has been answered.
+            while not closing and (data := await reader.readline()):
+                # Parsed straight from the raw bytes, without decoding first.
+                request = _decode_request(data)
+                # A JSON array is a batch: its commands run in order, each
+                # reply written as its own line.  A close ends the batch.
+                requests = request if isinstance(request, list) else [request]
+                if not requests:
+                    await _write_reply(
+                        writer, {"ok": False, "error": "Empty command batch"}
+                    )
+                    continue
+                for entry in requests:
+                    cmd, result = await _dispatch(session, entry)
+                    await _write_reply(writer, result)
+                    if cmd == "close":
+                        closing = True
+                        break
             writer.close()
             await writer.wait_closed()
 
             # If close command, stop the server
-            if cmd == "close":
+            if closing:
                 logger.info("Close command received, shutting down server")
                 if server is not None:
                     server.close()
+                    # Hang up on any other clients too: connections now stay
+                    # open between requests, and the server's shutdown would
+                    # otherwise wait for each of them to disconnect, keeping
+                    # the daemon and its PID file alive after the socket.
+                    server.close_clients()
         except Exception:
             logger.exception("Unhandled error in handle_client")
             try:
@@ -1731,48 +1998,133 @@ async def run_server(session_name: str, config_dict: dict[str, Any]) -> None:
     server = await asyncio.start_unix_server(handle_client, path=str(socket_path))
     write_pid(session_name, os.getpid())
     logger.info(f"Server listening on {socket_path}")
+    if ready is not None:
+        ready.set()
 
-    async with server:
-        await server.serve_forever()
-
-    # Cleanup on exit
-    logger.info("Server stopped, cleaning up session")
-    cleanup_session(session_name)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        # serve_forever ends by raising CancelledError once a close has
+        # stopped the server, so clean up on the way out.
+        logger.info("Server stopped, cleaning up session")
+        cleanup_session(session_name)
 
 
-def _setup_logging(session_name: str) -> None:
+def _setup_logging(session_name: str) -> QueueListener:
     """Configure logging for the daemon process.
 
     Writes to ``~/.patchright-cli/sessions/<name>/daemon.log`` with rotation-friendly
     append mode.  Also redirects *stdout*/*stderr* so that any stray ``print()``
     calls or unhandled tracebacks land in the same file.
+
+    Records are handed to a background listener thread through a queue, so the
+    event loop never blocks on the log file write.  The listener is stopped
+    (and the queue drained) at interpreter exit; it is also returned so
+    callers can stop it earlier.
     """
+    # get_log_path only builds the path; get_session_dir creates the directory.
+    get_session_dir(session_name)
     log_path = get_log_path(session_name)
-    handler = logging.FileHandler(log_path, mode="w", encoding="utf-8")
-    handler.setFormatter(
+    file_handler = logging.FileHandler(log_path, mode="w", encoding="utf-8")
+    file_handler.setFormatter(
         logging.Formatter(
             "%(asctime)s [%(levelname)s] %(name)s: %(message)s",
             datefmt="%Y-%m-%d %H:%M:%S",
         )
     )
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
     root = logging.getLogger()
     root.setLevel(logging.DEBUG)
-    root.addHandler(handler)
+    root.addHandler(QueueHandler(log_queue))
 
     # Redirect stdout/stderr so print() and unhandled exceptions also appear
     sys.stdout = open(log_path, "a", encoding="utf-8")  # noqa: SIM115
     sys.stderr = sys.stdout
+    return listener
+
+
+def _event_loop_factory() -> Callable[[], asyncio.AbstractEventLoop] | None:
+    """Return uvloop's loop constructor when it is installed, else ``None``.
+
+    uvloop is optional; without it ``asyncio.run`` uses the default loop.
+    """
+    return uvloop.new_event_loop if uvloop is not None else None
+
+
+async def _notify_ready(ready: asyncio.Event, fd: int) -> None:
+    """Write a byte to *fd* once *ready* is set."""
+    await ready.wait()
+    try:
+        os.write(fd, b"1")
+    except BrokenPipeError:
+        logger.warning("Client stopped waiting before the server was ready")
+
 
+async def _serve(
+    session_name: str, config_dict: dict[str, Any], ready_fd: int | None
+) -> None:
+    """Run the server, writing a byte to *ready_fd* once it is listening.
 
-def start_daemon(session_name: str, config_dict: dict[str, Any] | str) -> None:
-    """Entry point for the daemon subprocess. Called by client.py."""
-    _setup_logging(session_name)
+    The descriptor is closed when the server exits, so a reader still
+    waiting on a server that never became ready sees EOF.
+
+    SIGTERM (as sent by ``kill-all``) cancels the server rather than ending
+    the process on the spot, so the session is cleaned up and the logging
+    queue is flushed on the way out.
+    """
+    ready = asyncio.Event()
+    notifier = (
+        asyncio.create_task(_notify_ready(ready, ready_fd))
+        if ready_fd is not None
+        else None
+    )
+    loop = asyncio.get_running_loop()
+    # Always a task under asyncio.run; outside one, SIGTERM keeps its
+    # default action.
+    if (task := asyncio.current_task()) is not None:
+        loop.add_signal_handler(signal.SIGTERM, task.cancel)
+    try:
+        await run_server(session_name, config_dict, ready=ready)
+    finally:
+        loop.remove_signal_handler(signal.SIGTERM)
+        # A task cancelled before it first runs never reaches its own
+        # finally, so the descriptor is closed here.
+        if notifier is not None:
+            notifier.cancel()
+        if ready_fd is not None:
+            os.close(ready_fd)
+
+
+def start_daemon(
+    session_name: str,
+    config_dict: dict[str, Any] | str,
+    ready_fd: int | None = None,
+) -> None:
+    """Entry point for the daemon subprocess. Called by client.py.
+
+    *ready_fd* is the write end of the pipe the client waits on for the
+    socket to start accepting connections.
+    """
+    listener = _setup_logging(session_name)
     logger.info(f"Daemon starting for session {session_name!r} (pid={os.getpid()})")
+    if ready_fd is not None:
+        # Keep it out of the browser processes, or they would hold it open.
+        os.set_inheritable(ready_fd, False)
     parsed: dict[str, Any] = (
         json.loads(config_dict) if isinstance(config_dict, str) else config_dict
     )
     try:
-        asyncio.run(run_server(session_name, parsed))
+        asyncio.run(
+            _serve(session_name, parsed, ready_fd), loop_factory=_event_loop_factory()
+        )
+    except asyncio.CancelledError:
+        logger.info("Daemon stopped")
     except Exception:
         logger.exception("Daemon crashed")
         raise
+    finally:
+        listener.stop()
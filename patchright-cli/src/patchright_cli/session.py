@@ -26,6 +26,7 @@ Output directory (workspace-relative, per working directory):
 
 from __future__ import annotations
 
+import json
 import os
 from datetime import datetime, timezone
 from pathlib import Path
@@ -39,6 +40,7 @@ _SESSIONS_SUBDIR = "sessions"
 _SOCKET_FILENAME = "server.sock"
 _PID_FILENAME = "pid"
 _LOG_FILENAME = "daemon.log"
+_CONFIG_FILENAME = "config.json"
 _ENV_SESSION_VAR = "PLAYWRIGHT_CLI_SESSION"
 _DEFAULT_SESSION = "default"
 
@@ -50,39 +52,51 @@ def get_sessions_dir() -> Path:
     return sessions_dir
 
 
+def _session_path(name: str) -> Path:
+    """Return the directory path for session *name* without touching disk."""
+    return Path.home() / _BASE_DIR_NAME / _SESSIONS_SUBDIR / name
+
+
 def get_session_dir(name: str) -> Path:
     """Return the directory for the given session *name*, creating it if needed."""
-    session_dir = get_sessions_dir() / name
+    # One mkdir with parents=True also covers the sessions directory itself.
+    session_dir = _session_path(name)
     session_dir.mkdir(parents=True, exist_ok=True)
     return session_dir
 
 
+# The per-file helpers below only build paths; whoever writes a file is
+# responsible for creating the session directory first (get_session_dir).
+
+
 def get_socket_path(name: str) -> Path:
     """Return the Unix domain socket path for the given session."""
-    return get_session_dir(name) / _SOCKET_FILENAME
+    return _session_path(name) / _SOCKET_FILENAME
 
 
 def get_pid_path(name: str) -> Path:
     """Return the PID file path for the given session."""
-    return get_session_dir(name) / _PID_FILENAME
+    return _session_path(name) / _PID_FILENAME
 
 
 def get_log_path(name: str) -> Path:
     """Return the log file path for the given session."""
-    return get_session_dir(name) / _LOG_FILENAME
+    return _session_path(name) / _LOG_FILENAME
 
 
 def get_config_path(name: str) -> Path:
     """Return the config.json path for the given session."""
-    return get_session_dir(name) / "config.json"
+    return _session_path(name) / _CONFIG_FILENAME
 
 
 def read_session_config(name: str) -> dict | None:
     """Read the config.json for a session, returning None if not found."""
-    config_path = get_config_path(name)
-    try:
-        import json
+    return _read_config_file(get_config_path(name))
+
 
+def _read_config_file(config_path: Path) -> dict | None:
+    """Parse *config_path* as JSON, returning None if missing or invalid."""
+    try:
         return json.loads(config_path.read_text(encoding="utf-8"))
     except FileNotFoundError, json.JSONDecodeError:
         return None
@@ -95,7 +109,7 @@ def read_session_config(name: str) -> dict | None:
 
 def write_pid(name: str, pid: int) -> None:
     """Write *pid* to the session's PID file."""
-    pid_path = get_pid_path(name)
+    pid_path = get_session_dir(name) / _PID_FILENAME
     pid_path.write_text(str(pid), encoding="utf-8")
 
 
@@ -105,7 +119,11 @@ def read_pid(name: str) -> int | None:
     Returns ``None`` if the file is missing, empty, or contains non-integer
     content.
     """
-    pid_path = get_pid_path(name)
+    return _read_pid_file(get_pid_path(name))
+
+
+def _read_pid_file(pid_path: Path) -> int | None:
+    """Read an integer PID from *pid_path*, or None if absent or malformed."""
     try:
         text = pid_path.read_text(encoding="utf-8").strip()
         if not text:
@@ -122,7 +140,11 @@ def is_session_alive(name: str) -> bool:
     sending a signal.  Returns ``False`` when the PID file is missing or the
     process no longer exists.
     """
-    pid = read_pid(name)
+    return _pid_is_running(read_pid(name))
+
+
+def _pid_is_running(pid: int | None) -> bool:
+    """Return ``True`` if a process with *pid* exists."""
     if pid is None:
         return False
     try:
@@ -151,14 +173,23 @@ def list_sessions() -> list[dict]:
     """
     sessions_dir = get_sessions_dir()
     results: list[dict] = []
-    for entry in sorted(sessions_dir.iterdir()):
-        if not entry.is_dir():
-            continue
-        name = entry.name
-        pid = read_pid(name)
-        alive = is_session_alive(name)
-        config = read_session_config(name)
-        results.append({"name": name, "alive": alive, "pid": pid, "config": config})
+    # scandir's DirEntry answers is_dir() from the directory listing itself
+    # on most filesystems, where Path.iterdir() would stat every entry.
+    with os.scandir(sessions_dir) as it:
+        names = sorted(entry.name for entry in it if entry.is_dir())
+    for name in names:
+        # Read straight from the directory: the name-based helpers would
+        # re-create it on each call, and the PID only needs reading once.
+        session_dir = sessions_dir / name
+        pid = _read_pid_file(session_dir / _PID_FILENAME)
+        results.append(
+            {
+                "name": name,
+                "alive": _pid_is_running(pid),
+                "pid": pid,
+                "config": _read_config_file(session_dir / _CONFIG_FILENAME),
+            }
+        )
     return results
 
 
@@ -228,9 +259,11 @@ def generate_output_filename(prefix: str, ext: str) -> Path:
 
     The *ext* parameter should be supplied **without** a leading dot
     (e.g. ``"png"``, not ``".png"``).
+
+    The directory is not created here; callers create ``path.parent`` right
+    before writing, so doing it twice only costs an extra syscall.
     """
-    now = datetime.now(timezone.utc)
     # Produce a compact ISO timestamp: 2026-02-14T19-22-42
-    timestamp = now.isoformat(timespec="seconds").replace(":", "-")
+    timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H-%M-%S")
     filename = f"{prefix}-{timestamp}.{ext}"
-    return get_output_dir() / filename
+    return Path.cwd() / _BASE_DIR_NAME / filename
@@ -18,13 +18,16 @@ from __future__ import annotations
 import re
 from typing import Any
 
-# Regex to extract ref ids from snapshotForAI output lines.
-# Matches [ref=e2], [ref=s10], etc.
-_REF_RE = re.compile(r"\[ref=([\w]+)\]")
-
-# Regex to extract role and optional name from the beginning of a snapshot line.
-# Groups: (role), (optional quoted name)
-_ROLE_NAME_RE = re.compile(r"^\s*- (\w+)(?:\s+\"([^\"]*)\")?\s*")
+# Regex matching a snapshotForAI line that starts with a role (and optional
+# quoted name) and carries a ref, e.g. ``  - link "About" [ref=e2]``.
+# Scanned with ``finditer`` over the whole text; never crosses a newline.
+# Groups: (role), (optional quoted name), (ref id), (numeric suffix when the
+# id is one letter + digits like ``e12``; ``None`` for ids like ``f1e2``)
+_REF_LINE_RE = re.compile(
+    r"^[^\S\n]*- (\w+)(?:[^\S\n]+\"([^\"\n]*)\")?[^\n]*?"
+    r"\[ref=([^\W\d](\d+)|\w+)\]",
+    re.MULTILINE,
+)
 
 
 async def take_snapshot(
@@ -67,34 +70,18 @@ async def take_snapshot(
     # 2. Parse refs from the snapshot text and build refs dictionary
     #    using aria-ref=eN selectors (resolved by Playwright's built-in
     #    selector engine — no DOM attribute injection needed).
-    refs: list[tuple[str, str, str | None]] = []  # (ref_id, role, name)
-    for line in snapshot_text.split("\n"):
-        ref_match = _REF_RE.search(line)
-        if not ref_match:
-            continue
-        ref_id = ref_match.group(1)
-        role_match = _ROLE_NAME_RE.match(line)
-        if not role_match:
-            continue
-        refs.append((ref_id, role_match.group(1), role_match.group(2)))
-
-    refs_dict: dict[str, dict[str, str | None]] = {
-        ref_id: {
+    #    The max ref counter is tracked in the same pass from the numeric
+    #    suffix the regex captured (frame refs like ``f1e2`` have none).
+    refs_dict: dict[str, dict[str, str | None]] = {}
+    max_ref_num = -1
+    for m in _REF_LINE_RE.finditer(snapshot_text):
+        role, name, ref_id, num = m.groups()
+        refs_dict[ref_id] = {
             "selector": f"aria-ref={ref_id}",
             "role": role,
             "name": name,
         }
-        for ref_id, role, name in refs
-    }
-
-    # 3. Compute max ref counter from parsed refs
-    max_ref_num = -1
-    for ref_id, _, _ in refs:
-        try:
-            num = int(ref_id[1:])  # strip prefix letter (e.g. 'e')
-            if num > max_ref_num:
-                max_ref_num = num
-        except (ValueError, IndexError):
-            pass
+        if num is not None:
+            max_ref_num = max(max_ref_num, int(num))
 
     return snapshot_text, refs_dict, max_ref_num + 1
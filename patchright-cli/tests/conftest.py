@@ -2,15 +2,61 @@
 
 from __future__ import annotations
 
+import argparse
 import json
+import os
+import shutil
+import sys
 from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from patchright_cli.cli import _register_subcommands
 from patchright_cli.config import CLIConfig
 from patchright_cli.server import BrowserSession
 
+# Set to 1 to opt in to keeping pytest's temp root on tmpfs.
+_TMPFS_OPT_IN_VAR = "PATCHRIGHT_CLI_TEST_TMPFS"
+# The variable pytest reads its temp root from, in place of the system default.
+_TEMPROOT_VAR = "PYTEST_DEBUG_TEMPROOT"
+# Minimum free space before tmp_path is moved to /dev/shm.  Docker gives
+# containers a 64MB /dev/shm by default, too small for the integration
+# tests' browser profiles.
+_SHM_MIN_FREE = 1 << 30
+# Set on the config when pytest_configure moved the temp root.
+_moved_temproot = pytest.StashKey[bool]()
+
+
+def pytest_configure(config):
+    """Put pytest's temp root on tmpfs (``/dev/shm``) when opted in.
+
+    With ``PATCHRIGHT_CLI_TEST_TMPFS=1`` on Linux, and /dev/shm roomy
+    enough, the tests create and read back their files under ``tmp_path``
+    from memory.  An explicit ``--basetemp`` or ``PYTEST_DEBUG_TEMPROOT``
+    wins.  The variable is removed again in ``pytest_unconfigure``.
+    """
+    if (
+        os.environ.get(_TMPFS_OPT_IN_VAR) != "1"
+        or sys.platform != "linux"
+        or config.option.basetemp
+        or _TEMPROOT_VAR in os.environ
+    ):
+        return
+    try:
+        roomy = shutil.disk_usage("/dev/shm").free >= _SHM_MIN_FREE
+    except OSError:
+        return
+    if roomy and os.access("/dev/shm", os.W_OK):
+        os.environ[_TEMPROOT_VAR] = "/dev/shm"
+        config.stash[_moved_temproot] = True
+
+
+def pytest_unconfigure(config):
+    """Undo the temp root ``pytest_configure`` set, if it set one."""
+    if config.stash.get(_moved_temproot, False):
+        os.environ.pop(_TEMPROOT_VAR, None)
+
 
 @pytest.fixture
 def sessions_dir(tmp_path, monkeypatch):
@@ -26,12 +72,38 @@ def output_dir(tmp_path, monkeypatch):
     return tmp_path / ".patchright-cli"
 
 
+@pytest.fixture(scope="session")
+def registered_commands():
+    """Names of the subcommands ``_register_subcommands`` adds, built once."""
+    parser = argparse.ArgumentParser()
+    subparsers = parser.add_subparsers(dest="command")
+    _register_subcommands(subparsers)
+    return frozenset(subparsers.choices)
+
+
 @pytest.fixture
 def default_config():
     """Return a default CLIConfig instance."""
     return CLIConfig()
 
 
+# Built once: CLIConfig() goes through pydantic-settings' env lookups.
+_DEFAULT_CLI_CONFIG = CLIConfig()
+
+
+@pytest.fixture
+def default_cli_config(monkeypatch):
+    """Make ``load_config`` return a default CLIConfig, ignoring any path.
+
+    Each call gets its own deep copy, since ``main()`` applies ``open`` flags
+    to the loaded config in place.
+    """
+    monkeypatch.setattr(
+        "patchright_cli.config.load_config",
+        lambda config_path=None: _DEFAULT_CLI_CONFIG.model_copy(deep=True),
+    )
+
+
 @pytest.fixture
 def config_dict(default_config):
     """Return a default config as a dict (for passing to daemons)."""
@@ -61,6 +133,7 @@ def mock_page():
     page.title = AsyncMock(return_value="Example")
     page.goto = AsyncMock()
     page.evaluate = AsyncMock(return_value="[]")
+    page.evaluate_handle = AsyncMock(return_value=AsyncMock())
     page.screenshot = AsyncMock()
     page.pdf = AsyncMock()
     page.reload = AsyncMock()
@@ -169,3 +242,16 @@ def browser_session(
     session.pages = [mock_page]
     session.active_page_index = 0
     return session
+
+
+@pytest.fixture
+def mock_openai():
+    """Patch ``AsyncOpenAI`` in the captcha module; yield the class mock.
+
+    The client it returns has ``audio.transcriptions.create`` wired to an
+    AsyncMock returning a transcript with empty ``text``.
+    """
+    create = AsyncMock(return_value=MagicMock(text=""))
+    with patch("patchright_cli.captcha.AsyncOpenAI") as openai_cls:
+        openai_cls.return_value.audio.transcriptions.create = create
+        yield openai_cls
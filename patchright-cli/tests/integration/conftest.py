@@ -1,15 +1,29 @@
 """Shared fixtures for patchright-cli integration tests.
 
 These fixtures launch a real headless Chromium browser via Patchright.
-Every test gets a fresh browser instance (function-scoped) for isolation.
+Launching dominates runtime, so ``browser_session_real`` shares one isolated
+browser across the test session and isolates tests at the context level:
+each test gets a fresh browser context, active page and empty event buffers.
+Tests that tear the browser down, or check launch-time state, use
+``browser_session_fresh``.
 """
 
 from __future__ import annotations
 
+import asyncio
+import os
+import re
+import shutil
+import tempfile
 import urllib.parse
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
 from pathlib import Path
+from typing import Any
 
 import pytest
+import pytest_asyncio
+from patchright.async_api import async_playwright
 
 from patchright_cli.config import BrowserConfig, CLIConfig
 from patchright_cli.server import BrowserSession
@@ -38,87 +52,341 @@ TEST_HTML = "data:text/html," + urllib.parse.quote(
 # ---------------------------------------------------------------------------
 
 
-@pytest.fixture
-def integration_config() -> CLIConfig:
-    """CLIConfig for isolated headless Chromium (no sandbox)."""
+# Chromium flags that trim cold-start work in containers.  Zygote and
+# multi-process mode stay on: popups need a renderer per page.
+_FAST_LAUNCH_ARGS = (
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--disable-background-networking",
+    "--disable-features=TranslateUI,BackForwardCache",
+)
+
+
+def _launch_options() -> dict[str, Any]:
+    return {
+        "headless": True,
+        "chromium_sandbox": False,
+        "args": list(_FAST_LAUNCH_ARGS),
+    }
+
+
+def _isolated_config() -> CLIConfig:
     return CLIConfig(
         browser=BrowserConfig(
             isolated=True,
-            launch_options={"headless": True, "chromium_sandbox": False},
+            launch_options=_launch_options(),
             context_options={},
         ),
     )
 
 
 @pytest.fixture
-def integration_config_persistent(tmp_path: Path) -> CLIConfig:
-    """CLIConfig for persistent (non-isolated) headless Chromium."""
+def integration_config() -> CLIConfig:
+    """CLIConfig for isolated headless Chromium (no sandbox)."""
+    return _isolated_config()
+
+
+def _persistent_config(user_data_dir: Path) -> CLIConfig:
     return CLIConfig(
         browser=BrowserConfig(
             isolated=False,
-            user_data_dir=str(tmp_path / "user-data"),
-            launch_options={"headless": True, "chromium_sandbox": False},
+            user_data_dir=str(user_data_dir),
+            launch_options=_launch_options(),
             context_options={},
         ),
     )
 
 
+@pytest.fixture
+def integration_config_persistent(
+    tmp_path: Path, _warm_user_data_dir: Path
+) -> CLIConfig:
+    """CLIConfig for persistent (non-isolated) headless Chromium.
+
+    The profile is a copy of ``_warm_user_data_dir``, so each launch skips
+    Chromium's first-run profile initialisation.
+    """
+    user_data_dir = tmp_path / "user-data"
+    shutil.copytree(
+        _warm_user_data_dir,
+        user_data_dir,
+        symlinks=True,
+        # Lock files of the warm-up browser; stale copies block the launch.
+        ignore=shutil.ignore_patterns("Singleton*"),
+    )
+    return _persistent_config(user_data_dir)
+
+
 # ---------------------------------------------------------------------------
-# Browser session fixtures
+# Home directory fixtures
 # ---------------------------------------------------------------------------
 
 
+def _sandbox_home(mp: pytest.MonkeyPatch, home: Path) -> None:
+    """Point ``$HOME`` and the working directory at *home*.
+
+    ``Path.home()`` reads ``$HOME``, so nothing is patched on ``Path`` itself.
+    The browser cache is pinned first so drivers started afterwards still
+    find Chromium under the real home.
+    """
+    mp.setenv(
+        "PLAYWRIGHT_BROWSERS_PATH",
+        os.environ.get(
+            "PLAYWRIGHT_BROWSERS_PATH", str(Path.home() / ".cache" / "ms-playwright")
+        ),
+    )
+    mp.setenv("HOME", str(home))
+    mp.chdir(home)
+
+
 @pytest.fixture
-async def browser_session_real(
-    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, integration_config: CLIConfig
-) -> BrowserSession:
-    """Launch a real isolated headless browser, yield BrowserSession, cleanup."""
-    monkeypatch.setattr(Path, "home", lambda: tmp_path)
-    monkeypatch.setattr(Path, "cwd", lambda: tmp_path)
+def sandbox_home(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Run the test with ``tmp_path`` as both ``$HOME`` and cwd; return it."""
+    _sandbox_home(monkeypatch, tmp_path)
+    return tmp_path
+
+
+# Tag temp homes with the xdist worker (when run under ``-n``) so a leftover
+# directory can be traced back to the worker that created it.
+_TMP_PREFIX = f"prt-{os.environ.get('PYTEST_XDIST_WORKER', 'main')}-"
+
+
+@contextmanager
+def _short_home(mp: pytest.MonkeyPatch) -> Iterator[Path]:
+    """Sandbox the home in a fresh short temp dir, removed on exit.
 
-    session = BrowserSession("integration-test", integration_config)
-    await session.launch_browser()
+    pytest's tmp_path is too long (e.g. /tmp/pytest-of-vscode/pytest-N/test_name0/)
+    and the socket path would exceed the 108-char Unix limit.
+    """
+    home = Path(tempfile.mkdtemp(prefix=_TMP_PREFIX))
     try:
-        yield session  # type: ignore[misc]
+        _sandbox_home(mp, home)
+        yield home
     finally:
-        try:
-            if session.context and session.context != session.browser:
-                await session.context.close()
-            if session.browser:
-                await session.browser.close()
-            if session.playwright:
-                await session.playwright.stop()
-        except Exception:
-            pass
+        shutil.rmtree(home, ignore_errors=True)
 
 
 @pytest.fixture
+def short_home(monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    """Provide a short temp dir as HOME so Unix socket paths stay under 108 chars."""
+    with _short_home(monkeypatch) as home:
+        yield home
+
+
+@pytest.fixture(scope="session")
+def short_home_factory():
+    """Return ``_short_home`` for fixtures wider than function scope.
+
+    Usage: ``with short_home_factory(mp) as home: ...`` with a
+    ``pytest.MonkeyPatch.context()``.
+    """
+    return _short_home
+
+
+# ---------------------------------------------------------------------------
+# Browser session fixtures
+# ---------------------------------------------------------------------------
+
+
+async def _close_session(session: BrowserSession, *, stop_driver: bool = True) -> None:
+    """Best-effort shutdown of everything *session* launched."""
+    try:
+        if session.context and session.context != session.browser:
+            await session.context.close()
+        if session.browser:
+            await session.browser.close()
+        if stop_driver and session.playwright:
+            await session.playwright.stop()
+    except Exception:
+        pass
+
+
+@asynccontextmanager
+async def _managed_session(
+    name: str, config: CLIConfig, *, launch: bool = True, playwright: Any = None
+) -> AsyncIterator[BrowserSession]:
+    """Create a BrowserSession (launched unless *launch* is false), close on exit.
+
+    When *playwright* is given the session launches on that driver and leaves
+    it running on exit.
+    """
+    session = BrowserSession(name, config)
+    session.playwright = playwright
+    try:
+        if launch:
+            await session.launch_browser()
+        yield session
+    finally:
+        await _close_session(session, stop_driver=playwright is None)
+
+
+# Endpoints the page event tests fetch, fulfilled at the context level.
+_CANNED_ROUTES = ("**/test-endpoint", "**/test-status")
+# Static assets no test asserts on; aborted so stray loads never hold up a
+# navigation.
+_STATIC_ASSET_RE = re.compile(r".*\.(png|jpe?g|gif|svg|woff2?|css|ico)$")
+
+
+async def _fulfill_ok(route: Any) -> None:
+    await route.fulfill(status=200, body="ok")
+
+
+async def _abort(route: Any) -> None:
+    await route.abort()
+
+
+async def _reset_session(session: BrowserSession) -> None:
+    """Give *session* a fresh context and page, and empty per-test state.
+
+    The new context gets the same setup ``launch_browser`` gives the first
+    one, so only the Chromium process itself outlives a test.
+    """
+    old_context = session.context
+    session.pages = []
+    session.context = await session.browser.new_context(**session._context_options())
+    await session._setup_context()
+    for pattern in _CANNED_ROUTES:
+        await session.context.route(pattern, _fulfill_ok)
+    await session.context.route(_STATIC_ASSET_RE, _abort)
+    try:
+        await old_context.close()
+    except Exception:
+        pass
+
+    page = await session.context.new_page()
+    # The context "page" event schedules listener setup; let it run.
+    await asyncio.sleep(0)
+    session.pages = [page]
+    session.active_page_index = 0
+    session.console_messages.clear()
+    session.network_log.clear()
+    session.dialog_queue.clear()
+    session._last_console_index = 0
+    session.element_refs.clear()
+    session.ref_counter = 0
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def _shared_playwright() -> AsyncIterator[Any]:
+    """Start the one Playwright driver the session-loop fixtures launch on."""
+    playwright = await async_playwright().start()
+    yield playwright
+    await playwright.stop()
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def _shared_browser_session(
+    tmp_path_factory: pytest.TempPathFactory, _shared_playwright: Any
+) -> BrowserSession:
+    """Launch the isolated headless browser shared by the whole test session."""
+    home = tmp_path_factory.mktemp("shared-home")
+    async with _managed_session(
+        "integration-test",
+        _isolated_config(),
+        launch=False,
+        playwright=_shared_playwright,
+    ) as session:
+        with pytest.MonkeyPatch.context() as mp:
+            _sandbox_home(mp, home)
+            await session.launch_browser()
+        yield session  # type: ignore[misc]
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def _warm_user_data_dir(
+    tmp_path_factory: pytest.TempPathFactory, _shared_playwright: Any
+) -> Path:
+    """Launch and close a persistent browser once; return its populated profile."""
+    home = tmp_path_factory.mktemp("warm-home")
+    user_data_dir = tmp_path_factory.mktemp("warm-profile")
+    with pytest.MonkeyPatch.context() as mp:
+        _sandbox_home(mp, home)
+        async with _managed_session(
+            "integration-warm-profile",
+            _persistent_config(user_data_dir),
+            playwright=_shared_playwright,
+        ):
+            pass
+    return user_data_dir
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def browser_session_real(
+    _shared_browser_session: BrowserSession,
+    sandbox_home: Path,
+) -> BrowserSession:
+    """Yield the shared browser with a fresh context and cleared event buffers."""
+    await _reset_session(_shared_browser_session)
+    return _shared_browser_session
+
+
+@pytest_asyncio.fixture(scope="class", loop_scope="session")
+async def _class_browser_session(
+    _shared_browser_session: BrowserSession,
+) -> BrowserSession:
+    """Give the shared browser one fresh context for a whole test class."""
+    await _reset_session(_shared_browser_session)
+    return _shared_browser_session
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def browser_session_class(
+    _class_browser_session: BrowserSession,
+    sandbox_home: Path,
+) -> BrowserSession:
+    """Yield the shared browser, keeping its context across a test class.
+
+    Between tests the active page is blanked and cookies and event buffers
+    are cleared, which is much cheaper than ``browser_session_real``'s new
+    context.  Only for tests that leave no other state behind.
+    """
+    session = _class_browser_session
+    await session.active_page.goto("about:blank")
+    await session.context.clear_cookies()
+    session.console_messages.clear()
+    session.network_log.clear()
+    session.dialog_queue.clear()
+    session._last_console_index = 0
+    return session
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def browser_session_fresh(
+    sandbox_home: Path, integration_config: CLIConfig
+) -> BrowserSession:
+    """Launch a dedicated isolated headless browser, yield it, cleanup."""
+    async with _managed_session("integration-fresh", integration_config) as session:
+        yield session  # type: ignore[misc]
+
+
+@pytest_asyncio.fixture(loop_scope="session")
 async def browser_session_persistent(
-    tmp_path: Path,
-    monkeypatch: pytest.MonkeyPatch,
+    sandbox_home: Path,
     integration_config_persistent: CLIConfig,
+    _shared_playwright: Any,
 ) -> BrowserSession:
     """Launch a real persistent headless browser, yield BrowserSession, cleanup."""
-    monkeypatch.setattr(Path, "home", lambda: tmp_path)
-    monkeypatch.setattr(Path, "cwd", lambda: tmp_path)
-
-    session = BrowserSession("integration-persistent", integration_config_persistent)
-    await session.launch_browser()
-    try:
+    async with _managed_session(
+        "integration-persistent",
+        integration_config_persistent,
+        playwright=_shared_playwright,
+    ) as session:
         yield session  # type: ignore[misc]
-    finally:
-        try:
-            if session.context and session.context != session.browser:
-                await session.context.close()
-            if session.browser:
-                await session.browser.close()
-            if session.playwright:
-                await session.playwright.stop()
-        except Exception:
-            pass
 
 
 @pytest.fixture
+def managed_session():
+    """Return ``_managed_session`` for tests that need a custom-config browser.
+
+    Usage: ``async with managed_session(name, config) as session: ...``; pass
+    ``launch=False`` when the test launches the browser itself (``cmd_open``).
+    """
+    return _managed_session
+
+
+@pytest_asyncio.fixture(loop_scope="session")
 async def html_page(
     browser_session_real: BrowserSession,
 ) -> tuple[BrowserSession, object]:
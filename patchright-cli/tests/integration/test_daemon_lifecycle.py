@@ -7,13 +7,16 @@ with an actual background server process.
 All tests are synchronous because the client functions are synchronous.
 Each test uses a short temp directory under /tmp to keep the Unix socket
 path within the 108-character limit.
+
+Tests that only talk to a running daemon share one (``shared_daemon``), so
+the module pays for a single subprocess and Chromium launch; tests of the
+spawn and shutdown paths themselves still get their own daemon.
 """
 
 from __future__ import annotations
 
 import os
 import signal
-import tempfile
 import time
 from pathlib import Path
 
@@ -27,6 +30,36 @@ from patchright_cli.session import (
     read_pid,
 )
 
+# Serialised CLIConfig for headless container use.  start_daemon() only
+# json-dumps it, so every test can pass the same dict.
+_CONFIG_DICT = CLIConfig(
+    browser=BrowserConfig(
+        isolated=True,
+        launch_options={"headless": True, "chromium_sandbox": False},
+        context_options={},
+    ),
+).model_dump()
+
+
+def _wait_for_daemon_exit(session_name: str, timeout: float = 1.0) -> int | None:
+    """Poll until the daemon is gone; return its PID if it is still running.
+
+    A clean shutdown removes the PID file, so this normally returns ``None``
+    as soon as that happens rather than after a fixed delay.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        pid = read_pid(session_name)
+        if pid is None:
+            return None
+        try:
+            os.kill(pid, 0)
+        except OSError:
+            return None
+        if time.monotonic() >= deadline:
+            return pid
+        time.sleep(0.02)
+
 
 def _cleanup_daemon(session_name: str) -> None:
     """Best-effort cleanup: close gracefully, then SIGTERM, then remove files."""
@@ -34,46 +67,40 @@ def _cleanup_daemon(session_name: str) -> None:
         send_command(session_name, "close", timeout=10)
     except Exception:
         pass
-    time.sleep(0.5)
-    pid = read_pid(session_name)
+    pid = _wait_for_daemon_exit(session_name)
     if pid:
         try:
             os.kill(pid, signal.SIGTERM)
-        except ProcessLookupError, PermissionError:
+        except OSError:
+            # Already gone, not ours, or any other platform-specific refusal.
             pass
     cleanup_session(session_name)
 
 
-def _make_config_dict() -> dict:
-    """Return a serialised CLIConfig suitable for headless container use."""
-    return CLIConfig(
-        browser=BrowserConfig(
-            isolated=True,
-            launch_options={"headless": True, "chromium_sandbox": False},
-            context_options={},
-        ),
-    ).model_dump()
+def _wait_for_socket_removal(session_name: str, timeout: float = 5) -> None:
+    """Poll until the daemon has removed its socket on shutdown."""
+    socket_path = get_socket_path(session_name)
+    for _ in range(int(timeout * 10)):
+        if not socket_path.exists():
+            return
+        time.sleep(0.1)
 
 
-@pytest.fixture
-def short_home(monkeypatch: pytest.MonkeyPatch):
-    """Provide a short temp dir as HOME so Unix socket paths stay under 108 chars.
+@pytest.fixture(scope="module")
+def shared_daemon(short_home_factory):
+    """Start one daemon with an open browser for the module; yield its name.
 
-    pytest's tmp_path is too long (e.g. /tmp/pytest-of-vscode/pytest-N/test_name0/)
-    and the socket path exceeds the 108-char Unix limit.
+    Tests using it must not also request ``short_home``: the daemon lives
+    under this fixture's HOME.
     """
-    # Preserve the real browser cache path before changing HOME
-    real_home = Path.home()
-    browsers_path = str(real_home / ".cache" / "ms-playwright")
-
-    tmpdir = tempfile.mkdtemp(prefix="prt-")
-    home = Path(tmpdir)
-    monkeypatch.setenv("HOME", tmpdir)
-    monkeypatch.setenv("PLAYWRIGHT_BROWSERS_PATH", browsers_path)
-    monkeypatch.setattr(Path, "home", lambda: home)
-    monkeypatch.setattr(Path, "cwd", lambda: home)
-    yield home
-    # Cleanup is best-effort; daemon cleanup in tests handles the important parts
+    name = "dt-shared"
+    with pytest.MonkeyPatch.context() as mp, short_home_factory(mp):
+        try:
+            assert start_daemon(name, _CONFIG_DICT) is True
+            assert send_command(name, "open", {"headless": True})["ok"] is True
+            yield name
+        finally:
+            _cleanup_daemon(name)
 
 
 # ---------------------------------------------------------------------------
@@ -85,9 +112,8 @@ def short_home(monkeypatch: pytest.MonkeyPatch):
 def test_start_daemon_creates_socket(short_home: Path) -> None:
     """start_daemon should spawn a background process and create the Unix socket."""
     name = "dt"
-    config_dict = _make_config_dict()
     try:
-        result = start_daemon(name, config_dict)
+        result = start_daemon(name, _CONFIG_DICT)
         assert result is True
         assert get_socket_path(name).exists()
     finally:
@@ -95,50 +121,29 @@ def test_start_daemon_creates_socket(short_home: Path) -> None:
 
 
 @pytest.mark.integration
-def test_send_command_open_and_snapshot(short_home: Path) -> None:
+def test_send_command_open_and_snapshot(shared_daemon: str) -> None:
     """After opening the browser, a snapshot command should return non-empty output."""
-    name = "dt"
-    config_dict = _make_config_dict()
-    try:
-        assert start_daemon(name, config_dict) is True
-
-        open_result = send_command(name, "open", {"headless": True})
-        assert open_result["ok"] is True
-
-        snap_result = send_command(name, "snapshot")
-        assert snap_result["ok"] is True
-        assert snap_result.get("output", "") != ""
-    finally:
-        _cleanup_daemon(name)
+    snap_result = send_command(shared_daemon, "snapshot")
+    assert snap_result["ok"] is True
+    assert snap_result.get("output", "") != ""
 
 
 @pytest.mark.integration
-def test_send_command_goto_data_url(short_home: Path) -> None:
+def test_send_command_goto_data_url(shared_daemon: str) -> None:
     """Navigating to a data: URL should succeed and reflect the page content."""
-    name = "dt"
-    config_dict = _make_config_dict()
-    try:
-        assert start_daemon(name, config_dict) is True
-
-        open_result = send_command(name, "open", {"headless": True})
-        assert open_result["ok"] is True
-
-        goto_result = send_command(
-            name, "goto", {"url": "data:text/html,<h1>DataTest</h1>"}
-        )
-        assert goto_result["ok"] is True
-        assert "DataTest" in goto_result.get("output", "")
-    finally:
-        _cleanup_daemon(name)
+    goto_result = send_command(
+        shared_daemon, "goto", {"url": "data:text/html,<h1>DataTest</h1>"}
+    )
+    assert goto_result["ok"] is True
+    assert "DataTest" in goto_result.get("output", "")
 
 
 @pytest.mark.integration
 def test_close_terminates_daemon(short_home: Path) -> None:
     """Sending 'close' should succeed and the socket should no longer accept connections."""
     name = "dt"
-    config_dict = _make_config_dict()
     try:
-        assert start_daemon(name, config_dict) is True
+        assert start_daemon(name, _CONFIG_DICT) is True
 
         open_result = send_command(name, "open", {"headless": True})
         assert open_result["ok"] is True
@@ -148,7 +153,7 @@ def test_close_terminates_daemon(short_home: Path) -> None:
 
         # After close, the socket should stop accepting new connections.
         # Wait for server shutdown then verify.
-        time.sleep(2)
+        _wait_for_socket_removal(name)
         retry_result = send_command(name, "snapshot", timeout=3)
         assert retry_result["ok"] is False
     finally:
@@ -159,9 +164,8 @@ def test_close_terminates_daemon(short_home: Path) -> None:
 def test_open_session_helper(short_home: Path) -> None:
     """open_session() should start the daemon and navigate to the given URL."""
     name = "dt"
-    config_dict = _make_config_dict()
     try:
-        result = open_session(name, config_dict, url="data:text/html,<h1>Helper</h1>")
+        result = open_session(name, _CONFIG_DICT, url="data:text/html,<h1>Helper</h1>")
         assert result["ok"] is True
         assert "Helper" in result.get("output", "")
     finally:
@@ -169,12 +173,8 @@ def test_open_session_helper(short_home: Path) -> None:
 
 
 @pytest.mark.integration
-def test_start_daemon_already_running(short_home: Path) -> None:
-    """Calling start_daemon twice for the same session should be idempotent."""
-    name = "dt"
-    config_dict = _make_config_dict()
-    try:
-        assert start_daemon(name, config_dict) is True
-        assert start_daemon(name, config_dict) is True
-    finally:
-        _cleanup_daemon(name)
+def test_start_daemon_already_running(shared_daemon: str) -> None:
+    """Calling start_daemon again for a running session should be idempotent."""
+    pid = read_pid(shared_daemon)
+    assert start_daemon(shared_daemon, _CONFIG_DICT) is True
+    assert read_pid(shared_daemon) == pid
@@ -3,6 +3,10 @@
 Verifies that console messages, network requests/responses, dialogs, and popup
 pages are properly captured by BrowserSession's listeners when running against
 a real headless Chromium instance.
+
+Tests wait on the Playwright event itself rather than sleeping.  The session's
+listeners were attached when the page opened, so they have already recorded
+the event by the time a later ``expect_*`` waiter resolves.
 """
 
 from __future__ import annotations
@@ -14,68 +18,57 @@ import pytest
 from patchright_cli.server import BrowserSession
 
 
-@pytest.mark.integration
-@pytest.mark.asyncio
-async def test_console_log_captured(browser_session_real: BrowserSession) -> None:
-    """Console.log messages are captured with type='log'."""
-    page = browser_session_real.active_page
-    html = "data:text/html," + urllib.parse.quote(
-        '<html><body><script>console.log("hello integration")</script></body></html>'
+def _console_html(method: str, text: str) -> str:
+    return "data:text/html," + urllib.parse.quote(
+        f'<html><body><script>console.{method}("{text}")</script></body></html>'
     )
-    await page.goto(html)
-    await page.wait_for_timeout(200)
 
-    matches = [
-        m
-        for m in browser_session_real.console_messages
-        if m["type"] == "log" and "hello integration" in m["text"]
-    ]
-    assert len(matches) >= 1, (
-        f"Expected a console.log entry with 'hello integration', "
-        f"got: {browser_session_real.console_messages}"
-    )
 
-
-@pytest.mark.integration
-@pytest.mark.asyncio
-async def test_console_error_captured(browser_session_real: BrowserSession) -> None:
-    """Console.error messages are captured with type='error'."""
-    page = browser_session_real.active_page
-    html = "data:text/html," + urllib.parse.quote(
-        '<html><body><script>console.error("oops integration")</script></body></html>'
-    )
-    await page.goto(html)
-    await page.wait_for_timeout(200)
-
-    matches = [
-        m
-        for m in browser_session_real.console_messages
-        if m["type"] == "error" and "oops integration" in m["text"]
-    ]
-    assert len(matches) >= 1, (
-        f"Expected a console.error entry with 'oops integration', "
-        f"got: {browser_session_real.console_messages}"
-    )
+# Pages, including the console parametrisations below, are quoted once at
+# import rather than inside every test.
+_ALERT_HTML = "data:text/html," + urllib.parse.quote(
+    '<html><body><script>setTimeout(() => alert("hi"), 50)</script></body></html>'
+)
 
 
 @pytest.mark.integration
 @pytest.mark.asyncio
-async def test_console_warning_captured(browser_session_real: BrowserSession) -> None:
-    """Console.warn messages are captured with type='warning'."""
+@pytest.mark.parametrize(
+    ("url", "text", "expected_type"),
+    [
+        pytest.param(
+            _console_html("log", "hello integration"),
+            "hello integration",
+            "log",
+            id="log",
+        ),
+        pytest.param(
+            _console_html("error", "oops integration"),
+            "oops integration",
+            "error",
+            id="error",
+        ),
+        pytest.param(
+            _console_html("warn", "warn integration"),
+            "warn integration",
+            "warning",
+            id="warning",
+        ),
+    ],
+)
+async def test_console_captured(
+    browser_session_real: BrowserSession, url: str, text: str, expected_type: str
+) -> None:
+    """Console messages are captured with the matching type."""
     page = browser_session_real.active_page
-    html = "data:text/html," + urllib.parse.quote(
-        '<html><body><script>console.warn("warn integration")</script></body></html>'
-    )
-    await page.goto(html)
-    await page.wait_for_timeout(200)
+    async with page.expect_console_message(predicate=lambda m: text in m.text):
+        await page.goto(url)
 
-    matches = [
-        m
+    assert any(
+        m["type"] == expected_type and text in m["text"]
         for m in browser_session_real.console_messages
-        if m["type"] == "warning" and "warn integration" in m["text"]
-    ]
-    assert len(matches) >= 1, (
-        f"Expected a console.warn entry with 'warn integration', "
+    ), (
+        f"Expected a {expected_type} console entry with {text!r}, "
         f"got: {browser_session_real.console_messages}"
     )
 
@@ -85,12 +78,10 @@ async def test_console_warning_captured(browser_session_real: BrowserSession) ->
 async def test_network_request_logged(browser_session_real: BrowserSession) -> None:
     """A fetch request produces at least one network log entry."""
     page = browser_session_real.active_page
-    # data: URLs don't go through the network stack, so use a routed request
-    await page.route(
-        "**/test-endpoint", lambda route: route.fulfill(status=200, body="ok")
-    )
-    await page.evaluate("fetch('http://localhost/test-endpoint')")
-    await page.wait_for_timeout(200)
+    # data: URLs don't go through the network stack, so fetch an endpoint the
+    # fixture fulfils with a context-level route.
+    async with page.expect_response("**/test-endpoint"):
+        await page.evaluate("fetch('http://localhost/test-endpoint')")
 
     assert len(browser_session_real.network_log) >= 1, (
         "Expected at least one network log entry"
@@ -107,17 +98,10 @@ async def test_network_response_status_backfilled(
 ) -> None:
     """Network log entries have their status backfilled once the response arrives."""
     page = browser_session_real.active_page
-    await page.route(
-        "**/test-status",
-        lambda route: route.fulfill(status=200, body="ok"),
-    )
-    await page.evaluate("fetch('http://localhost/test-status')")
-    await page.wait_for_timeout(200)
+    async with page.expect_response("**/test-status"):
+        await page.evaluate("fetch('http://localhost/test-status')")
 
-    entries_with_status = [
-        e for e in browser_session_real.network_log if e.get("status") is not None
-    ]
-    assert len(entries_with_status) >= 1, (
+    assert any(e.get("status") is not None for e in browser_session_real.network_log), (
         f"Expected at least one network log entry with a non-None status, "
         f"got: {browser_session_real.network_log}"
     )
@@ -128,11 +112,8 @@ async def test_network_response_status_backfilled(
 async def test_dialog_captured_and_queued(browser_session_real: BrowserSession) -> None:
     """An alert() dialog is captured in the dialog_queue with correct metadata."""
     page = browser_session_real.active_page
-    html = "data:text/html," + urllib.parse.quote(
-        '<html><body><script>setTimeout(() => alert("hi"), 50)</script></body></html>'
-    )
-    await page.goto(html)
-    await page.wait_for_timeout(500)
+    async with page.expect_event("dialog"):
+        await page.goto(_ALERT_HTML)
 
     assert len(browser_session_real.dialog_queue) >= 1, (
         "Expected at least one dialog in the queue"
@@ -157,8 +138,8 @@ async def test_popup_page_added(browser_session_real: BrowserSession) -> None:
     await page.goto("data:text/html,<h1>Popup</h1>")
 
     initial_count = len(browser_session_real.pages)
-    await page.evaluate("window.open('about:blank')")
-    await page.wait_for_timeout(300)
+    async with browser_session_real.context.expect_page():
+        await page.evaluate("window.open('about:blank')")
 
     assert len(browser_session_real.pages) > initial_count, (
         f"Expected pages count to increase from {initial_count}, "
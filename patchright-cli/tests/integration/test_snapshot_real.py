@@ -8,12 +8,31 @@ work correctly against actual DOM content.
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Any
 
 import pytest
 
 from patchright_cli.server import BrowserSession
 from patchright_cli.snapshot import take_snapshot
 
+# Roles get_by_role can reliably locate, unlike e.g. "generic" or "paragraph".
+_INJECTABLE_ROLES = frozenset({"link", "heading", "button", "textbox", "combobox"})
+# Roles the click test can target.
+_CLICKABLE_ROLES = frozenset({"link", "button", "heading", "textbox", "checkbox"})
+
+# Counts every injected ref and checks the given ones, in one round-trip.
+_DOM_REF_STATE_JS = """(refs) => ({
+    count: document.querySelectorAll('[data-patchright-ref]').length,
+    present: refs.map(
+        (r) => document.querySelector(`[data-patchright-ref="${r}"]`) !== null
+    ),
+})"""
+
+
+async def _dom_ref_state(page: Any, ref_ids: list[str]) -> dict[str, Any]:
+    """Return ``{"count": int, "present": [bool, ...]}`` for *ref_ids*."""
+    return await page.evaluate(_DOM_REF_STATE_JS, ref_ids)
+
 
 @pytest.mark.integration
 async def test_snapshot_returns_formatted_tree(
@@ -59,18 +78,19 @@ async def test_refs_injected_into_live_dom(
     _snapshot_text, refs_dict, _counter = await take_snapshot(page)
 
     # Verify that at least one ref was injected into the live page DOM.
-    # Use a ref for a well-known role (e.g. link, heading) that get_by_role
-    # can reliably locate, rather than "generic" which may not inject.
-    injectable_ref = None
-    for ref_id, info in refs_dict.items():
-        if info["role"] in ("link", "heading", "button", "textbox", "combobox"):
-            injectable_ref = ref_id
-            break
-    assert injectable_ref is not None, "No injectable ref found"
-    found = await page.evaluate(
-        f"document.querySelector('[data-patchright-ref=\"{injectable_ref}\"]') !== null"
+    # Use a ref for a well-known role (e.g. link, heading) rather than
+    # "generic" which may not inject.
+    injectable_ref = next(
+        (
+            ref_id
+            for ref_id, info in refs_dict.items()
+            if info["role"] in _INJECTABLE_ROLES
+        ),
+        None,
     )
-    assert found is True
+    assert injectable_ref is not None, "No injectable ref found"
+    state = await _dom_ref_state(page, [injectable_ref])
+    assert state["present"] == [True]
 
 
 @pytest.mark.integration
@@ -96,9 +116,7 @@ async def test_refs_cleared_on_new_snapshot(
     # or stale refs from the first pass).  Not all refs can be injected (e.g.
     # "generic" or "paragraph" roles aren't reliably locatable via get_by_role),
     # so check DOM count <= refs_dict length and is consistent across snapshots.
-    ref_count_in_dom = await page.evaluate(
-        "document.querySelectorAll('[data-patchright-ref]').length"
-    )
+    ref_count_in_dom = (await _dom_ref_state(page, []))["count"]
     assert ref_count_in_dom <= len(refs2)
     assert ref_count_in_dom > 0
 
@@ -117,12 +135,11 @@ async def test_cmd_snapshot_via_handle_command(
     assert "Snapshot" in result["output"]
     assert ".yml" in result["output"]
 
-    # The snapshot file should contain ref annotations and roles.
-    import re
-
-    match = re.search(r"\((.+?\.yml)\)", result["output"])
-    assert match is not None
-    snapshot_path = Path.cwd() / match.group(1)
+    # The snapshot file should contain ref annotations and roles.  Its path
+    # is the target of the "[Snapshot](...)" link.
+    link = result["output"].partition("[Snapshot](")[2].partition(")")[0]
+    assert link.endswith(".yml")
+    snapshot_path = Path.cwd() / link
     snapshot_content = snapshot_path.read_text(encoding="utf-8")
     assert "ref=" in snapshot_content
     assert "heading" in snapshot_content
@@ -143,11 +160,14 @@ async def test_click_via_ref_on_real_page(
     # Pick the first available ref and click it.
     assert len(session.element_refs) > 0
     # Pick a clickable ref (skip generic/paragraph which may not be in DOM).
-    ref_id = None
-    for rid, info in session.element_refs.items():
-        if info.get("role") in ("link", "button", "heading", "textbox", "checkbox"):
-            ref_id = rid
-            break
+    ref_id = next(
+        (
+            rid
+            for rid, info in session.element_refs.items()
+            if info.get("role") in _CLICKABLE_ROLES
+        ),
+        None,
+    )
     assert ref_id is not None, f"No clickable ref found in {session.element_refs}"
     click_result = await session.handle_command("click", {"ref": ref_id})
     assert click_result["ok"] is True, click_result.get("error", "")
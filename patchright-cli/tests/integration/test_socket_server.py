@@ -1,16 +1,18 @@
 """Integration tests for the Unix socket server.
 
 These tests run ``run_server()`` as an ``asyncio.create_task`` in-process and
-communicate with it over ``asyncio.open_unix_connection``.  Each test gets a
-short temporary home directory so the Unix socket path stays under 108 chars.
+communicate with it over ``asyncio.open_unix_connection``, waiting on the
+``ready`` event ``run_server()`` sets rather than polling for the socket
+file.  Each test gets a short temporary home directory so the Unix socket
+path stays under 108 chars.
 """
 
 from __future__ import annotations
 
 import asyncio
 import json
-import tempfile
 from pathlib import Path
+from typing import Self
 
 import pytest
 
@@ -18,19 +20,30 @@ from patchright_cli.config import BrowserConfig, CLIConfig
 from patchright_cli.server import run_server
 from patchright_cli.session import get_pid_path, get_socket_path
 
-
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
 
-async def wait_for_socket(socket_path: Path, timeout: float = 15) -> bool:
-    """Poll until the Unix socket file appears on disk."""
-    for _ in range(int(timeout * 10)):
-        if socket_path.exists():
-            return True
-        await asyncio.sleep(0.1)
-    return False
+def start_server(session_name: str) -> tuple[asyncio.Task, asyncio.Event]:
+    """Run ``run_server()`` as a task; return it with its readiness event."""
+    ready = asyncio.Event()
+    task = asyncio.create_task(run_server(session_name, _CONFIG_DICT, ready=ready))
+    return task, ready
+
+
+async def wait_for_server(
+    task: asyncio.Task, ready: asyncio.Event, timeout: float = 15
+) -> bool:
+    """Wait until the server is listening; False if it exited or timed out."""
+    ready_wait = asyncio.ensure_future(ready.wait())
+    try:
+        await asyncio.wait(
+            {ready_wait, task}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+        )
+    finally:
+        ready_wait.cancel()
+    return ready.is_set()
 
 
 async def send_json(socket_path: Path, cmd: str, args: dict | None = None) -> dict:
@@ -45,45 +58,105 @@ async def send_json(socket_path: Path, cmd: str, args: dict | None = None) -> di
     return json.loads(data)
 
 
-def make_config_dict() -> dict:
-    """Return a serialised CLIConfig suitable for headless isolated tests."""
-    return CLIConfig(
-        browser=BrowserConfig(
-            isolated=True,
-            launch_options={"headless": True, "chromium_sandbox": False},
-            context_options={},
-        ),
-    ).model_dump()
+async def send_json_batch(
+    socket_path: Path, commands: list[tuple[str, dict | None]]
+) -> list[dict]:
+    """Send *commands* as one batch over a single connection; return the replies."""
+    reader, writer = await asyncio.open_unix_connection(str(socket_path))
+    batch = [{"cmd": cmd, "args": args or {}} for cmd, args in commands]
+    writer.write(json.dumps(batch).encode() + b"\n")
+    await writer.drain()
+    replies = []
+    for _ in batch:
+        line = await reader.readline()
+        if not line:
+            break  # A close ended the batch early
+        replies.append(json.loads(line))
+    writer.close()
+    await writer.wait_closed()
+    return replies
+
+
+async def send_json_pipelined(
+    socket_path: Path, commands: list[tuple[str, dict | None]]
+) -> list[dict]:
+    """Write every command on one connection up front, then read the replies.
+
+    Unlike a batch, each command is its own request line; the server simply
+    finds the next one already buffered when it finishes the previous one.
+    """
+    reader, writer = await asyncio.open_unix_connection(str(socket_path))
+    writer.writelines(
+        json.dumps({"cmd": cmd, "args": args or {}}).encode() + b"\n"
+        for cmd, args in commands
+    )
+    await writer.drain()
+    replies = [json.loads(await reader.readline()) for _ in commands]
+    writer.close()
+    await writer.wait_closed()
+    return replies
+
+
+class SocketClient:
+    """One connection to the server, reused for every ``call``.
+
+    Usage: ``async with SocketClient(socket_path) as client: await client.call(...)``.
+    """
+
+    def __init__(self, socket_path: Path) -> None:
+        self.socket_path = socket_path
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+
+    async def __aenter__(self) -> Self:
+        return self
 
+    async def __aexit__(self, *exc_info: object) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            await self._writer.wait_closed()
 
-@pytest.fixture
-def short_home(monkeypatch: pytest.MonkeyPatch):
-    """Provide a short temp dir as HOME so Unix socket paths stay under 108 chars."""
-    tmpdir = tempfile.mkdtemp(prefix="prt-")
-    home = Path(tmpdir)
-    monkeypatch.setattr(Path, "home", lambda: home)
-    monkeypatch.setattr(Path, "cwd", lambda: home)
-    yield home
+    async def call(self, cmd: str, args: dict | None = None) -> dict:
+        """Send one command over the shared connection and return its reply."""
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_unix_connection(
+                str(self.socket_path)
+            )
+        assert self._reader is not None
+        payload = json.dumps({"cmd": cmd, "args": args or {}}).encode() + b"\n"
+        self._writer.write(payload)
+        await self._writer.drain()
+        return json.loads(await self._reader.readline())
+
+
+# Serialised CLIConfig for headless isolated tests.  run_server() validates
+# it into a fresh CLIConfig, so every test can pass the same dict.
+_CONFIG_DICT = CLIConfig(
+    browser=BrowserConfig(
+        isolated=True,
+        launch_options={"headless": True, "chromium_sandbox": False},
+        context_options={},
+    ),
+).model_dump()
 
 
 async def _cleanup_task(task: asyncio.Task, socket_path: Path) -> None:
-    """Best-effort cleanup of a server task."""
+    """Shut a server task down, surfacing anything but a normal shutdown.
+
+    A server that crashed, or that does not stop within the timeout after a
+    close, raises here rather than being swallowed.
+    """
     if not task.done():
         try:
             await send_json(socket_path, "close")
-        except Exception:
-            pass
+        except OSError, ValueError:
+            pass  # Not listening (any more), or hung up without a reply
         try:
             await asyncio.wait_for(task, timeout=10)
-        except asyncio.CancelledError, Exception:
-            # CancelledError is expected — serve_forever raises it on server.close()
-            pass
-    else:
-        # If already done, retrieve exception to avoid "exception never retrieved"
-        try:
-            task.result()
-        except asyncio.CancelledError, Exception:
-            pass
+        except asyncio.CancelledError:
+            pass  # serve_forever raises CancelledError on normal shutdown
+    elif not task.cancelled():
+        task.result()
 
 
 # ---------------------------------------------------------------------------
@@ -95,13 +168,12 @@ async def _cleanup_task(task: asyncio.Task, socket_path: Path) -> None:
 async def test_server_creates_socket_and_pid_file(short_home: Path) -> None:
     """Starting the server should create the socket and PID files."""
     session_name = "st"
-    config_dict = make_config_dict()
     socket_path = get_socket_path(session_name)
     pid_path = get_pid_path(session_name)
 
-    task = asyncio.create_task(run_server(session_name, config_dict))
+    task, ready = start_server(session_name)
     try:
-        assert await wait_for_socket(socket_path), "Socket file never appeared"
+        assert await wait_for_server(task, ready), "Server never started listening"
         assert socket_path.exists()
         assert pid_path.exists()
     finally:
@@ -112,12 +184,11 @@ async def test_server_creates_socket_and_pid_file(short_home: Path) -> None:
 async def test_server_accepts_and_responds(short_home: Path) -> None:
     """Sending an 'open' command should succeed and return ok=True."""
     session_name = "st"
-    config_dict = make_config_dict()
     socket_path = get_socket_path(session_name)
 
-    task = asyncio.create_task(run_server(session_name, config_dict))
+    task, ready = start_server(session_name)
     try:
-        assert await wait_for_socket(socket_path)
+        assert await wait_for_server(task, ready)
         resp = await send_json(socket_path, "open", {"headless": True})
         assert resp["ok"] is True
     finally:
@@ -128,14 +199,14 @@ async def test_server_accepts_and_responds(short_home: Path) -> None:
 async def test_server_unknown_command(short_home: Path) -> None:
     """An unknown command should return ok=False with 'Unknown command' in the error."""
     session_name = "st"
-    config_dict = make_config_dict()
     socket_path = get_socket_path(session_name)
 
-    task = asyncio.create_task(run_server(session_name, config_dict))
+    task, ready = start_server(session_name)
     try:
-        assert await wait_for_socket(socket_path)
-        await send_json(socket_path, "open", {"headless": True})
-        resp = await send_json(socket_path, "nonexistent", {})
+        assert await wait_for_server(task, ready)
+        async with SocketClient(socket_path) as client:
+            await client.call("open", {"headless": True})
+            resp = await client.call("nonexistent", {})
         assert resp["ok"] is False
         assert "Unknown command" in resp["error"]
     finally:
@@ -146,12 +217,11 @@ async def test_server_unknown_command(short_home: Path) -> None:
 async def test_server_command_error_handled(short_home: Path) -> None:
     """A command that fails (goto without browser) should return ok=False, not crash."""
     session_name = "st"
-    config_dict = make_config_dict()
     socket_path = get_socket_path(session_name)
 
-    task = asyncio.create_task(run_server(session_name, config_dict))
+    task, ready = start_server(session_name)
     try:
-        assert await wait_for_socket(socket_path)
+        assert await wait_for_server(task, ready)
         resp = await send_json(socket_path, "goto", {"url": "http://example.com"})
         assert resp["ok"] is False
     finally:
@@ -162,14 +232,14 @@ async def test_server_command_error_handled(short_home: Path) -> None:
 async def test_server_close_stops_server(short_home: Path) -> None:
     """Sending 'close' should stop the server task."""
     session_name = "st"
-    config_dict = make_config_dict()
     socket_path = get_socket_path(session_name)
 
-    task = asyncio.create_task(run_server(session_name, config_dict))
+    task, ready = start_server(session_name)
     try:
-        assert await wait_for_socket(socket_path)
-        await send_json(socket_path, "open", {"headless": True})
-        await send_json(socket_path, "close")
+        assert await wait_for_server(task, ready)
+        async with SocketClient(socket_path) as client:
+            await client.call("open", {"headless": True})
+            await client.call("close")
         try:
             await asyncio.wait_for(task, timeout=10)
         except asyncio.CancelledError:
@@ -185,18 +255,46 @@ async def test_server_close_stops_server(short_home: Path) -> None:
         raise
 
 
+@pytest.mark.integration
+async def test_server_close_drops_idle_connections(short_home: Path) -> None:
+    """A close stops the server even while another client stays connected."""
+    session_name = "st"
+    socket_path = get_socket_path(session_name)
+
+    task, ready = start_server(session_name)
+    try:
+        assert await wait_for_server(task, ready)
+        async with (
+            SocketClient(socket_path) as idle,
+            SocketClient(socket_path) as client,
+        ):
+            await idle.call("open", {"headless": True})
+            await client.call("close")
+            try:
+                await asyncio.wait_for(task, timeout=10)
+            except asyncio.CancelledError:
+                pass  # serve_forever raises CancelledError on normal shutdown
+            assert task.done()
+            # The idle connection was hung up on rather than waited for.
+            assert idle._reader is not None
+            assert await idle._reader.read() == b""
+        assert not get_pid_path(session_name).exists()
+    finally:
+        await _cleanup_task(task, socket_path)
+
+
 @pytest.mark.integration
 async def test_server_cleanup_on_exit(short_home: Path) -> None:
     """After a clean shutdown the socket and PID files should be removed."""
     session_name = "st"
-    config_dict = make_config_dict()
     socket_path = get_socket_path(session_name)
 
-    task = asyncio.create_task(run_server(session_name, config_dict))
+    task, ready = start_server(session_name)
     try:
-        assert await wait_for_socket(socket_path)
-        await send_json(socket_path, "open", {"headless": True})
-        await send_json(socket_path, "close")
+        assert await wait_for_server(task, ready)
+        async with SocketClient(socket_path) as client:
+            await client.call("open", {"headless": True})
+            await client.call("close")
         try:
             await asyncio.wait_for(task, timeout=10)
         except asyncio.CancelledError:
@@ -217,20 +315,20 @@ async def test_server_cleanup_on_exit(short_home: Path) -> None:
 async def test_server_multiple_sequential_connections(short_home: Path) -> None:
     """Multiple sequential connections should each get a valid response."""
     session_name = "st"
-    config_dict = make_config_dict()
     socket_path = get_socket_path(session_name)
 
-    task = asyncio.create_task(run_server(session_name, config_dict))
+    task, ready = start_server(session_name)
     try:
-        assert await wait_for_socket(socket_path)
+        assert await wait_for_server(task, ready)
 
         resp_open = await send_json(socket_path, "open", {"headless": True})
         assert resp_open["ok"] is True
 
-        resp_snapshot = await send_json(socket_path, "snapshot")
+        # The second connection pipelines its requests; replies stay in order.
+        resp_snapshot, resp_close = await send_json_pipelined(
+            socket_path, [("snapshot", None), ("close", None)]
+        )
         assert resp_snapshot["ok"] is True
-
-        resp_close = await send_json(socket_path, "close")
         assert resp_close["ok"] is True
 
         try:
@@ -245,3 +343,28 @@ async def test_server_multiple_sequential_connections(short_home: Path) -> None:
             except asyncio.CancelledError, Exception:
                 pass
         raise
+
+
+@pytest.mark.integration
+async def test_server_batch_request(short_home: Path) -> None:
+    """A JSON array runs each command in order and replies one line per command."""
+    session_name = "st"
+    socket_path = get_socket_path(session_name)
+
+    task, ready = start_server(session_name)
+    try:
+        assert await wait_for_server(task, ready)
+
+        replies = await send_json_batch(
+            socket_path,
+            [("open", {"headless": True}), ("snapshot", None), ("close", None)],
+        )
+        assert [r["ok"] for r in replies] == [True, True, True]
+
+        # The close inside the batch shuts the server down.
+        try:
+            await asyncio.wait_for(task, timeout=10)
+        except asyncio.CancelledError:
+            pass
+    finally:
+        await _cleanup_task(task, socket_path)
@@ -2,7 +2,8 @@
 
 Requires:
 - Real headless Chromium browser (via patchright)
-- OPENAI_API_KEY environment variable (from .env or exported)
+- OPENAI_API_KEY environment variable (from .env or exported) for the tests
+  marked ``live``, which call the real Whisper API
 
 These tests verify the full pipeline: browser audio detection → download → Whisper transcription.
 A local HTTP server serves audio files since Playwright's request API only supports http(s).
@@ -10,18 +11,20 @@ A local HTTP server serves audio files since Playwright's request API only suppo
 
 from __future__ import annotations
 
+import asyncio
 import base64
+import html
 import io
 import math
 import os
-import struct
-import urllib.parse
+import sys
 import wave
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+from array import array
+from collections.abc import AsyncIterator
 from pathlib import Path
-from threading import Thread
 
 import pytest
+import pytest_asyncio
 
 from patchright_cli.captcha import find_audio_url, transcribe_audio
 from patchright_cli.server import BrowserSession
@@ -31,61 +34,85 @@ def _generate_wav(duration: float = 1.0, frequency: float = 440.0) -> bytes:
     """Generate a short WAV file with a sine wave tone."""
     sample_rate = 16000
     n_samples = int(sample_rate * duration)
-    samples = [
-        int(32767 * math.sin(2 * math.pi * frequency * i / sample_rate))
-        for i in range(n_samples)
-    ]
+    step = 2 * math.pi * frequency / sample_rate
+    # Fill a 16-bit array directly rather than packing a list of boxed ints
+    # through a one-code-per-sample struct format.
+    samples = array("h", [int(32767 * math.sin(step * i)) for i in range(n_samples)])
+    if sys.byteorder == "big":
+        samples.byteswap()  # WAV frames are little-endian
     buf = io.BytesIO()
     with wave.open(buf, "w") as f:
         f.setnchannels(1)
         f.setsampwidth(2)
         f.setframerate(sample_rate)
-        f.writeframes(struct.pack("<" + "h" * n_samples, *samples))
+        f.writeframes(samples.tobytes())
     return buf.getvalue()
 
 
 WAV_BYTES = _generate_wav()
 
 
-def _audio_data_url() -> str:
-    """Return a data: URL containing a short WAV audio file."""
-    b64 = base64.b64encode(WAV_BYTES).decode()
-    return f"data:audio/wav;base64,{b64}"
+# The WAV as a data: URL, and pages embedding it directly and inside an
+# iframe.  Encoded once at import rather than in every test.  Tests that don't
+# need a real URL load these with ``page.set_content`` instead of navigating;
+# the iframe takes its document from ``srcdoc``, so nothing else is fetched.
+_AUDIO_DATA_URL = "data:audio/wav;base64," + base64.b64encode(WAV_BYTES).decode()
+_AUDIO_ELEMENT_HTML = (
+    f'<html><body><audio src="{_AUDIO_DATA_URL}"></audio></body></html>'
+)
+_AUDIO_IFRAME_HTML = (
+    f'<html><body><iframe srcdoc="{html.escape(_AUDIO_ELEMENT_HTML)}"></iframe>'
+    "</body></html>"
+)
+
+
+_AUDIO_PAGE_HTML = b'<html><body><audio src="/audio.wav"></audio></body></html>'
 
 
-class _AudioHandler(SimpleHTTPRequestHandler):
-    """Serves WAV_BYTES at /audio.wav and an HTML page at /page.html."""
+def _http_response(status: str, content_type: str, body: bytes) -> bytes:
+    """Assemble a complete ``Connection: close`` HTTP/1.1 response."""
+    head = (
+        f"HTTP/1.1 {status}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "Connection: close\r\n\r\n"
+    )
+    return head.encode() + body
 
-    def do_GET(self):
-        if self.path == "/audio.wav":
-            self.send_response(200)
-            self.send_header("Content-Type", "audio/wav")
-            self.send_header("Content-Length", str(len(WAV_BYTES)))
-            self.end_headers()
-            self.wfile.write(WAV_BYTES)
-        elif self.path == "/page.html":
-            html = b'<html><body><audio src="/audio.wav"></audio></body></html>'
-            self.send_response(200)
-            self.send_header("Content-Type", "text/html")
-            self.send_header("Content-Length", str(len(html)))
-            self.end_headers()
-            self.wfile.write(html)
-        else:
-            self.send_error(404)
 
-    def log_message(self, format, *args):  # noqa: A002
-        pass  # Silence request logging during tests
+# Responses are assembled once, so each request is a single buffer write.
+_AUDIO_RESPONSES = {
+    "/audio.wav": _http_response("200 OK", "audio/wav", WAV_BYTES),
+    "/page.html": _http_response("200 OK", "text/html", _AUDIO_PAGE_HTML),
+}
+_NOT_FOUND_RESPONSE = _http_response("404 Not Found", "text/plain", b"Not Found")
 
 
-@pytest.fixture(scope="module")
-def audio_server():
-    """Start a local HTTP server that serves test audio files."""
-    server = HTTPServer(("127.0.0.1", 0), _AudioHandler)
-    port = server.server_address[1]
-    thread = Thread(target=server.serve_forever, daemon=True)
-    thread.start()
-    yield f"http://127.0.0.1:{port}"
-    server.shutdown()
+async def _handle_audio_request(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> None:
+    """Serve one GET from ``_AUDIO_RESPONSES`` (404 otherwise), then close."""
+    try:
+        request_line = await reader.readline()
+        # Drain the headers; nothing in them matters here.
+        while (await reader.readline()).strip():
+            pass
+        parts = request_line.split()
+        path = parts[1].decode() if len(parts) > 1 else ""
+        writer.write(_AUDIO_RESPONSES.get(path, _NOT_FOUND_RESPONSE))
+        await writer.drain()
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="session")
+async def audio_server() -> AsyncIterator[str]:
+    """Serve test audio files over HTTP from the test event loop itself."""
+    server = await asyncio.start_server(_handle_audio_request, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        yield f"http://127.0.0.1:{port}"
 
 
 # ---------------------------------------------------------------------------
@@ -104,9 +131,7 @@ class TestFindAudioUrlReal:
 
     async def test_finds_audio_element(self, browser_session_real: BrowserSession):
         page = browser_session_real.active_page
-        audio_url = _audio_data_url()
-        html = f'<html><body><audio src="{audio_url}"></audio></body></html>'
-        await page.goto("data:text/html," + urllib.parse.quote(html))
+        await page.set_content(_AUDIO_ELEMENT_HTML, wait_until="domcontentloaded")
 
         result = await find_audio_url(page)
         assert result is not None
@@ -114,20 +139,18 @@ class TestFindAudioUrlReal:
 
     async def test_no_audio_returns_none(self, browser_session_real: BrowserSession):
         page = browser_session_real.active_page
-        await page.goto("data:text/html,<html><body><p>No audio here</p></body></html>")
+        await page.set_content(
+            "<html><body><p>No audio here</p></body></html>",
+            wait_until="domcontentloaded",
+        )
 
         result = await find_audio_url(page)
         assert result is None
 
     async def test_finds_audio_in_iframe(self, browser_session_real: BrowserSession):
         page = browser_session_real.active_page
-        audio_url = _audio_data_url()
-        iframe_src = "data:text/html," + urllib.parse.quote(
-            f'<html><body><audio src="{audio_url}"></audio></body></html>'
-        )
-        outer_html = f'<html><body><iframe src="{iframe_src}"></iframe></body></html>'
-        await page.goto("data:text/html," + urllib.parse.quote(outer_html))
-        await page.wait_for_timeout(1000)
+        # "load" on the parent waits for the iframe's document too.
+        await page.set_content(_AUDIO_IFRAME_HTML, wait_until="load")
 
         result = await find_audio_url(page)
         assert result is not None
@@ -145,6 +168,7 @@ class TestFindAudioUrlReal:
 
 
 @pytest.mark.integration
+@pytest.mark.live
 @requires_openai_key
 class TestTranscribeAudioReal:
     """Test Whisper transcription with real OpenAI API calls."""
@@ -160,7 +184,9 @@ class TestTranscribeAudioReal:
     ):
         """Full cmd_transcribe_audio pipeline with an explicit --url."""
         page = browser_session_real.active_page
-        await page.goto("data:text/html,<html><body>empty</body></html>")
+        await page.set_content(
+            "<html><body>empty</body></html>", wait_until="domcontentloaded"
+        )
 
         result = await browser_session_real.cmd_transcribe_audio(
             url=f"{audio_server}/audio.wav"
@@ -198,23 +224,27 @@ class TestTranscribeAudioErrors:
     """Test error handling in real browser context."""
 
     async def test_no_api_key(
-        self, browser_session_real: BrowserSession, monkeypatch: pytest.MonkeyPatch
+        self, browser_session_class: BrowserSession, monkeypatch: pytest.MonkeyPatch
     ):
         monkeypatch.delenv("OPENAI_API_KEY", raising=False)
-        page = browser_session_real.active_page
-        await page.goto("data:text/html,<html><body>test</body></html>")
+        page = browser_session_class.active_page
+        await page.set_content(
+            "<html><body>test</body></html>", wait_until="domcontentloaded"
+        )
 
-        result = await browser_session_real.cmd_transcribe_audio()
+        result = await browser_session_class.cmd_transcribe_audio()
         assert result["ok"] is False
         assert "OPENAI_API_KEY" in result["error"]
 
     async def test_no_audio_element(
-        self, browser_session_real: BrowserSession, monkeypatch: pytest.MonkeyPatch
+        self, browser_session_class: BrowserSession, monkeypatch: pytest.MonkeyPatch
     ):
         monkeypatch.setenv("OPENAI_API_KEY", "sk-fake")
-        page = browser_session_real.active_page
-        await page.goto("data:text/html,<html><body>no audio</body></html>")
+        page = browser_session_class.active_page
+        await page.set_content(
+            "<html><body>no audio</body></html>", wait_until="domcontentloaded"
+        )
 
-        result = await browser_session_real.cmd_transcribe_audio()
+        result = await browser_session_class.cmd_transcribe_audio()
         assert result["ok"] is False
         assert "No audio element" in result["error"]
@@ -2,9 +2,20 @@
 
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, MagicMock, patch
+import asyncio
+from functools import partial
+from types import SimpleNamespace
+from unittest.mock import MagicMock
 
-from patchright_cli.captcha import find_audio_url, transcribe_audio
+import httpx
+import pytest
+from openai import AsyncOpenAI
+
+from patchright_cli.captcha import (
+    find_audio_url,
+    transcribe_audio,
+    transcribe_audio_stream,
+)
 
 
 # ---------------------------------------------------------------------------
@@ -12,82 +23,104 @@ from patchright_cli.captcha import find_audio_url, transcribe_audio
 # ---------------------------------------------------------------------------
 
 
+_AUDIO_SRC_JS = "document.querySelector('audio')?.src || ''"
+
+
+def _frame(result="", error=None):
+    """A frame stub whose ``evaluate`` returns *result* (or raises *error*).
+
+    Expressions it was evaluated with are recorded in ``calls``.
+    """
+    calls = []
+
+    async def evaluate(js):
+        calls.append(js)
+        if error is not None:
+            raise error
+        return result
+
+    return SimpleNamespace(evaluate=evaluate, calls=calls)
+
+
+def _page(*frames):
+    return SimpleNamespace(frames=list(frames))
+
+
 class TestFindAudioUrl:
     async def test_finds_audio_in_main_frame(self):
-        frame = MagicMock()
-        frame.evaluate = AsyncMock(return_value="https://example.com/audio.mp3")
-        page = MagicMock()
-        page.frames = [frame]
+        frame = _frame("https://example.com/audio.mp3")
 
-        result = await find_audio_url(page)
+        result = await find_audio_url(_page(frame))
         assert result == "https://example.com/audio.mp3"
-        frame.evaluate.assert_awaited_once_with(
-            "document.querySelector('audio')?.src || ''"
-        )
+        assert frame.calls == [_AUDIO_SRC_JS]
 
     async def test_finds_audio_in_second_frame(self):
-        frame1 = MagicMock()
-        frame1.evaluate = AsyncMock(return_value="")
-        frame2 = MagicMock()
-        frame2.evaluate = AsyncMock(return_value="https://example.com/captcha.wav")
-        page = MagicMock()
-        page.frames = [frame1, frame2]
+        page = _page(_frame(""), _frame("https://example.com/captcha.wav"))
 
         result = await find_audio_url(page)
         assert result == "https://example.com/captcha.wav"
 
     async def test_returns_none_when_no_audio(self):
-        frame = MagicMock()
-        frame.evaluate = AsyncMock(return_value="")
-        page = MagicMock()
-        page.frames = [frame]
-
-        result = await find_audio_url(page)
+        result = await find_audio_url(_page(_frame("")))
         assert result is None
 
     async def test_returns_none_with_no_frames(self):
-        page = MagicMock()
-        page.frames = []
+        result = await find_audio_url(_page())
+        assert result is None
+
+    async def test_first_frame_with_audio_wins(self):
+        frame2 = _frame("https://second.com/audio.mp3")
+        page = _page(_frame("https://first.com/audio.mp3"), frame2)
 
         result = await find_audio_url(page)
-        assert result is None
+        assert result == "https://first.com/audio.mp3"
+        # Frames are queried concurrently, not one after another.
+        assert frame2.calls == [_AUDIO_SRC_JS]
+
+    async def test_queries_frames_concurrently(self):
+        both_started = asyncio.Barrier(2)
+
+        async def evaluate(_js):
+            await asyncio.wait_for(both_started.wait(), timeout=1)
+            return ""
+
+        page = _page(
+            SimpleNamespace(evaluate=evaluate), SimpleNamespace(evaluate=evaluate)
+        )
+
+        assert await find_audio_url(page) is None
+
+    async def test_error_in_earlier_frame_propagates(self):
+        page = _page(
+            _frame(error=RuntimeError("frame detached")),
+            _frame("https://second.com/audio.mp3"),
+        )
 
-    async def test_stops_at_first_audio_found(self):
-        frame1 = MagicMock()
-        frame1.evaluate = AsyncMock(return_value="https://first.com/audio.mp3")
-        frame2 = MagicMock()
-        frame2.evaluate = AsyncMock(return_value="https://second.com/audio.mp3")
-        page = MagicMock()
-        page.frames = [frame1, frame2]
+        with pytest.raises(RuntimeError, match="frame detached"):
+            await find_audio_url(page)
+
+    async def test_error_in_later_frame_ignored_once_audio_found(self):
+        page = _page(
+            _frame("https://first.com/audio.mp3"),
+            _frame(error=RuntimeError("frame detached")),
+        )
 
         result = await find_audio_url(page)
         assert result == "https://first.com/audio.mp3"
-        frame2.evaluate.assert_not_awaited()
 
     async def test_skips_empty_string_src(self):
-        frame1 = MagicMock()
-        frame1.evaluate = AsyncMock(return_value="")
-        frame2 = MagicMock()
-        frame2.evaluate = AsyncMock(return_value="")
-        frame3 = MagicMock()
-        frame3.evaluate = AsyncMock(return_value="https://audio.test/file.ogg")
-        page = MagicMock()
-        page.frames = [frame1, frame2, frame3]
+        page = _page(_frame(""), _frame(""), _frame("https://audio.test/file.ogg"))
 
         result = await find_audio_url(page)
         assert result == "https://audio.test/file.ogg"
 
     async def test_multiple_frames_all_empty(self):
-        frames = [MagicMock() for _ in range(5)]
-        for f in frames:
-            f.evaluate = AsyncMock(return_value="")
-        page = MagicMock()
-        page.frames = frames
+        frames = [_frame("") for _ in range(5)]
 
-        result = await find_audio_url(page)
+        result = await find_audio_url(_page(*frames))
         assert result is None
         for f in frames:
-            f.evaluate.assert_awaited_once()
+            assert f.calls == [_AUDIO_SRC_JS]
 
 
 # ---------------------------------------------------------------------------
@@ -96,81 +129,122 @@ class TestFindAudioUrl:
 
 
 class TestTranscribeAudio:
-    @patch("patchright_cli.captcha.AsyncOpenAI")
-    async def test_returns_transcription_text(self, mock_openai_cls):
-        mock_transcript = MagicMock()
-        mock_transcript.text = "hello world"
-        mock_client = MagicMock()
-        mock_client.audio = MagicMock()
-        mock_client.audio.transcriptions = MagicMock()
-        mock_client.audio.transcriptions.create = AsyncMock(
-            return_value=mock_transcript
-        )
-        mock_openai_cls.return_value = mock_client
+    async def test_returns_transcription_text(self, mock_openai):
+        create = mock_openai.return_value.audio.transcriptions.create
+        create.return_value.text = "hello world"
 
         result = await transcribe_audio(b"fake-audio-data", "sk-test-key")
         assert result == "hello world"
 
-    @patch("patchright_cli.captcha.AsyncOpenAI")
-    async def test_passes_correct_model(self, mock_openai_cls):
-        mock_transcript = MagicMock()
-        mock_transcript.text = "test"
-        mock_client = MagicMock()
-        mock_client.audio = MagicMock()
-        mock_client.audio.transcriptions = MagicMock()
-        mock_client.audio.transcriptions.create = AsyncMock(
-            return_value=mock_transcript
-        )
-        mock_openai_cls.return_value = mock_client
-
+    async def test_passes_correct_model(self, mock_openai):
         await transcribe_audio(b"data", "sk-key")
-        call_kwargs = mock_client.audio.transcriptions.create.call_args
-        assert call_kwargs.kwargs["model"] == "whisper-1"
-
-    @patch("patchright_cli.captcha.AsyncOpenAI")
-    async def test_passes_api_key(self, mock_openai_cls):
-        mock_transcript = MagicMock()
-        mock_transcript.text = "text"
-        mock_client = MagicMock()
-        mock_client.audio = MagicMock()
-        mock_client.audio.transcriptions = MagicMock()
-        mock_client.audio.transcriptions.create = AsyncMock(
-            return_value=mock_transcript
-        )
-        mock_openai_cls.return_value = mock_client
+        create = mock_openai.return_value.audio.transcriptions.create
+        assert create.call_args.kwargs["model"] == "whisper-1"
 
+    async def test_passes_api_key(self, mock_openai):
         await transcribe_audio(b"data", "sk-my-secret-key")
-        mock_openai_cls.assert_called_once_with(api_key="sk-my-secret-key")
-
-    @patch("patchright_cli.captcha.AsyncOpenAI")
-    async def test_sends_audio_bytes_as_file_tuple(self, mock_openai_cls):
-        mock_transcript = MagicMock()
-        mock_transcript.text = "result"
-        mock_client = MagicMock()
-        mock_client.audio = MagicMock()
-        mock_client.audio.transcriptions = MagicMock()
-        mock_client.audio.transcriptions.create = AsyncMock(
-            return_value=mock_transcript
-        )
-        mock_openai_cls.return_value = mock_client
+        mock_openai.assert_called_once_with(api_key="sk-my-secret-key")
 
+    async def test_sends_audio_bytes_as_file_tuple(self, mock_openai):
         await transcribe_audio(b"\x00\x01\x02", "sk-key")
-        call_kwargs = mock_client.audio.transcriptions.create.call_args
-        file_arg = call_kwargs.kwargs["file"]
+        create = mock_openai.return_value.audio.transcriptions.create
+        file_arg = create.call_args.kwargs["file"]
         assert file_arg[0] == "audio.wav"
         assert file_arg[1].read() == b"\x00\x01\x02"
 
-    @patch("patchright_cli.captcha.AsyncOpenAI")
-    async def test_empty_audio_data(self, mock_openai_cls):
-        mock_transcript = MagicMock()
-        mock_transcript.text = ""
-        mock_client = MagicMock()
-        mock_client.audio = MagicMock()
-        mock_client.audio.transcriptions = MagicMock()
-        mock_client.audio.transcriptions.create = AsyncMock(
-            return_value=mock_transcript
-        )
-        mock_openai_cls.return_value = mock_client
-
+    async def test_empty_audio_data(self, mock_openai):
         result = await transcribe_audio(b"", "sk-key")
         assert result == ""
+
+
+# What Whisper returned for a one-second pure tone: there is no speech in it.
+_WHISPER_RESPONSE = {"text": ""}
+
+
+def _answer_whisper(
+    requests: list[httpx.Request], request: httpx.Request
+) -> httpx.Response:
+    """Record *request* and answer it with ``_WHISPER_RESPONSE``."""
+    request.read()
+    requests.append(request)
+    return httpx.Response(200, json=_WHISPER_RESPONSE)
+
+
+def _recording_openai(requests: list[httpx.Request], **kwargs) -> AsyncOpenAI:
+    """A real ``AsyncOpenAI`` client whose transport is ``_answer_whisper``."""
+    transport = httpx.MockTransport(partial(_answer_whisper, requests))
+    return AsyncOpenAI(http_client=httpx.AsyncClient(transport=transport), **kwargs)
+
+
+@pytest.fixture
+def whisper_requests(monkeypatch: pytest.MonkeyPatch) -> list[httpx.Request]:
+    """Answer transcribe_audio's OpenAI requests with ``_WHISPER_RESPONSE``.
+
+    The real client still builds and sends the request; only its transport is
+    swapped.  Returns the list the intercepted requests are appended to.
+    """
+    requests: list[httpx.Request] = []
+    monkeypatch.delenv("OPENAI_BASE_URL", raising=False)
+    monkeypatch.setattr(
+        "patchright_cli.captcha.AsyncOpenAI", partial(_recording_openai, requests)
+    )
+    return requests
+
+
+class TestTranscribeAudioRecorded:
+    """transcribe_audio against a recorded Whisper API response."""
+
+    async def test_sends_audio_and_reads_text(
+        self, whisper_requests: list[httpx.Request]
+    ):
+        result = await transcribe_audio(b"RIFF-fake-wav", "sk-test")
+        assert result == ""
+        assert len(whisper_requests) == 1
+        request = whisper_requests[0]
+        assert request.url == "https://api.openai.com/v1/audio/transcriptions"
+        assert request.headers["authorization"] == "Bearer sk-test"
+        assert b"RIFF-fake-wav" in request.content
+
+
+# ---------------------------------------------------------------------------
+# transcribe_audio_stream
+# ---------------------------------------------------------------------------
+
+
+async def _events(*events):
+    for event in events:
+        yield event
+
+
+def _delta(text):
+    return MagicMock(type="transcript.text.delta", delta=text)
+
+
+class TestTranscribeAudioStream:
+    async def test_yields_deltas_in_order(self, mock_openai):
+        create = mock_openai.return_value.audio.transcriptions.create
+        create.return_value = _events(_delta("hello"), _delta(" world"))
+
+        chunks = [c async for c in transcribe_audio_stream(b"data", "sk-key")]
+        assert chunks == ["hello", " world"]
+
+    async def test_skips_non_delta_events(self, mock_openai):
+        create = mock_openai.return_value.audio.transcriptions.create
+        create.return_value = _events(
+            _delta("hi"), MagicMock(type="transcript.text.done", text="hi")
+        )
+
+        chunks = [c async for c in transcribe_audio_stream(b"data", "sk-key")]
+        assert chunks == ["hi"]
+
+    async def test_requests_streaming_model(self, mock_openai):
+        create = mock_openai.return_value.audio.transcriptions.create
+        create.return_value = _events()
+
+        async for _ in transcribe_audio_stream(b"\x00\x01", "sk-key"):
+            pass
+        kwargs = create.call_args.kwargs
+        assert kwargs["stream"] is True
+        assert kwargs["model"] == "gpt-4o-mini-transcribe"
+        assert kwargs["file"][1].read() == b"\x00\x01"
+        mock_openai.assert_called_once_with(api_key="sk-key")
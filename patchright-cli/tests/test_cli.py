@@ -3,13 +3,26 @@
 from __future__ import annotations
 
 import argparse
+import functools
+import io
+import json
+import operator
 from unittest.mock import patch
 
 import pytest
 
-from patchright_cli.cli import _args_to_dict, _register_subcommands, main
+from patchright_cli.cli import _args_to_dict, _tail, main
 from patchright_cli.config import CLIConfig
 
+# Tests that reach `open` load the config; they all get the defaults.
+pytestmark = pytest.mark.usefixtures("default_cli_config")
+
+
+def _assert_contains_all(text: str, *needles: str) -> None:
+    """Assert every needle occurs in *text*, reporting all that are missing."""
+    missing = [n for n in needles if n not in text]
+    assert not missing, f"Missing from output: {missing}\n{text}"
+
 
 # ---------------------------------------------------------------------------
 # _args_to_dict
@@ -45,104 +58,122 @@ class TestArgsToDict:
         assert "ref" not in result
 
 
+# ---------------------------------------------------------------------------
+# _tail
+# ---------------------------------------------------------------------------
+
+
+class TestTail:
+    @pytest.mark.parametrize(
+        ("data", "lines", "expected"),
+        [
+            pytest.param(b"a\nb\nc\n", 2, b"b\nc\n", id="trailing-newline"),
+            pytest.param(b"a\nb\nc", 2, b"b\nc", id="no-trailing-newline"),
+            pytest.param(b"a\nb\n", 5, b"a\nb\n", id="fewer-lines-than-asked"),
+            pytest.param(b"", 3, b"", id="empty"),
+            pytest.param(b"a\n\n\nb\n", 3, b"\n\nb\n", id="blank-lines"),
+        ],
+    )
+    def test_matches_tail_n(self, data, lines, expected):
+        """_tail returns what ``tail -n`` would, across block boundaries."""
+        # A 3-byte block forces several backward reads.
+        assert _tail(io.BytesIO(data), lines, block_size=3) == expected
+
+
 # ---------------------------------------------------------------------------
 # _register_subcommands
 # ---------------------------------------------------------------------------
 
 
-class TestRegisterSubcommands:
-    def test_all_expected_commands_registered(self):
-        """All documented subcommands must be present after registration."""
-        parser = argparse.ArgumentParser()
-        subparsers = parser.add_subparsers(dest="command")
-        _register_subcommands(subparsers)
+# Every documented subcommand.
+_EXPECTED_COMMANDS = frozenset(
+    {
+        # Core
+        "open",
+        "goto",
+        "close",
+        "type",
+        "click",
+        "dblclick",
+        "fill",
+        "drag",
+        "hover",
+        "select",
+        "upload",
+        "check",
+        "uncheck",
+        "snapshot",
+        "eval",
+        "dialog-accept",
+        "dialog-dismiss",
+        "resize",
+        # Navigation
+        "go-back",
+        "go-forward",
+        "reload",
+        # Keyboard
+        "press",
+        "keydown",
+        "keyup",
+        # Mouse
+        "mousemove",
+        "mousedown",
+        "mouseup",
+        "mousewheel",
+        # Save as
+        "screenshot",
+        "pdf",
+        # Tabs
+        "tab-list",
+        "tab-new",
+        "tab-close",
+        "tab-select",
+        # Storage
+        "state-save",
+        "state-load",
+        "cookie-list",
+        "cookie-get",
+        "cookie-set",
+        "cookie-delete",
+        "cookie-clear",
+        "localstorage-list",
+        "localstorage-get",
+        "localstorage-set",
+        "localstorage-delete",
+        "localstorage-clear",
+        "sessionstorage-list",
+        "sessionstorage-get",
+        "sessionstorage-set",
+        "sessionstorage-delete",
+        "sessionstorage-clear",
+        # Network
+        "route",
+        "route-list",
+        "unroute",
+        # DevTools
+        "console",
+        "network",
+        "tracing-start",
+        "tracing-stop",
+        "video-start",
+        "video-stop",
+        # Audio
+        "transcribe-audio",
+        # Session management
+        "list",
+        "close-all",
+        "kill-all",
+        "delete-data",
+        "logs",
+    }
+)
 
-        expected_commands = {
-            # Core
-            "open",
-            "goto",
-            "close",
-            "type",
-            "click",
-            "dblclick",
-            "fill",
-            "drag",
-            "hover",
-            "select",
-            "upload",
-            "check",
-            "uncheck",
-            "snapshot",
-            "eval",
-            "dialog-accept",
-            "dialog-dismiss",
-            "resize",
-            # Navigation
-            "go-back",
-            "go-forward",
-            "reload",
-            # Keyboard
-            "press",
-            "keydown",
-            "keyup",
-            # Mouse
-            "mousemove",
-            "mousedown",
-            "mouseup",
-            "mousewheel",
-            # Save as
-            "screenshot",
-            "pdf",
-            # Tabs
-            "tab-list",
-            "tab-new",
-            "tab-close",
-            "tab-select",
-            # Storage
-            "state-save",
-            "state-load",
-            "cookie-list",
-            "cookie-get",
-            "cookie-set",
-            "cookie-delete",
-            "cookie-clear",
-            "localstorage-list",
-            "localstorage-get",
-            "localstorage-set",
-            "localstorage-delete",
-            "localstorage-clear",
-            "sessionstorage-list",
-            "sessionstorage-get",
-            "sessionstorage-set",
-            "sessionstorage-delete",
-            "sessionstorage-clear",
-            # Network
-            "route",
-            "route-list",
-            "unroute",
-            # DevTools
-            "console",
-            "network",
-            "tracing-start",
-            "tracing-stop",
-            "video-start",
-            "video-stop",
-            # Audio
-            "transcribe-audio",
-            # Session management
-            "list",
-            "close-all",
-            "kill-all",
-            "delete-data",
-            "logs",
-        }
 
-        # _SubParsersAction stores parsers in its _name_parser_map attribute,
-        # but the public way to check is via parser.parse_args.
-        # Instead we iterate the subparsers choices dict.
-        registered = set(subparsers.choices.keys())
-        assert expected_commands.issubset(registered), (
-            f"Missing commands: {expected_commands - registered}"
+class TestRegisterSubcommands:
+    def test_all_expected_commands_registered(self, registered_commands):
+        """All documented subcommands must be present after registration."""
+        assert _EXPECTED_COMMANDS.issubset(registered_commands), (
+            f"Missing commands: {_EXPECTED_COMMANDS.difference(registered_commands)}"
         )
 
 
@@ -160,9 +191,8 @@ class TestMainNoCommand:
 
 
 class TestMainList:
-    @patch("patchright_cli.cli.load_config", return_value=CLIConfig())
     @patch("patchright_cli.cli.list_sessions")
-    def test_list_with_sessions(self, mock_list, _mock_config, capsys, sessions_dir):
+    def test_list_with_sessions(self, mock_list, capsys, sessions_dir):
         """The list command prints config info for populated sessions."""
         mock_list.return_value = [
             {
@@ -182,15 +212,18 @@ class TestMainList:
         ]
         main(["list"])
         captured = capsys.readouterr()
-        assert "### Browsers" in captured.out
-        assert "default" in captured.out
-        assert "open" in captured.out
-        assert "other" in captured.out
-        assert "closed" in captured.out
-        # Config fields for the session with config
-        assert "browser-type: chromium" in captured.out
-        assert "user-data-dir:" in captured.out
-        assert "headed: true" in captured.out
+        _assert_contains_all(
+            captured.out,
+            "### Browsers",
+            "default",
+            "open",
+            "other",
+            "closed",
+            # Config fields for the session with config
+            "browser-type: chromium",
+            "user-data-dir:",
+            "headed: true",
+        )
         # No config fields for the session without config
         lines = captured.out.splitlines()
         other_idx = next(i for i, line in enumerate(lines) if "other" in line)
@@ -198,9 +231,48 @@ class TestMainList:
         other_lines = lines[other_idx:]
         assert not any("browser-type" in line for line in other_lines)
 
-    @patch("patchright_cli.cli.load_config", return_value=CLIConfig())
     @patch("patchright_cli.cli.list_sessions")
-    def test_list_no_sessions(self, mock_list, _mock_config, capsys, sessions_dir):
+    def test_list_json(self, mock_list, capsys, sessions_dir):
+        """list --json prints one structured record per session."""
+        mock_list.return_value = [
+            {
+                "name": "default",
+                "alive": True,
+                "pid": 12345,
+                "config": {
+                    "browser": {
+                        "browser_name": "chromium",
+                        "isolated": True,
+                        "launch_options": {"headless": False},
+                    }
+                },
+            },
+            {"name": "other", "alive": False, "pid": None, "config": None},
+        ]
+        main(["list", "--json"])
+        data = json.loads(capsys.readouterr().out)
+        assert data == {
+            "sessions": [
+                {
+                    "name": "default",
+                    "status": "open",
+                    "browser_type": "chromium",
+                    "user_data_dir": "<in-memory>",
+                    "headed": True,
+                },
+                {"name": "other", "status": "closed"},
+            ]
+        }
+
+    @patch("patchright_cli.cli.list_sessions")
+    def test_list_json_no_sessions(self, mock_list, capsys, sessions_dir):
+        """list --json with no sessions prints an empty list, not a message."""
+        mock_list.return_value = []
+        main(["list", "--json"])
+        assert json.loads(capsys.readouterr().out) == {"sessions": []}
+
+    @patch("patchright_cli.cli.list_sessions")
+    def test_list_no_sessions(self, mock_list, capsys, sessions_dir):
         """When there are no sessions, prints 'No sessions found.'."""
         mock_list.return_value = []
         main(["list"])
@@ -209,9 +281,8 @@ class TestMainList:
 
 
 class TestMainCloseAll:
-    @patch("patchright_cli.cli.load_config", return_value=CLIConfig())
     @patch("patchright_cli.cli.close_all_sessions")
-    def test_close_all(self, mock_close_all, _mock_config, capsys, sessions_dir):
+    def test_close_all(self, mock_close_all, capsys, sessions_dir):
         """close-all prints a status line for each session."""
         mock_close_all.return_value = [
             {"name": "s1", "ok": True},
@@ -220,14 +291,12 @@ class TestMainCloseAll:
         main(["close-all"])
         captured = capsys.readouterr()
         assert "Closed session 's1'" in captured.out
-        assert "Failed to close session 's2'" in captured.err
-        assert "timeout" in captured.err
+        _assert_contains_all(captured.err, "Failed to close session 's2'", "timeout")
 
 
 class TestMainKillAll:
-    @patch("patchright_cli.cli.load_config", return_value=CLIConfig())
     @patch("patchright_cli.cli.kill_all_sessions")
-    def test_kill_all(self, mock_kill_all, _mock_config, capsys, sessions_dir):
+    def test_kill_all(self, mock_kill_all, capsys, sessions_dir):
         """kill-all prints a status line for each session."""
         mock_kill_all.return_value = [
             {"name": "s1", "ok": True, "output": "Killed PID 999"},
@@ -236,14 +305,14 @@ class TestMainKillAll:
         main(["kill-all"])
         captured = capsys.readouterr()
         assert "Killed PID 999" in captured.out
-        assert "Failed to kill session 's2'" in captured.err
-        assert "Permission denied" in captured.err
+        _assert_contains_all(
+            captured.err, "Failed to kill session 's2'", "Permission denied"
+        )
 
 
 class TestMainDeleteData:
-    @patch("patchright_cli.cli.load_config", return_value=CLIConfig())
     @patch("patchright_cli.cli.delete_session_data")
-    def test_delete_data_success(self, mock_delete, _mock_config, capsys, sessions_dir):
+    def test_delete_data_success(self, mock_delete, capsys, sessions_dir):
         """delete-data success prints the output message."""
         mock_delete.return_value = {
             "ok": True,
@@ -253,9 +322,8 @@ class TestMainDeleteData:
         captured = capsys.readouterr()
         assert "Deleted data" in captured.out
 
-    @patch("patchright_cli.cli.load_config", return_value=CLIConfig())
     @patch("patchright_cli.cli.delete_session_data")
-    def test_delete_data_failure(self, mock_delete, _mock_config, capsys, sessions_dir):
+    def test_delete_data_failure(self, mock_delete, capsys, sessions_dir):
         """delete-data failure prints error to stderr and exits 1."""
         mock_delete.return_value = {"ok": False, "error": "Still running"}
         with pytest.raises(SystemExit) as exc_info:
@@ -266,8 +334,7 @@ class TestMainDeleteData:
 
 
 class TestMainLogs:
-    @patch("patchright_cli.cli.load_config", return_value=CLIConfig())
-    def test_logs_missing_file(self, _mock_config, capsys, sessions_dir):
+    def test_logs_missing_file(self, capsys, sessions_dir):
         """logs with a missing log file prints an error and exits 1."""
         with pytest.raises(SystemExit) as exc_info:
             main(["logs"])
@@ -275,8 +342,7 @@ class TestMainLogs:
         captured = capsys.readouterr()
         assert "No log file found" in captured.err
 
-    @patch("patchright_cli.cli.load_config", return_value=CLIConfig())
-    def test_logs_lines_zero_reads_full_file(self, _mock_config, capsys, sessions_dir):
+    def test_logs_lines_zero_reads_full_file(self, capsys, sessions_dir):
         """logs --lines 0 reads the entire log file."""
         # Create the session dir and a log file
         session_dir = sessions_dir / "default"
@@ -287,15 +353,24 @@ class TestMainLogs:
 
         main(["logs", "--lines", "0"])
         captured = capsys.readouterr()
-        assert "line1" in captured.out
-        assert "line2" in captured.out
-        assert "line3" in captured.out
+        _assert_contains_all(captured.out, "line1", "line2", "line3")
+
+    def test_logs_lines_shows_last_lines(self, capsys, sessions_dir):
+        """logs --lines N prints only the last N lines."""
+        session_dir = sessions_dir / "default"
+        session_dir.mkdir(parents=True, exist_ok=True)
+        (session_dir / "daemon.log").write_text(
+            "line1\nline2\nline3\n", encoding="utf-8"
+        )
+
+        main(["logs", "--lines", "2"])
+        captured = capsys.readouterr()
+        assert captured.out == "line2\nline3\n"
 
 
 class TestMainOpen:
-    @patch("patchright_cli.cli.load_config", return_value=CLIConfig())
     @patch("patchright_cli.cli.open_session")
-    def test_open_success(self, mock_open, _mock_config, capsys, sessions_dir):
+    def test_open_success(self, mock_open, capsys, sessions_dir):
         """open success prints the output message."""
         mock_open.return_value = {"ok": True, "output": "Session opened."}
         main(["open"])
@@ -307,50 +382,43 @@ class TestMainOpen:
         assert call_args[0][0] == "default"  # session name
         assert isinstance(call_args[0][1], dict)  # config dict
 
-    @patch("patchright_cli.cli.load_config", return_value=CLIConfig())
-    @patch("patchright_cli.cli.open_session")
-    def test_open_with_headed_flag(self, mock_open, mock_config, sessions_dir):
-        """open --headed is accepted but is a no-op (headed is already the default)."""
-        mock_open.return_value = {"ok": True, "output": "Session opened."}
-        main(["open", "--headed"])
-        call_args = mock_open.call_args
-        config_dict = call_args[0][1]
-        # headed is the default, so headless should remain False (no-op)
-        assert config_dict["browser"]["launch_options"]["headless"] is False
-
-    @patch("patchright_cli.cli.load_config", return_value=CLIConfig())
-    @patch("patchright_cli.cli.open_session")
-    def test_open_with_browser_flag(self, mock_open, mock_config, sessions_dir):
-        """open --browser chrome sets the browser channel in launch_options."""
-        mock_open.return_value = {"ok": True, "output": "Session opened."}
-        main(["open", "--browser", "chrome"])
-        call_args = mock_open.call_args
-        config_dict = call_args[0][1]
-        assert config_dict["browser"]["launch_options"]["channel"] == "chrome"
-
-    @patch("patchright_cli.cli.load_config", return_value=CLIConfig())
+    @pytest.mark.parametrize(
+        ("argv", "path", "expected"),
+        [
+            # headed is already the default, so --headed is a no-op
+            pytest.param(
+                ["open", "--headed"],
+                ("browser", "launch_options", "headless"),
+                False,
+                id="headed",
+            ),
+            pytest.param(
+                ["open", "--browser", "chrome"],
+                ("browser", "launch_options", "channel"),
+                "chrome",
+                id="browser",
+            ),
+            pytest.param(
+                ["open", "--isolated"], ("browser", "isolated"), True, id="isolated"
+            ),
+            pytest.param(
+                ["open", "--profile", "/my/dir"],
+                ("browser", "user_data_dir"),
+                "/my/dir",
+                id="profile",
+            ),
+        ],
+    )
     @patch("patchright_cli.cli.open_session")
-    def test_open_with_isolated_flag(self, mock_open, mock_config, sessions_dir):
-        """open --isolated sets isolated=True in the config."""
+    def test_open_flag(self, mock_open, argv, path, expected, sessions_dir):
+        """open flags are applied to the config dict passed to open_session."""
         mock_open.return_value = {"ok": True, "output": "Session opened."}
-        main(["open", "--isolated"])
-        call_args = mock_open.call_args
-        config_dict = call_args[0][1]
-        assert config_dict["browser"]["isolated"] is True
+        main(argv)
+        config_dict = mock_open.call_args[0][1]
+        assert functools.reduce(operator.getitem, path, config_dict) == expected
 
-    @patch("patchright_cli.cli.load_config", return_value=CLIConfig())
     @patch("patchright_cli.cli.open_session")
-    def test_open_with_profile_flag(self, mock_open, mock_config, sessions_dir):
-        """open --profile /my/dir sets user_data_dir in the config."""
-        mock_open.return_value = {"ok": True, "output": "Session opened."}
-        main(["open", "--profile", "/my/dir"])
-        call_args = mock_open.call_args
-        config_dict = call_args[0][1]
-        assert config_dict["browser"]["user_data_dir"] == "/my/dir"
-
-    @patch("patchright_cli.cli.load_config", return_value=CLIConfig())
-    @patch("patchright_cli.cli.open_session")
-    def test_open_failure(self, mock_open, _mock_config, capsys, sessions_dir):
+    def test_open_failure(self, mock_open, capsys, sessions_dir):
         """open failure prints error to stderr and exits 1."""
         mock_open.return_value = {
             "ok": False,
@@ -364,8 +432,7 @@ class TestMainOpen:
 
 
 class TestMainInstall:
-    @patch("patchright_cli.cli.load_config", return_value=CLIConfig())
-    def test_install_skills(self, _mock_config, capsys, sessions_dir, tmp_path):
+    def test_install_skills(self, capsys, sessions_dir, tmp_path):
         """install --skills copies skill dirs to ~/.claude/skills/."""
         from pathlib import Path
 
@@ -382,12 +449,9 @@ class TestMainInstall:
         assert (skill_dst / "SKILL.md").is_file()
         assert (skill_dst / "references").is_dir()
 
-    @patch("patchright_cli.cli.load_config", return_value=CLIConfig())
-    def test_install_without_skills(self, _mock_config, capsys, sessions_dir, tmp_path):
+    def test_install_without_skills(self, capsys, sessions_dir, tmp_path, monkeypatch):
         """install without --skills creates .playwright directory."""
-        import os
-
-        os.chdir(tmp_path)
+        monkeypatch.chdir(tmp_path)
         main(["install"])
         captured = capsys.readouterr()
         assert "Workspace initialized at" in captured.out
@@ -395,35 +459,30 @@ class TestMainInstall:
 
 
 class TestMainInstallBrowser:
-    @patch("patchright_cli.cli.load_config", return_value=CLIConfig())
-    @patch("subprocess.run")
-    def test_install_browser_with_browser_arg(
-        self, mock_run, _mock_config, sessions_dir
-    ):
-        """install-browser --browser chrome passes the browser arg to subprocess."""
+    @pytest.mark.parametrize(
+        ("argv", "expected_cmd"),
+        [
+            pytest.param(
+                ["install-browser", "--browser", "chrome"],
+                ["patchright", "install", "chrome"],
+                id="with-browser",
+            ),
+            pytest.param(
+                ["install-browser"], ["patchright", "install"], id="without-browser"
+            ),
+        ],
+    )
+    @patch("patchright_cli.cli._run")
+    def test_install_browser(self, mock_run, argv, expected_cmd, sessions_dir):
+        """install-browser runs patchright install, passing --browser through."""
         mock_run.return_value = None
-        main(["install-browser", "--browser", "chrome"])
-        mock_run.assert_called_once_with(
-            ["patchright", "install", "chrome"], check=True
-        )
-
-    @patch("patchright_cli.cli.load_config", return_value=CLIConfig())
-    @patch("subprocess.run")
-    def test_install_browser_without_browser_arg(
-        self, mock_run, _mock_config, sessions_dir
-    ):
-        """install-browser without --browser runs patchright install with no extra args."""
-        mock_run.return_value = None
-        main(["install-browser"])
-        mock_run.assert_called_once_with(["patchright", "install"], check=True)
+        main(argv)
+        mock_run.assert_called_once_with(expected_cmd, check=True)
 
 
 class TestMainDaemonCommand:
-    @patch("patchright_cli.cli.load_config", return_value=CLIConfig())
     @patch("patchright_cli.cli.send_command")
-    def test_daemon_command_success(
-        self, mock_send, _mock_config, capsys, sessions_dir
-    ):
+    def test_daemon_command_success(self, mock_send, capsys, sessions_dir):
         """A daemon command (goto) prints the output on success."""
         mock_send.return_value = {
             "ok": True,
@@ -436,11 +495,8 @@ class TestMainDaemonCommand:
             "default", "goto", {"url": "https://example.com"}
         )
 
-    @patch("patchright_cli.cli.load_config", return_value=CLIConfig())
     @patch("patchright_cli.cli.send_command")
-    def test_daemon_command_failure(
-        self, mock_send, _mock_config, capsys, sessions_dir
-    ):
+    def test_daemon_command_failure(self, mock_send, capsys, sessions_dir):
         """A daemon command failure prints the error to stderr and exits 1."""
         mock_send.return_value = {"ok": False, "error": "Session not running"}
         with pytest.raises(SystemExit) as exc_info:
@@ -451,9 +507,8 @@ class TestMainDaemonCommand:
 
 
 class TestMainGlobalFlags:
-    @patch("patchright_cli.cli.load_config", return_value=CLIConfig())
     @patch("patchright_cli.cli.send_command")
-    def test_session_flag(self, mock_send, _mock_config, sessions_dir):
+    def test_session_flag(self, mock_send, sessions_dir):
         """-s session-name passes the session name to resolve_session_name."""
         mock_send.return_value = {"ok": True, "output": "done"}
         main(["-s", "my-session", "goto", "https://example.com"])
@@ -462,11 +517,19 @@ class TestMainGlobalFlags:
             "my-session", "goto", {"url": "https://example.com"}
         )
 
-    @patch("patchright_cli.cli.send_command")
-    @patch("patchright_cli.cli.load_config")
-    def test_config_flag(self, mock_load_config, mock_send, sessions_dir):
+    @patch("patchright_cli.cli.open_session")
+    @patch("patchright_cli.config.load_config")
+    def test_config_flag(self, mock_load_config, mock_open, sessions_dir):
         """--config path passes the path to load_config."""
         mock_load_config.return_value = CLIConfig()
+        mock_open.return_value = {"ok": True, "output": "Session opened."}
+        main(["--config", "/tmp/my-config.json", "open"])
+        mock_load_config.assert_called_once_with("/tmp/my-config.json")
+
+    @patch("patchright_cli.cli.send_command")
+    @patch("patchright_cli.config.load_config")
+    def test_daemon_command_skips_config(self, mock_load_config, mock_send):
+        """Commands other than open never load the config."""
         mock_send.return_value = {"ok": True, "output": "done"}
         main(["--config", "/tmp/my-config.json", "goto", "https://example.com"])
-        mock_load_config.assert_called_once_with("/tmp/my-config.json")
+        mock_load_config.assert_not_called()
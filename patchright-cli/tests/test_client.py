@@ -3,13 +3,20 @@
 from __future__ import annotations
 
 import json
+import os
 import signal
 import socket
 import subprocess
+import threading
 from unittest.mock import MagicMock, patch
 
+import pytest
+
+from patchright_cli import client
 from patchright_cli.client import (
+    _ConnectionCache,
     _receive_all,
+    _send_line,
     close_all_sessions,
     delete_session_data,
     kill_all_sessions,
@@ -24,42 +31,83 @@ from patchright_cli.client import (
 # ---------------------------------------------------------------------------
 
 
+def _recv_into(*chunks: bytes):
+    """A ``socket.recv_into`` side effect delivering *chunks*, then EOF.
+
+    Like a real socket, a chunk larger than the buffer is split across calls.
+    """
+    pending = list(chunks)
+
+    def recv_into(view):
+        if not pending:
+            return 0
+        data, pending[0] = pending[0][: len(view)], pending[0][len(view) :]
+        if not pending[0]:
+            pending.pop(0)
+        view[: len(data)] = data
+        return len(data)
+
+    return recv_into
+
+
 class TestReceiveAll:
     """Tests for the _receive_all helper that reads newline-delimited data."""
 
     def test_single_chunk_with_newline(self):
         """A single recv returning data ending with newline should return stripped data."""
         mock_sock = MagicMock(spec=socket.socket)
-        payload = b'{"ok": true}\n'
-        mock_sock.recv.return_value = payload
+        mock_sock.recv_into.side_effect = _recv_into(b'{"ok": true}\n')
 
         result = _receive_all(mock_sock)
 
         assert result == b'{"ok": true}'
-        mock_sock.recv.assert_called_once_with(65536)
+        mock_sock.recv_into.assert_called_once()
+        assert len(mock_sock.recv_into.call_args[0][0]) == 65536
 
     def test_multiple_chunks_before_newline(self):
         """Multiple recv calls should be concatenated until newline appears."""
         mock_sock = MagicMock(spec=socket.socket)
-        mock_sock.recv.side_effect = [
+        mock_sock.recv_into.side_effect = _recv_into(
             b'{"ok": ',
             b'true, "data": "hello"}\n',
-        ]
+        )
 
         result = _receive_all(mock_sock)
 
         assert result == b'{"ok": true, "data": "hello"}'
-        assert mock_sock.recv.call_count == 2
+        assert mock_sock.recv_into.call_count == 2
+
+    def test_stops_at_first_newline(self):
+        """Only the first line is returned, even if more arrived with it."""
+        mock_sock = MagicMock(spec=socket.socket)
+        mock_sock.recv_into.side_effect = _recv_into(
+            b'{"ok": ', b'true}\n{"ok": false}\n'
+        )
+
+        result = _receive_all(mock_sock)
+
+        assert result == b'{"ok": true}'
+        assert mock_sock.recv_into.call_count == 2
+
+    def test_grows_buffer_for_long_responses(self):
+        """A response longer than the buffer is read whole, growing the buffer."""
+        mock_sock = MagicMock(spec=socket.socket)
+        payload = b'{"output": "' + b"x" * 100 + b'"}'
+        mock_sock.recv_into.side_effect = _recv_into(payload + b"\n")
+
+        result = _receive_all(mock_sock, buffer_size=8)
+
+        assert result == payload
 
     def test_empty_recv_connection_closed(self):
         """When recv returns empty bytes (connection closed), return accumulated data."""
         mock_sock = MagicMock(spec=socket.socket)
-        mock_sock.recv.return_value = b""
+        mock_sock.recv_into.side_effect = _recv_into()
 
         result = _receive_all(mock_sock)
 
         assert result == b""
-        mock_sock.recv.assert_called_once_with(65536)
+        mock_sock.recv_into.assert_called_once()
 
 
 # ---------------------------------------------------------------------------
@@ -67,6 +115,64 @@ class TestReceiveAll:
 # ---------------------------------------------------------------------------
 
 
+@pytest.fixture(autouse=True)
+def _empty_connection_cache(monkeypatch):
+    """Start every test without cached daemon connections."""
+    monkeypatch.setattr(client, "_conn_cache", _ConnectionCache())
+
+
+def _reply(data: dict) -> bytes:
+    return json.dumps(data).encode() + b"\n"
+
+
+def _mock_socket() -> MagicMock:
+    """A socket mock whose ``sendmsg`` sends every buffer in full.
+
+    The bytes of each call are kept in ``sent``, since ``_send_line``
+    empties the buffer list it passed once the send completes.
+    """
+    sock = MagicMock(spec=socket.socket)
+    sock.sent = []
+
+    def sendmsg(buffers):
+        sock.sent.append(b"".join(buffers))
+        return len(sock.sent[-1])
+
+    sock.sendmsg.side_effect = sendmsg
+    return sock
+
+
+class TestSendLine:
+    """Tests for _send_line, which writes a request and its newline."""
+
+    def test_partial_sends_are_resumed(self):
+        """sendmsg is called again with whatever a short send left over."""
+        sent = bytearray()
+
+        def sendmsg(buffers):
+            # Send at most three bytes per call, like a congested socket.
+            data = b"".join(buffers)[:3]
+            sent.extend(data)
+            return len(data)
+
+        mock_sock = MagicMock(spec=socket.socket)
+        mock_sock.sendmsg.side_effect = sendmsg
+
+        _send_line(mock_sock, b'{"cmd":"x"}')
+
+        assert bytes(sent) == b'{"cmd":"x"}\n'
+        assert mock_sock.sendmsg.call_count == 4
+        mock_sock.sendall.assert_not_called()
+
+    def test_falls_back_to_sendall_without_sendmsg(self):
+        """Sockets without sendmsg get the joined line through sendall."""
+        mock_sock = MagicMock(spec=["sendall"])
+
+        _send_line(mock_sock, b'{"cmd":"x"}')
+
+        mock_sock.sendall.assert_called_once_with(b'{"cmd":"x"}\n')
+
+
 class TestSendCommand:
     """Tests for send_command which communicates with a daemon via Unix socket."""
 
@@ -88,8 +194,8 @@ class TestSendCommand:
         response_data = {"ok": True, "output": "snapshot taken"}
         response_bytes = json.dumps(response_data).encode() + b"\n"
 
-        mock_sock_instance = MagicMock(spec=socket.socket)
-        mock_sock_instance.recv.return_value = response_bytes
+        mock_sock_instance = _mock_socket()
+        mock_sock_instance.recv_into.side_effect = _recv_into(response_bytes)
 
         with patch(
             "patchright_cli.client.socket.socket", return_value=mock_sock_instance
@@ -101,10 +207,76 @@ class TestSendCommand:
         mock_sock_instance.settimeout.assert_called_once_with(120.0)
         mock_sock_instance.connect.assert_called_once_with(str(sock_path))
 
-        sent_payload = mock_sock_instance.sendall.call_args[0][0]
-        sent_data = json.loads(sent_payload.decode().strip())
+        (sent_payload,) = mock_sock_instance.sent
+        assert sent_payload.endswith(b"\n")
+        sent_data = json.loads(sent_payload)
         assert sent_data == {"cmd": "snapshot", "args": {"ref": "e0"}}
 
+        # The connection stays open for the next command.
+        mock_sock_instance.close.assert_not_called()
+
+    def test_connection_reuse(self, sessions_dir):
+        """Later commands to the same session reuse the open connection."""
+        session_name = "test-session"
+        sock_path = sessions_dir / session_name / "server.sock"
+        sock_path.parent.mkdir(parents=True, exist_ok=True)
+        sock_path.touch()
+
+        mock_sock_instance = _mock_socket()
+        mock_sock_instance.recv_into.side_effect = _recv_into(
+            _reply({"ok": True, "output": "one"}),
+            _reply({"ok": True, "output": "two"}),
+        )
+
+        with patch(
+            "patchright_cli.client.socket.socket", return_value=mock_sock_instance
+        ) as mock_socket:
+            first = send_command(session_name, "snapshot")
+            second = send_command(session_name, "snapshot", timeout=5.0)
+
+        assert (first["output"], second["output"]) == ("one", "two")
+        mock_socket.assert_called_once()
+        mock_sock_instance.connect.assert_called_once_with(str(sock_path))
+        assert mock_sock_instance.sendmsg.call_count == 2
+        mock_sock_instance.settimeout.assert_called_with(5.0)
+
+    def test_reconnects_after_daemon_hangup(self, sessions_dir):
+        """A cached connection the daemon has closed is replaced and retried once."""
+        session_name = "test-session"
+        sock_path = sessions_dir / session_name / "server.sock"
+        sock_path.parent.mkdir(parents=True, exist_ok=True)
+        sock_path.touch()
+
+        stale = _mock_socket()
+        stale.recv_into.side_effect = _recv_into(_reply({"ok": True}))
+        fresh = _mock_socket()
+        fresh.recv_into.side_effect = _recv_into(_reply({"ok": True, "output": "hi"}))
+
+        with patch("patchright_cli.client.socket.socket", side_effect=[stale, fresh]):
+            send_command(session_name, "snapshot")
+            # The stale socket now reads EOF: the daemon hung up on it.
+            result = send_command(session_name, "snapshot")
+
+        assert result == {"ok": True, "output": "hi"}
+        stale.close.assert_called_once()
+        fresh.sendmsg.assert_called_once()
+
+    def test_close_drops_connection(self, sessions_dir):
+        """The daemon hangs up after a close, so the connection is not kept."""
+        session_name = "test-session"
+        sock_path = sessions_dir / session_name / "server.sock"
+        sock_path.parent.mkdir(parents=True, exist_ok=True)
+        sock_path.touch()
+
+        mock_sock_instance = _mock_socket()
+        mock_sock_instance.recv_into.side_effect = _recv_into(_reply({"ok": True}))
+
+        with patch(
+            "patchright_cli.client.socket.socket", return_value=mock_sock_instance
+        ):
+            result = send_command(session_name, "close")
+
+        assert result["ok"] is True
         mock_sock_instance.close.assert_called_once()
 
     def test_connection_refused_error(self, sessions_dir):
@@ -114,7 +286,7 @@ class TestSendCommand:
         sock_path.parent.mkdir(parents=True, exist_ok=True)
         sock_path.touch()
 
-        mock_sock_instance = MagicMock(spec=socket.socket)
+        mock_sock_instance = _mock_socket()
         mock_sock_instance.connect.side_effect = ConnectionRefusedError("refused")
 
         with (
@@ -137,10 +309,10 @@ class TestSendCommand:
         sock_path.parent.mkdir(parents=True, exist_ok=True)
         sock_path.touch()
 
-        mock_sock_instance = MagicMock(spec=socket.socket)
+        mock_sock_instance = _mock_socket()
         mock_sock_instance.connect.return_value = None
         mock_sock_instance.sendall.return_value = None
-        mock_sock_instance.recv.side_effect = socket.timeout("timed out")
+        mock_sock_instance.recv_into.side_effect = socket.timeout("timed out")
 
         with patch(
             "patchright_cli.client.socket.socket", return_value=mock_sock_instance
@@ -159,7 +331,7 @@ class TestSendCommand:
         sock_path.parent.mkdir(parents=True, exist_ok=True)
         sock_path.touch()
 
-        mock_sock_instance = MagicMock(spec=socket.socket)
+        mock_sock_instance = _mock_socket()
         mock_sock_instance.connect.side_effect = OSError("some OS error")
 
         with patch(
@@ -178,6 +350,21 @@ class TestSendCommand:
 # ---------------------------------------------------------------------------
 
 
+def _daemon(*, ready: bool = True):
+    """A ``subprocess.Popen`` side effect standing in for the daemon process.
+
+    It reports ready on the descriptor passed to it, or, with
+    ``ready=False``, exits at once without doing so.
+    """
+
+    def popen(args, *, pass_fds, **kwargs):
+        if ready:
+            os.write(pass_fds[0], b"1")
+        return MagicMock()  # Popen itself is patched here, so it can't be a spec
+
+    return popen
+
+
 class TestStartDaemon:
     """Tests for start_daemon which spawns the browser daemon process."""
 
@@ -200,70 +387,22 @@ class TestStartDaemon:
         sock_path.parent.mkdir(parents=True, exist_ok=True)
         sock_path.touch()
 
-        mock_proc = MagicMock(spec=subprocess.Popen)
-        # Process alive on first check, then socket appears
-        mock_proc.poll.return_value = None
-
-        def create_socket_on_poll():
-            """Simulate the daemon creating the socket file after cleanup."""
-            sock_path.touch()
-            return None
-
         with (
             patch("patchright_cli.client.is_session_alive", return_value=False),
             patch("patchright_cli.client.cleanup_session") as mock_cleanup,
-            patch("patchright_cli.client.subprocess.Popen", return_value=mock_proc),
-            patch("patchright_cli.client.time.sleep"),
+            patch("patchright_cli.client.subprocess.Popen", side_effect=_daemon()),
         ):
-            # After cleanup, socket is removed; re-create it to simulate daemon starting
-            def side_effect_cleanup(name):
-                sock_path.unlink(missing_ok=True)
-
-            mock_cleanup.side_effect = side_effect_cleanup
-
-            # On the second poll check the socket appears
-            poll_count = 0
-
-            def poll_side_effect():
-                nonlocal poll_count
-                poll_count += 1
-                if poll_count >= 2:
-                    sock_path.touch()
-                return None
-
-            mock_proc.poll.side_effect = poll_side_effect
-
             result = start_daemon(session_name, config_dict)
 
         assert result is True
         mock_cleanup.assert_called_once_with(session_name)
 
     def test_success_spawns_process(self, sessions_dir, config_dict):
-        """A successful start should spawn Popen and wait for socket to appear."""
-        session_name = "new-session"
-
-        mock_proc = MagicMock(spec=subprocess.Popen)
-        poll_count = 0
-
-        def poll_side_effect():
-            nonlocal poll_count
-            poll_count += 1
-            if poll_count >= 2:
-                # Simulate daemon creating the socket
-                sock_path = sessions_dir / session_name / "server.sock"
-                sock_path.parent.mkdir(parents=True, exist_ok=True)
-                sock_path.touch()
-            return None
-
-        mock_proc.poll.side_effect = poll_side_effect
-
-        with (
-            patch(
-                "patchright_cli.client.subprocess.Popen", return_value=mock_proc
-            ) as mock_popen,
-            patch("patchright_cli.client.time.sleep"),
-        ):
-            result = start_daemon(session_name, config_dict)
+        """A successful start should spawn Popen and wait for the ready byte."""
+        with patch(
+            "patchright_cli.client.subprocess.Popen", side_effect=_daemon()
+        ) as mock_popen:
+            result = start_daemon("new-session", config_dict)
 
         assert result is True
         mock_popen.assert_called_once()
@@ -271,46 +410,34 @@ class TestStartDaemon:
         assert popen_kwargs.kwargs["start_new_session"] is True
         assert popen_kwargs.kwargs["stdout"] == subprocess.DEVNULL
         assert popen_kwargs.kwargs["stderr"] == subprocess.DEVNULL
+        # The daemon is told which inherited descriptor to report on.
+        (ready_fd,) = popen_kwargs.kwargs["pass_fds"]
+        assert f"ready_fd={ready_fd}" in popen_kwargs.args[0][-1]
 
     def test_process_dies_immediately(self, sessions_dir, config_dict):
-        """If the spawned process exits immediately (poll != None), return False."""
-        session_name = "doomed"
-
-        mock_proc = MagicMock(spec=subprocess.Popen)
-        mock_proc.poll.return_value = 1  # Process already exited with code 1
-
-        with (
-            patch("patchright_cli.client.subprocess.Popen", return_value=mock_proc),
-            patch("patchright_cli.client.time.sleep"),
+        """A daemon that exits before it is ready closes the pipe: return False."""
+        with patch(
+            "patchright_cli.client.subprocess.Popen", side_effect=_daemon(ready=False)
         ):
-            result = start_daemon(session_name, config_dict)
+            result = start_daemon("doomed", config_dict, timeout=10.0)
 
         assert result is False
 
-    def test_timeout_socket_never_appears(self, sessions_dir, config_dict):
-        """If the socket never appears within timeout, return False."""
-        session_name = "timeout-session"
-
-        mock_proc = MagicMock(spec=subprocess.Popen)
-        mock_proc.poll.return_value = None  # Process stays alive but no socket
+    def test_timeout_never_ready(self, sessions_dir, config_dict):
+        """If the daemon stays up but never becomes ready, return False."""
+        held: list[int] = []
 
-        call_count = 0
+        def hang(args, *, pass_fds, **kwargs):
+            # Keep the write end open, as a live daemon would.
+            held.append(os.dup(pass_fds[0]))
+            return MagicMock()
 
-        def advancing_monotonic():
-            """Simulate time advancing past the timeout."""
-            nonlocal call_count
-            call_count += 1
-            # First call establishes start_time, subsequent calls advance time
-            return call_count * 5.0
-
-        with (
-            patch("patchright_cli.client.subprocess.Popen", return_value=mock_proc),
-            patch(
-                "patchright_cli.client.time.monotonic", side_effect=advancing_monotonic
-            ),
-            patch("patchright_cli.client.time.sleep"),
-        ):
-            result = start_daemon(session_name, config_dict, timeout=10.0)
+        try:
+            with patch("patchright_cli.client.subprocess.Popen", side_effect=hang):
+                result = start_daemon("timeout-session", config_dict, timeout=0.05)
+        finally:
+            for fd in held:
+                os.close(fd)
 
         assert result is False
 
@@ -409,6 +536,34 @@ class TestCloseAllSessions:
         assert dead_result["ok"] is True
         assert "stale" in dead_result["output"].lower()
 
+        # Results keep the listing order
+        assert [r["name"] for r in results] == ["alive-1", "dead-1", "alive-2"]
+
+    def test_closes_sessions_concurrently(self, sessions_dir):
+        """Every close is in flight at once rather than one after another."""
+        sessions = [
+            {"name": "alive-1", "alive": True, "pid": 1001},
+            {"name": "alive-2", "alive": True, "pid": 1002},
+        ]
+        # Each close blocks until both have started; run serially it would
+        # time out and break the barrier.
+        barrier = threading.Barrier(len(sessions), timeout=5)
+
+        def fake_send(name, cmd):
+            barrier.wait()
+            return {"ok": True, "output": f"closed {name}"}
+
+        with (
+            patch("patchright_cli.client.list_sessions", return_value=sessions),
+            patch("patchright_cli.client.send_command", side_effect=fake_send),
+        ):
+            results = close_all_sessions()
+
+        assert results == [
+            {"name": "alive-1", "ok": True, "output": "closed alive-1"},
+            {"name": "alive-2", "ok": True, "output": "closed alive-2"},
+        ]
+
 
 # ---------------------------------------------------------------------------
 # kill_all_sessions
@@ -484,6 +639,16 @@ class TestKillAllSessions:
         mock_cleanup.assert_any_call("protected")
         mock_cleanup.assert_any_call("no-pid")
 
+    def test_no_sessions(self, sessions_dir):
+        """With nothing running there is nothing to kill or clean up."""
+        with (
+            patch("patchright_cli.client.list_sessions", return_value=[]),
+            patch("patchright_cli.client.cleanup_session") as mock_cleanup,
+        ):
+            assert kill_all_sessions() == []
+
+        mock_cleanup.assert_not_called()
+
 
 # ---------------------------------------------------------------------------
 # delete_session_data
@@ -2,12 +2,29 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import json
+import shutil
+import tempfile
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from patchright.async_api import Error as PlaywrightError
 
-from patchright_cli.server import BrowserSession, Response
+from patchright_cli.server import (
+    _CALL_EXPR_HANDLE_JS,
+    _EXPR_HANDLE_CACHE_SIZE,
+    _STREAM_JOIN_THRESHOLD,
+    BrowserSession,
+    Response,
+    _decode_request,
+    _encode_reply,
+    _join_lines,
+    run_server,
+)
+from patchright_cli.session import get_pid_path, get_socket_path
 
 
 # ---------------------------------------------------------------------------
@@ -47,6 +64,29 @@ class TestBrowserSessionInit:
         assert session.active_page is None
 
 
+class TestSetupContext:
+    def test_context_options_include_video(self, browser_session, output_dir):
+        from patchright_cli.config import VideoSize
+
+        browser_session.config.save_video = VideoSize(width=640, height=480)
+        opts = browser_session._context_options()
+        assert opts["record_video_dir"] == str(output_dir)
+        assert opts["record_video_size"] == {"width": 640, "height": 480}
+
+    async def test_resets_route_and_tracing_state(self, browser_session, mock_context):
+        browser_session.active_routes = {"**/api": MagicMock()}
+        browser_session.tracing_active = True
+        await browser_session._setup_context()
+        assert browser_session.active_routes == {}
+        assert browser_session.tracing_active is False
+        mock_context.on.assert_called_once_with(
+            "page", browser_session._on_new_page_sync
+        )
+        mock_context.set_default_timeout.assert_called_once_with(
+            browser_session.config.timeouts.action
+        )
+
+
 # ---------------------------------------------------------------------------
 # 2. handle_command dispatch
 # ---------------------------------------------------------------------------
@@ -69,6 +109,44 @@ class TestHandleCommand:
         assert result["ok"] is False
         assert "boom" in result["error"]
 
+    async def test_coerces_numeric_args_from_annotations(
+        self, browser_session, mock_page
+    ):
+        result = await browser_session.handle_command(
+            "resize", {"width": "800", "height": 600.0}
+        )
+        assert result["ok"] is True
+        mock_page.set_viewport_size.assert_awaited_once_with(
+            {"width": 800, "height": 600}
+        )
+
+    async def test_coercion_leaves_caller_args_untouched(
+        self, browser_session, mock_page
+    ):
+        args = {"width": "800", "height": "600"}
+        await browser_session.handle_command("resize", args)
+        assert args == {"width": "800", "height": "600"}
+
+    @pytest.mark.parametrize(
+        ("x", "y", "code"),
+        [
+            pytest.param(100, 200, "move(100, 200)", id="ints"),
+            pytest.param("100", "200.5", "move(100, 200.5)", id="strings"),
+            pytest.param(100.0, 2.5, "move(100.0, 2.5)", id="floats"),
+        ],
+    )
+    async def test_float_coercion_keeps_generated_code(
+        self, browser_session, mock_page, x, y, code
+    ):
+        result = await browser_session.handle_command("mousemove", {"x": x, "y": y})
+        assert result["ok"] is True
+        assert code in result["output"]
+
+    async def test_invalid_numeric_arg_returns_error(self, browser_session):
+        result = await browser_session.handle_command("tab-select", {"index": "x"})
+        assert result["ok"] is False
+        assert "invalid literal" in result["error"]
+
 
 # ---------------------------------------------------------------------------
 # 3. _resolve_ref
@@ -323,9 +401,73 @@ class TestCmdEval:
         mock_page.evaluate = AsyncMock(return_value=42)
         result = await browser_session.cmd_eval(expression="1 + 1")
         assert result["ok"] is True
-        mock_page.evaluate.assert_any_call("1 + 1")
+        mock_page.evaluate_handle.assert_awaited_once_with("() => (1 + 1)")
+        mock_page.evaluate.assert_any_call(
+            _CALL_EXPR_HANDLE_JS, mock_page.evaluate_handle.return_value
+        )
         assert "42" in result["output"]
 
+    async def test_reuses_compiled_handle(self, browser_session, mock_page):
+        mock_page.evaluate = AsyncMock(return_value=1)
+        await browser_session.cmd_eval(expression="window.scrollY")
+        await browser_session.cmd_eval(expression="window.scrollY")
+        mock_page.evaluate_handle.assert_awaited_once()
+        assert mock_page.evaluate.await_count == 2
+
+    async def test_statement_falls_back_to_plain_evaluate(
+        self, browser_session, mock_page
+    ):
+        mock_page.evaluate_handle = AsyncMock(
+            side_effect=PlaywrightError("SyntaxError: Unexpected token 'let'")
+        )
+        mock_page.evaluate = AsyncMock(return_value=3)
+        result = await browser_session.cmd_eval(expression="let a = 3; a")
+        assert result["ok"] is True
+        mock_page.evaluate.assert_awaited_once_with("let a = 3; a")
+        assert browser_session._expr_handles[mock_page] == {}
+
+    async def test_other_compile_errors_are_not_retried(
+        self, browser_session, mock_page
+    ):
+        mock_page.evaluate_handle = AsyncMock(
+            side_effect=PlaywrightError("Target page has been closed")
+        )
+        with pytest.raises(PlaywrightError, match="closed"):
+            await browser_session._evaluate_cached(mock_page, "1 + 1")
+        mock_page.evaluate.assert_not_awaited()
+
+    async def test_evicts_and_disposes_least_recently_used(
+        self, browser_session, mock_page
+    ):
+        handles = {}
+
+        async def evaluate_handle(source):
+            handles[source] = AsyncMock()
+            return handles[source]
+
+        mock_page.evaluate_handle = AsyncMock(side_effect=evaluate_handle)
+        for i in range(_EXPR_HANDLE_CACHE_SIZE):
+            await browser_session._evaluate_cached(mock_page, str(i))
+        await browser_session._evaluate_cached(mock_page, "0")  # now most recent
+        await browser_session._evaluate_cached(mock_page, "extra")
+
+        cached = browser_session._expr_handles[mock_page]
+        assert len(cached) == _EXPR_HANDLE_CACHE_SIZE
+        assert "1" not in cached and "0" in cached
+        handles["() => (1)"].dispose.assert_awaited_once()
+        handles["() => (0)"].dispose.assert_not_awaited()
+
+    async def test_navigation_invalidates_handles(self, browser_session, mock_page):
+        await browser_session._setup_page_listeners(mock_page)
+        listeners = {c.args[0]: c.args[1] for c in mock_page.on.call_args_list}
+        await browser_session.cmd_eval(expression="1 + 1")
+        assert "1 + 1" in browser_session._expr_handles[mock_page]
+        handle = browser_session._expr_handles[mock_page]["1 + 1"]
+        listeners["framenavigated"](mock_page.main_frame)
+        assert mock_page not in browser_session._expr_handles
+        await asyncio.sleep(0)  # let the scheduled dispose run
+        handle.dispose.assert_awaited_once()
+
     async def test_with_ref(self, browser_session, mock_page):
         browser_session.element_refs = {
             "e0": {
@@ -404,6 +546,25 @@ class TestCmdTabList:
         assert "0:" in result["output"]
         assert "Example" in result["output"]
 
+    @pytest.mark.parametrize(
+        "error",
+        [RuntimeError("target closed"), asyncio.CancelledError()],
+        ids=["error", "cancelled"],
+    )
+    async def test_title_failure_falls_back_to_url(
+        self, browser_session, mock_page, error
+    ):
+        second = MagicMock()
+        second.url = "https://broken.example"
+        second.title = AsyncMock(side_effect=error)
+        browser_session.pages = [mock_page, second]
+        result = await browser_session.cmd_tab_list()
+        assert result["ok"] is True
+        assert "- 0: (current) [Example](https://example.com)" in result["output"]
+        assert (
+            "- 1: [https://broken.example](https://broken.example)" in result["output"]
+        )
+
 
 class TestCmdTabNew:
     async def test_opens_new_tab(self, browser_session, mock_context, mock_page):
@@ -509,6 +670,19 @@ class TestCmdLocalstorageList:
         assert "localStorage" in result["output"]
         assert "key1" in result["output"]
 
+    async def test_output_is_page_json_unchanged(self, browser_session, mock_page):
+        mock_page.evaluate = AsyncMock(return_value='[["key1","val1"],["key2","val2"]]')
+        result = await browser_session.cmd_localstorage_list()
+        assert (
+            '### localStorage\n```json\n[["key1","val1"],["key2","val2"]]\n```'
+            in result["output"]
+        )
+
+    async def test_non_string_result_is_encoded(self, browser_session, mock_page):
+        mock_page.evaluate = AsyncMock(return_value=[["key1", "val1"]])
+        result = await browser_session.cmd_localstorage_list()
+        assert '```json\n[["key1", "val1"]]\n```' in result["output"]
+
 
 # ---------------------------------------------------------------------------
 # 14. Command handlers -- Screenshot / PDF
@@ -656,6 +830,36 @@ class TestCmdNetwork:
         assert result["ok"] is True
         assert "Network" in result["output"]
 
+    @staticmethod
+    def _entry(url, resource_type, status):
+        return {
+            "method": "GET",
+            "url": url,
+            "resource_type": resource_type,
+            "status": status,
+        }
+
+    async def test_hides_successful_static_resources(self, browser_session, output_dir):
+        browser_session.network_log = [
+            self._entry("https://a/x.png", "image", 200),
+            self._entry("https://a/y.png", "image", 404),
+            self._entry("https://a/z.css", "stylesheet", None),
+            self._entry("https://a/api", "fetch", 200),
+        ]
+        await browser_session.cmd_network()
+        text = next(output_dir.glob("network-*.log")).read_text()
+        assert text.splitlines() == [
+            "404 GET https://a/y.png (image)",
+            "None GET https://a/z.css (stylesheet)",
+            "200 GET https://a/api (fetch)",
+        ]
+
+    async def test_static_flag_includes_everything(self, browser_session, output_dir):
+        browser_session.network_log = [self._entry("https://a/x.png", "image", 200)]
+        await browser_session.cmd_network(static=True)
+        text = next(output_dir.glob("network-*.log")).read_text()
+        assert text == "200 GET https://a/x.png (image)"
+
 
 # ---------------------------------------------------------------------------
 # 18. Command handlers -- Video
@@ -702,6 +906,17 @@ class TestCmdVideoStop:
         assert result["ok"] is True
         mock_video.save_as.assert_awaited_once_with(filepath)
 
+    async def test_creates_missing_destination_dir(
+        self, browser_session, mock_page, tmp_path
+    ):
+        mock_video = MagicMock()
+        mock_video.save_as = AsyncMock()
+        mock_page.video = mock_video
+        filepath = tmp_path / "nested" / "dir" / "my-video.webm"
+        result = await browser_session.cmd_video_stop(filename=str(filepath))
+        assert result["ok"] is True
+        assert filepath.parent.is_dir()
+
 
 class TestCmdVideoStartEnabled:
     async def test_video_enabled(self, browser_session):
@@ -778,6 +993,14 @@ class TestCmdSelect:
         assert result["ok"] is True
         mock_page.locator.return_value.select_option.assert_awaited_once_with("option1")
 
+    async def test_code_escapes_quotes_in_value(self, browser_session, mock_page):
+        browser_session.element_refs = {
+            "e0": {"selector": "aria-ref=e0", "role": "combobox", "name": None}
+        }
+        result = await browser_session.cmd_select(ref="e0", value="Dad's car")
+        assert result["ok"] is True
+        assert ".selectOption('Dad\\'s car');" in result["output"]
+
     async def test_no_page(self, browser_session):
         browser_session.pages = []
         result = await browser_session.cmd_select(ref="e0", value="x")
@@ -957,6 +1180,7 @@ class TestCmdDialogAcceptWithPrompt:
         result = await browser_session.cmd_dialog_accept(prompt_text="Alice")
         assert result["ok"] is True
         mock_dialog.accept.assert_awaited_once_with("Alice")
+        assert "await page.dialog.accept('Alice');" in result["output"]
 
 
 # ---------------------------------------------------------------------------
@@ -1055,6 +1279,7 @@ class TestCmdSessionstorageList:
         result = await browser_session.cmd_sessionstorage_list()
         assert result["ok"] is True
         assert "sessionStorage" in result["output"]
+        assert '```json\n[["sk","sv"]]\n```' in result["output"]
 
     async def test_no_page(self, browser_session):
         browser_session.pages = []
@@ -1124,6 +1349,9 @@ class TestCmdUnrouteAll:
         assert result["ok"] is True
         assert "All routes removed" in result["output"]
         assert len(browser_session.active_routes) == 0
+        mock_context.unroute.assert_any_await("**/api/*", h1)
+        mock_context.unroute.assert_any_await("**/img/*", h2)
+        mock_context.unroute_all.assert_not_called()
 
     async def test_unknown_pattern(self, browser_session):
         result = await browser_session.cmd_unroute(pattern="**/nope/*")
@@ -1171,10 +1399,28 @@ class TestCmdConsoleWithMinLevel:
             {"type": "log", "text": "info msg"},
             {"type": "error", "text": "error msg"},
         ]
+        # Mark the messages as seen so the response does not also dump them.
+        browser_session._last_console_index = 2
         result = await browser_session.cmd_console(min_level="error")
         assert result["ok"] is True
         # Console output is saved to a file; only error-level messages should be included
         assert "Console" in result["output"]
+        text = next(output_dir.glob("console-*.log")).read_text()
+        assert "error msg" in text
+        assert "info msg" not in text
+
+    async def test_unknown_level_keeps_everything(self, browser_session, output_dir):
+        browser_session.console_messages = [
+            {"type": "log", "text": "info msg"},
+            {"type": "error", "text": "error msg"},
+        ]
+        browser_session._last_console_index = 2
+        await browser_session.cmd_console(min_level="bogus")
+        text = next(output_dir.glob("console-*.log")).read_text()
+        assert text.splitlines() == [
+            "[       0ms] [LOG] info msg",
+            "[       0ms] [ERROR] error msg",
+        ]
 
 
 class TestCmdNetworkEmpty:
@@ -1223,7 +1469,8 @@ class TestCmdScreenshotWithFilename:
         result = await browser_session.cmd_screenshot(filename=filepath)
         assert result["ok"] is True
         assert "Screenshot" in result["output"]
-        mock_page.screenshot.assert_awaited_once()
+        mock_page.screenshot.assert_awaited_once_with(path=filepath, full_page=False)
+        assert "(.patchright-cli/custom.png)" in result["output"]
 
 
 # ---------------------------------------------------------------------------
@@ -1237,7 +1484,7 @@ class TestCmdPdfExtra:
         filepath = str(tmp_path / "custom.pdf")
         result = await browser_session.cmd_pdf(filename=filepath)
         assert result["ok"] is True
-        mock_page.pdf.assert_awaited_once()
+        mock_page.pdf.assert_awaited_once_with(path=filepath)
 
     async def test_no_page(self, browser_session):
         browser_session.pages = []
@@ -1338,6 +1585,10 @@ class TestResponse:
         assert r._include_full_snapshot is False
         assert r._is_snapshot_command is False
 
+    def test_slots_cover_all_state(self):
+        r = Response()
+        assert not hasattr(r, "__dict__")
+
     def test_add_result(self):
         r = Response()
         r.add_result("hello")
@@ -1483,6 +1734,11 @@ class TestCmdRunCode:
         assert result["ok"] is True
         assert "42" in result["output"]
 
+    async def test_result_is_compact_json(self, browser_session, mock_page):
+        mock_page.evaluate = AsyncMock(return_value={"a": [1, 2]})
+        result = await browser_session.cmd_run_code(code="return {a: [1, 2]};")
+        assert '{"a":[1,2]}' in result["output"]
+
     async def test_no_page(self, browser_session):
         browser_session.pages = []
         result = await browser_session.cmd_run_code(code="return 1;")
@@ -1549,24 +1805,195 @@ class TestCmdNetworkClear:
         assert browser_session.network_log == []
 
 
+# ---------------------------------------------------------------------------
+# run_server socket protocol
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def short_sessions_dir(monkeypatch, output_dir):
+    """Like ``sessions_dir``, but short enough for a Unix socket path."""
+    home = Path(tempfile.mkdtemp(prefix="prt-"))
+    monkeypatch.setattr(Path, "home", lambda: home)
+    yield home / ".patchright-cli" / "sessions"
+    shutil.rmtree(home, ignore_errors=True)
+
+
+@pytest.fixture
+async def daemon(short_sessions_dir):
+    """Run ``run_server`` in the background with ``handle_command`` patched.
+
+    Every command is answered with its own name as output.  Yields the
+    server task and the ``handle_command`` mock.
+    """
+    handle = AsyncMock(side_effect=lambda cmd, args: {"ok": True, "output": cmd})
+    ready = asyncio.Event()
+    with patch.object(BrowserSession, "handle_command", handle):
+        task = asyncio.create_task(run_server("srv", {}, ready=ready))
+        await ready.wait()
+        yield task, handle
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+
+async def _connect() -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    return await asyncio.open_unix_connection(str(get_socket_path("srv")))
+
+
+async def _send(writer: asyncio.StreamWriter, request: object) -> None:
+    writer.write(json.dumps(request).encode() + b"\n")
+    await writer.drain()
+
+
+async def _replies(reader: asyncio.StreamReader, count: int) -> list[dict]:
+    lines = [await asyncio.wait_for(reader.readline(), 5) for _ in range(count)]
+    return [json.loads(line) for line in lines]
+
+
+class TestRunServer:
+    async def test_several_requests_on_one_connection(self, daemon):
+        _, handle = daemon
+        reader, writer = await _connect()
+        await _send(writer, {"cmd": "snapshot"})
+        assert await _replies(reader, 1) == [{"ok": True, "output": "snapshot"}]
+        await _send(writer, {"cmd": "tab-list", "args": {}})
+        assert await _replies(reader, 1) == [{"ok": True, "output": "tab-list"}]
+        assert [c.args[0] for c in handle.await_args_list] == ["snapshot", "tab-list"]
+        writer.close()
+        await writer.wait_closed()
+
+    async def test_close_hangs_up_on_idle_clients(self, daemon):
+        task, _ = daemon
+        idle_reader, idle_writer = await _connect()
+        reader, writer = await _connect()
+        try:
+            await _send(writer, {"cmd": "close"})
+            assert await _replies(reader, 1) == [{"ok": True, "output": "close"}]
+            # The idle client is disconnected rather than keeping the daemon up.
+            assert await asyncio.wait_for(idle_reader.read(), 5) == b""
+            with pytest.raises(asyncio.CancelledError):
+                await asyncio.wait_for(task, 5)
+        finally:
+            idle_writer.close()
+            writer.close()
+
+    async def test_cancel_removes_pid_file(self, daemon):
+        task, _ = daemon
+        pid_path = get_pid_path("srv")
+        assert pid_path.exists()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert not pid_path.exists()
+        assert not get_socket_path("srv").exists()
+
+    async def test_batch_replies_in_order(self, daemon):
+        _, handle = daemon
+        reader, writer = await _connect()
+        await _send(writer, [{"cmd": "goto", "args": {"url": "x"}}, {"cmd": "title"}])
+        replies = await _replies(reader, 2)
+        assert [r["output"] for r in replies] == ["goto", "title"]
+        assert [c.args for c in handle.await_args_list] == [
+            ("goto", {"url": "x"}),
+            ("title", {}),
+        ]
+        writer.close()
+        await writer.wait_closed()
+
+    async def test_close_ends_batch(self, daemon):
+        task, handle = daemon
+        reader, writer = await _connect()
+        await _send(writer, [{"cmd": "title"}, {"cmd": "close"}, {"cmd": "reload"}])
+        replies = await _replies(reader, 2)
+        assert [r["output"] for r in replies] == ["title", "close"]
+        assert await asyncio.wait_for(reader.read(), 5) == b""
+        assert "reload" not in [c.args[0] for c in handle.await_args_list]
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(task, 5)
+
+    async def test_non_object_entry_gets_error_reply(self, daemon):
+        _, handle = daemon
+        reader, writer = await _connect()
+        await _send(writer, [1, {"cmd": "title"}])
+        bad, good = await _replies(reader, 2)
+        assert bad == {"ok": False, "error": "Invalid request: 1"}
+        assert good == {"ok": True, "output": "title"}
+        handle.assert_awaited_once_with("title", {})
+        writer.close()
+        await writer.wait_closed()
+
+    async def test_empty_batch_gets_error_reply(self, daemon):
+        _, handle = daemon
+        reader, writer = await _connect()
+        await _send(writer, [])
+        assert await _replies(reader, 1) == [
+            {"ok": False, "error": "Empty command batch"}
+        ]
+        # The connection stays usable.
+        await _send(writer, {"cmd": "title"})
+        assert await _replies(reader, 1) == [{"ok": True, "output": "title"}]
+        handle.assert_awaited_once_with("title", {})
+        writer.close()
+        await writer.wait_closed()
+
+
 # ---------------------------------------------------------------------------
 # start_daemon / _setup_logging
 # ---------------------------------------------------------------------------
 
 
+class TestJoinLines:
+    def test_small_input(self):
+        assert _join_lines(iter(["a", "b"]), 2) == "a\nb"
+
+    def test_large_input_streams_same_text(self):
+        n = _STREAM_JOIN_THRESHOLD + 1
+        lines = [f"line {i}" for i in range(n)]
+        assert _join_lines(iter(lines), n) == "\n".join(lines)
+
+    def test_large_input_all_filtered_is_empty(self):
+        assert _join_lines(iter([]), _STREAM_JOIN_THRESHOLD + 1) == ""
+
+
+class TestWireCodec:
+    def test_reply_is_compact_bytes(self):
+        reply = _encode_reply({"ok": True, "output": "a b"})
+        assert reply == b'{"ok":true,"output":"a b"}'
+
+    def test_request_decodes_from_bytes(self):
+        request = _decode_request(
+            '{"cmd": "eval", "args": {"expression": "é"}}'.encode()
+        )
+        assert request == {"cmd": "eval", "args": {"expression": "é"}}
+
+
 class TestSetupLogging:
     def test_configures_logging(self, sessions_dir):
+        import atexit
         import logging
+        import sys
+        from logging.handlers import QueueHandler
 
         from patchright_cli.server import _setup_logging
 
-        _setup_logging("log-test")
+        saved_streams = sys.stdout, sys.stderr
+        listener = _setup_logging("log-test")
         root = logging.getLogger()
-        assert root.level == logging.DEBUG
-        # Reset to avoid side effects
-        for h in root.handlers[:]:
-            if hasattr(h, "baseFilename") and "log-test" in h.baseFilename:
-                root.removeHandler(h)
+        try:
+            assert root.level == logging.DEBUG
+            logging.getLogger("patchright_cli.test").info("hello from the queue")
+        finally:
+            # Reset to avoid side effects
+            for h in root.handlers[:]:
+                if isinstance(h, QueueHandler) and h.queue is listener.queue:
+                    root.removeHandler(h)
+            listener.stop()
+            atexit.unregister(listener.stop)
+            sys.stdout.close()
+            sys.stdout, sys.stderr = saved_streams
+        log_text = (sessions_dir / "log-test" / "daemon.log").read_text()
+        assert "hello from the queue" in log_text
 
 
 class TestStartDaemonEntry:
@@ -1594,6 +2021,134 @@ class TestStartDaemonEntry:
             start_daemon("entry-test", {"output_dir": ".patchright-cli"})
             mock_run.assert_called_once()
 
+    def test_default_loop_without_uvloop(self, sessions_dir, monkeypatch):
+        from unittest.mock import patch
+
+        from patchright_cli.server import start_daemon
+
+        monkeypatch.setattr("patchright_cli.server.uvloop", None)
+        with (
+            patch("patchright_cli.server.asyncio.run") as mock_run,
+            patch("patchright_cli.server._setup_logging"),
+        ):
+            start_daemon("entry-test", {})
+        assert mock_run.call_args.kwargs["loop_factory"] is None
+        mock_run.call_args.args[0].close()
+
+    def test_uses_uvloop_when_installed(self, sessions_dir, monkeypatch):
+        import types
+        from unittest.mock import patch
+
+        from patchright_cli.server import start_daemon
+
+        fake_uvloop = types.ModuleType("uvloop")
+        fake_uvloop.new_event_loop = MagicMock()
+        monkeypatch.setattr("patchright_cli.server.uvloop", fake_uvloop)
+        with (
+            patch("patchright_cli.server.asyncio.run") as mock_run,
+            patch("patchright_cli.server._setup_logging"),
+        ):
+            start_daemon("entry-test", {})
+        assert mock_run.call_args.kwargs["loop_factory"] is fake_uvloop.new_event_loop
+        mock_run.call_args.args[0].close()
+
+    async def test_serve_reports_ready_on_fd(self):
+        import os
+
+        from patchright_cli.server import _serve
+
+        read_fd, write_fd = os.pipe()
+
+        async def fake_run_server(session_name, config_dict, ready=None):
+            ready.set()
+            # Stay up until the client side has the ready byte.
+            assert await asyncio.to_thread(os.read, read_fd, 1) == b"1"
+
+        with patch("patchright_cli.server.run_server", fake_run_server):
+            await _serve("ready-test", {}, write_fd)
+
+        # The write end is closed once the server has exited.
+        assert os.read(read_fd, 1) == b""
+        os.close(read_fd)
+
+    async def test_serve_closes_fd_when_never_ready(self):
+        import os
+
+        from patchright_cli.server import _serve
+
+        read_fd, write_fd = os.pipe()
+
+        async def fake_run_server(session_name, config_dict, ready=None):
+            raise RuntimeError("launch failed")
+
+        with (
+            patch("patchright_cli.server.run_server", fake_run_server),
+            pytest.raises(RuntimeError),
+        ):
+            await _serve("ready-test", {}, write_fd)
+
+        # EOF without a ready byte: the client stops waiting.
+        assert os.read(read_fd, 1) == b""
+        os.close(read_fd)
+
+    async def test_serve_stops_on_sigterm(self):
+        import os
+        import signal
+
+        from patchright_cli.server import _serve
+
+        started = asyncio.Event()
+        cancelled = False
+
+        async def fake_run_server(session_name, config_dict, ready=None):
+            nonlocal cancelled
+            started.set()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+
+        with patch("patchright_cli.server.run_server", fake_run_server):
+            task = asyncio.create_task(_serve("term-test", {}, None))
+            await started.wait()
+            os.kill(os.getpid(), signal.SIGTERM)
+            with pytest.raises(asyncio.CancelledError):
+                await asyncio.wait_for(task, timeout=5)
+
+        assert cancelled
+        # The handler is removed again once the server has stopped.
+        assert signal.getsignal(signal.SIGTERM) is signal.SIG_DFL
+
+    def test_stops_listener_when_terminated(self, sessions_dir):
+        from patchright_cli.server import start_daemon
+
+        with (
+            patch(
+                "patchright_cli.server.asyncio.run",
+                side_effect=asyncio.CancelledError,
+            ) as mock_run,
+            patch("patchright_cli.server._setup_logging") as mock_setup,
+        ):
+            start_daemon("term-test", {})
+        mock_run.call_args.args[0].close()
+        mock_setup.return_value.stop.assert_called_once()
+
+    async def test_serve_tolerates_client_gone(self):
+        import os
+
+        from patchright_cli.server import _serve
+
+        read_fd, write_fd = os.pipe()
+        os.close(read_fd)  # The client timed out and closed its end
+
+        async def fake_run_server(session_name, config_dict, ready=None):
+            ready.set()
+            await asyncio.sleep(0.01)
+
+        with patch("patchright_cli.server.run_server", fake_run_server):
+            await _serve("ready-test", {}, write_fd)
+
 
 # ---------------------------------------------------------------------------
 # Phase 7: Code generation style tests
@@ -1646,6 +2201,26 @@ class TestRefToCode:
         code = browser_session._ref_to_code("e0")
         assert "it\\'s" in code
 
+    def test_code_is_memoized_per_metadata(self, browser_session):
+        browser_session.element_refs = {
+            "e0": {"selector": "aria-ref=e0", "role": "link", "name": "About"}
+        }
+        first = browser_session._ref_to_code("e0")
+        assert browser_session._ref_to_code("e0") is first
+
+    def test_new_snapshot_entry_invalidates_memo(self, browser_session):
+        browser_session.element_refs = {
+            "e0": {"selector": "aria-ref=e0", "role": "link", "name": "About"}
+        }
+        browser_session._ref_to_code("e0")
+        browser_session.element_refs.update(
+            {"e0": {"selector": "aria-ref=e0", "role": "button", "name": "Send"}}
+        )
+        assert (
+            browser_session._ref_to_code("e0")
+            == "page.getByRole('button', { name: 'Send' })"
+        )
+
 
 class TestCodeGenSingleQuotes:
     """Tests that code generation uses single quotes."""
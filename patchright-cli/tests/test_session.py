@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import json
 import os
+import re
 
 from patchright_cli.session import (
     cleanup_session,
@@ -84,9 +85,23 @@ class TestGetConfigPath:
         assert result.name == "config.json"
 
 
+class TestPathHelpersAreSideEffectFree:
+    def test_do_not_create_session_dir(self, sessions_dir):
+        get_socket_path("demo")
+        get_pid_path("demo")
+        get_log_path("demo")
+        get_config_path("demo")
+        assert not (sessions_dir / "demo").exists()
+
+    def test_write_pid_creates_session_dir(self, sessions_dir):
+        write_pid("fresh", 1)
+        assert (sessions_dir / "fresh" / "pid").read_text(encoding="utf-8") == "1"
+
+
 class TestReadSessionConfig:
     def test_returns_dict_for_valid_config(self, sessions_dir):
         config = {"browser": {"browser_name": "chromium"}}
+        get_session_dir("with-config")
         config_path = get_config_path("with-config")
         config_path.write_text(json.dumps(config), encoding="utf-8")
         result = read_session_config("with-config")
@@ -97,6 +112,7 @@ class TestReadSessionConfig:
         assert read_session_config("no-config") is None
 
     def test_returns_none_for_invalid_json(self, sessions_dir):
+        get_session_dir("bad-json")
         config_path = get_config_path("bad-json")
         config_path.write_text("not valid json {{{", encoding="utf-8")
         assert read_session_config("bad-json") is None
@@ -130,16 +146,19 @@ class TestReadPid:
         assert read_pid("no-pid") is None
 
     def test_returns_none_for_empty_file(self, sessions_dir):
+        get_session_dir("empty-pid")
         pid_path = get_pid_path("empty-pid")
         pid_path.write_text("", encoding="utf-8")
         assert read_pid("empty-pid") is None
 
     def test_returns_none_for_non_integer_content(self, sessions_dir):
+        get_session_dir("bad-pid")
         pid_path = get_pid_path("bad-pid")
         pid_path.write_text("not-a-number", encoding="utf-8")
         assert read_pid("bad-pid") is None
 
     def test_returns_none_for_whitespace_only(self, sessions_dir):
+        get_session_dir("ws-pid")
         pid_path = get_pid_path("ws-pid")
         pid_path.write_text("   \n  ", encoding="utf-8")
         assert read_pid("ws-pid") is None
@@ -241,6 +260,15 @@ class TestListSessions:
         assert result[0]["alive"] is False
         assert result[0]["config"] is None
 
+    def test_probes_each_pid_once(self, sessions_dir, monkeypatch):
+        write_pid("alpha", 100)
+        calls = []
+        monkeypatch.setattr(os, "kill", lambda pid, sig: calls.append(pid))
+
+        result = list_sessions()
+        assert result[0]["alive"] is True
+        assert calls == [100]
+
     def test_includes_config_when_present(self, sessions_dir, monkeypatch):
         # Create a session with both a PID and a config.json.
         write_pid("configured", 400)
@@ -359,6 +387,16 @@ class TestGenerateOutputFilename:
         path_b = generate_output_filename("screenshot", "png")
         assert path_a.name != path_b.name
 
+    def test_does_not_create_output_dir(self, output_dir):
+        # Callers create the parent right before writing the file.
+        path = generate_output_filename("page", "png")
+        assert path.parent == output_dir
+        assert not output_dir.exists()
+
+    def test_timestamp_format(self, output_dir):
+        path = generate_output_filename("page", "yml")
+        assert re.fullmatch(r"page-\d{4}-\d{2}-\d{2}T\d{2}-\d{2}-\d{2}\.yml", path.name)
+
     def test_timestamp_has_no_colons(self, output_dir):
         # Colons are replaced with dashes for filesystem compatibility.
         path = generate_output_filename("snap", "yml")
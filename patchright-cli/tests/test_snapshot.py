@@ -5,108 +5,84 @@ from __future__ import annotations
 from unittest.mock import AsyncMock, MagicMock
 
 from patchright_cli.snapshot import (
-    _REF_RE,
-    _ROLE_NAME_RE,
+    _REF_LINE_RE,
     take_snapshot,
 )
 
 
 # ---------------------------------------------------------------------------
-# _REF_RE regex tests
+# _REF_LINE_RE regex tests
 # ---------------------------------------------------------------------------
 
 
-class TestRefRegex:
-    """Tests for the _REF_RE regex pattern."""
+class TestRefLineRegex:
+    """Tests for the combined role/name/ref _REF_LINE_RE pattern."""
 
-    def test_matches_ref_with_e_prefix(self):
-        m = _REF_RE.search("[ref=e0]")
+    def test_matches_role_name_and_ref(self):
+        m = _REF_LINE_RE.search('  - link "About" [ref=e2] [cursor=pointer]')
         assert m is not None
-        assert m.group(1) == "e0"
+        assert m.group(1, 2, 3) == ("link", "About", "e2")
 
-    def test_matches_ref_with_s_prefix(self):
-        m = _REF_RE.search("[ref=s10]")
+    def test_matches_role_without_name(self):
+        m = _REF_LINE_RE.search("- navigation [ref=e0]:")
         assert m is not None
-        assert m.group(1) == "s10"
+        assert m.group(1, 2, 3) == ("navigation", None, "e0")
 
-    def test_matches_ref_in_context(self):
-        m = _REF_RE.search('- link "About" [ref=e2] [cursor=pointer]')
+    def test_matches_deeply_nested(self):
+        m = _REF_LINE_RE.search('      - button "Submit" [ref=e5]')
         assert m is not None
-        assert m.group(1) == "e2"
+        assert m.group(1, 2, 3) == ("button", "Submit", "e5")
 
-    def test_matches_ref_with_large_number(self):
-        m = _REF_RE.search("[ref=e999]")
+    def test_matches_name_with_spaces(self):
+        m = _REF_LINE_RE.search('  - button "Search by voice" [ref=e3]')
         assert m is not None
-        assert m.group(1) == "e999"
-
-    def test_no_match_without_ref(self):
-        m = _REF_RE.search('- link "About"')
-        assert m is None
-
-    def test_no_match_empty_string(self):
-        m = _REF_RE.search("")
-        assert m is None
-
-    def test_no_match_similar_but_wrong_format(self):
-        m = _REF_RE.search("[level=1]")
-        assert m is None
+        assert m.group(2) == "Search by voice"
 
-    def test_matches_first_ref_in_line(self):
-        m = _REF_RE.search("[ref=e1] [ref=e2]")
+    def test_matches_ref_with_s_prefix(self):
+        m = _REF_LINE_RE.search("- generic [ref=s10]")
         assert m is not None
-        assert m.group(1) == "e1"
-
-
-# ---------------------------------------------------------------------------
-# _ROLE_NAME_RE regex tests
-# ---------------------------------------------------------------------------
+        assert m.group(3) == "s10"
 
-
-class TestRoleNameRegex:
-    """Tests for the _ROLE_NAME_RE regex pattern."""
-
-    def test_matches_role_with_name(self):
-        m = _ROLE_NAME_RE.match('  - link "About" ')
+    def test_matches_ref_with_large_number(self):
+        m = _REF_LINE_RE.search("- generic [ref=e999]")
         assert m is not None
-        assert m.group(1) == "link"
-        assert m.group(2) == "About"
+        assert m.group(3) == "e999"
 
-    def test_matches_role_without_name(self):
-        m = _ROLE_NAME_RE.match("- navigation ")
+    def test_captures_numeric_suffix(self):
+        m = _REF_LINE_RE.search("- generic [ref=e42]")
         assert m is not None
-        assert m.group(1) == "navigation"
-        assert m.group(2) is None
+        assert m.group(3, 4) == ("e42", "42")
 
-    def test_matches_deeply_nested(self):
-        m = _ROLE_NAME_RE.match('      - button "Submit" ')
+    def test_frame_ref_has_no_numeric_suffix(self):
+        m = _REF_LINE_RE.search('- button "Go" [ref=f1e2]')
         assert m is not None
-        assert m.group(1) == "button"
-        assert m.group(2) == "Submit"
+        assert m.group(3, 4) == ("f1e2", None)
 
-    def test_matches_name_with_spaces(self):
-        m = _ROLE_NAME_RE.match('  - button "Search by voice" ')
+    def test_matches_first_ref_in_line(self):
+        m = _REF_LINE_RE.search("- generic [ref=e1] [ref=e2]")
         assert m is not None
-        assert m.group(1) == "button"
-        assert m.group(2) == "Search by voice"
+        assert m.group(3) == "e1"
+
+    def test_no_match_without_ref(self):
+        assert _REF_LINE_RE.search('- link "About"') is None
+
+    def test_no_match_similar_but_wrong_format(self):
+        assert _REF_LINE_RE.search("- heading [level=1]") is None
 
     def test_no_match_property_line(self):
-        m = _ROLE_NAME_RE.match("    - /url: https://example.com")
-        assert m is None
+        assert _REF_LINE_RE.search("    - /url: https://example.com [ref=e1]") is None
 
-    def test_no_match_empty_line(self):
-        m = _ROLE_NAME_RE.match("")
-        assert m is None
+    def test_no_match_empty_string(self):
+        assert _REF_LINE_RE.search("") is None
 
-    def test_matches_role_with_colon(self):
-        m = _ROLE_NAME_RE.match("- navigation:")
-        assert m is not None
-        assert m.group(1) == "navigation"
+    def test_does_not_span_lines(self):
+        text = '- link "About"\n    [ref=e1]'
+        assert _REF_LINE_RE.search(text) is None
 
-    def test_matches_role_with_name_and_colon(self):
-        m = _ROLE_NAME_RE.match('  - link "About":')
-        assert m is not None
-        assert m.group(1) == "link"
-        assert m.group(2) == "About"
+    def test_finditer_yields_one_match_per_line(self):
+        text = '- list [ref=e0]:\n  - listitem [ref=e1]\n  - link "Home" [ref=e2]'
+        refs = [m.group(3) for m in _REF_LINE_RE.finditer(text)]
+        assert refs == ["e0", "e1", "e2"]
 
 
 # ---------------------------------------------------------------------------
@@ -360,6 +336,14 @@ class TestTakeSnapshot:
         _, _, counter = await take_snapshot(page)
         assert counter == 8  # max(3,7,5) + 1
 
+    async def test_frame_refs_kept_but_not_counted(self):
+        """Iframe refs like f1e9 are returned but do not drive the counter."""
+        snapshot = '- link "A" [ref=e3]\n- button "B" [ref=f1e9]'
+        page = _make_mock_page(snapshot)
+        _, refs, counter = await take_snapshot(page)
+        assert set(refs) == {"e3", "f1e9"}
+        assert counter == 4
+
     async def test_generic_wrapper_elements(self):
         """Generic wrapper elements from snapshotForAI get refs."""
         snapshot = (